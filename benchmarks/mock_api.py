@@ -0,0 +1,526 @@
+"""Local stand-in for the Express API, used by the benchmarks.
+
+Serves a seeded, deterministic dataset over the routes the two Streamlit
+apps call, with the same response shapes as server/routes. The cost of
+talking to the real server is mirrored: `fields=` projections, strong ETags
+answered with 304, and gzip compression of responses over 1kb when the client
+accepts it.
+
+Every request is counted (per route, with the bytes actually sent);
+GET /_bench/stats reads the counters and POST /_bench/reset clears them.
+
+Run it on its own to point an app at it by hand:
+
+    python benchmarks/mock_api.py --size medium --port 3000
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import random
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Books, sales and manufacturer orders for each --size
+SIZES = {
+    "small": (1_000, 1_000, 100),
+    "medium": (10_000, 10_000, 1_000),
+    "large": (100_000, 100_000, 10_000),
+}
+
+GENRES = ["Science", "Science Fiction", "Mystery", "Fiction", "Romance", "Comic", "Non-Fiction"]
+WORDS = ["River", "Shadow", "Garden", "Winter", "Silent", "Empire", "Letters", "Ocean", "Midnight",
+         "Glass", "Iron", "Memory", "Stars", "Harbor", "Secret", "Forest", "Crown", "Paper", "Storm", "Light"]
+STATUSES = ["pending", "shipped", "received", "canceled"]
+ORDER_STATUSES = ["pending", "shipped", "received", "canceled"]
+
+COMPRESS_THRESHOLD = 1024
+BODY_CACHE_ENTRIES = 64
+OBJECT_ID = re.compile(r"[0-9a-f]{24}")
+
+
+def _object_id(prefix, n):
+    return f"{prefix:02x}{n:022x}"
+
+
+def _iso(moment):
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.") + f"{moment.microsecond // 1000:03d}Z"
+
+
+class Dataset:
+    """Books, sales and manufacturer orders, generated from a fixed seed"""
+
+    def __init__(self, books=1_000, sales=1_000, orders=100, seed=0):
+        rng = random.Random(seed)
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        self.created_at = now
+
+        self.books = []
+        for i in range(books):
+            title = f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}"
+            self.books.append({
+                "_id": _object_id(1, i),
+                "title": title,
+                "author": f"{rng.choice(WORDS)} {rng.choice(['Smith', 'Okafor', 'Tanaka', 'Garcia', 'Novak'])}",
+                "genre": GENRES[i % len(GENRES)],
+                "isbn": f"978{i:010d}",
+                "language": "English",
+                "publisher": "Bodhi Press",
+                "publicationDate": _iso(now - timedelta(days=rng.randrange(3650))),
+                "price": round(rng.uniform(5, 60), 2),
+                "quantity": rng.randrange(60),
+                "summary": " ".join(rng.choice(WORDS).lower() for _ in range(60)),
+                "coverImageUrl": f"https://covers.example.com/{i}.jpg",
+                "createdAt": _iso(now - timedelta(days=400)),
+                "updatedAt": _iso(now - timedelta(days=rng.randrange(400))),
+            })
+        self.books.sort(key=lambda book: book["title"])
+        self.books_by_id = {book["_id"]: book for book in self.books}
+
+        # Sales spread over the past year, newest first (the order GET /sales returns)
+        self.sales = []
+        for i in range(sales):
+            ordered = now - timedelta(seconds=rng.randrange(365 * 24 * 3600))
+            items = []
+            for book in rng.sample(self.books, min(len(self.books), rng.randint(1, 3))):
+                items.append({"bookId": book["_id"], "quantity": rng.randint(1, 3), "price": book["price"]})
+            self.sales.append({
+                "_id": _object_id(2, i),
+                "type": "online" if i % 2 else "instore",
+                "orderStatus": STATUSES[i % len(STATUSES)],
+                "paymentMethod": "credit",
+                "customerId": _object_id(4, i % 500),
+                "orderDate": ordered,
+                "shippingAddress": {"street": f"{i} Main St", "city": "Springfield", "state": "CA",
+                                    "zipCode": "90210"},
+                "totalPrice": round(sum(item["price"] * item["quantity"] for item in items), 2),
+                "orderItems": items,
+                "createdAt": ordered,
+                "updatedAt": ordered,
+            })
+        self.sales.sort(key=lambda sale: (sale["orderDate"], sale["_id"]), reverse=True)
+
+        self.orders = []
+        for i in range(orders):
+            ordered = now - timedelta(days=rng.randrange(180))
+            books_ordered = [{"bookId": book["_id"], "title": book["title"], "quantity": rng.randint(5, 50),
+                              "price": book["price"]} for book in rng.sample(self.books, min(len(self.books), 3))]
+            self.orders.append({
+                "_id": _object_id(3, i),
+                "orderNumber": f"MO-{i:06d}",
+                "supplierName": f"{rng.choice(WORDS)} Distributors",
+                "status": ORDER_STATUSES[i % len(ORDER_STATUSES)],
+                "booksOrdered": books_ordered,
+                "totalCost": round(sum(b["price"] * b["quantity"] for b in books_ordered), 2),
+                "orderDate": _iso(ordered),
+                "expectedDeliveryDate": _iso(ordered + timedelta(days=7)),
+                "updatedAt": _iso(ordered),
+            })
+        self.orders.sort(key=lambda order: order["orderDate"], reverse=True)
+
+        self.users = [{"_id": _object_id(5, i), "email": f"staff{i}@bodhi.example", "username": f"staff{i}",
+                       "firstName": "Staff", "lastName": str(i), "role": "admin" if i == 0 else "employee",
+                       "isActive": True} for i in range(20)]
+
+        # Bumped on every write, like the collection versions behind the real ETags
+        self.version = 0
+        self.lock = threading.Lock()
+
+    def sizes(self):
+        return {"books": len(self.books), "sales": len(self.sales), "orders": len(self.orders)}
+
+
+def _project(doc, fields):
+    if not fields:
+        return doc
+    return {key: value for key, value in doc.items() if key in fields}
+
+
+def _fields(query):
+    if "fields" not in query:
+        return None
+    return {"_id", *(name.strip() for name in query["fields"].split(",") if name.strip())}
+
+
+def _book_details(book, list_view):
+    keys = ("title", "author", "isbn", "genre") if list_view else (
+        "title", "author", "isbn", "genre", "publisher", "language", "summary", "publicationDate", "coverImageUrl")
+    return {key: book.get(key) for key in keys}
+
+
+def _format_sale(dataset, sale, fields, list_view):
+    doc = dict(sale)
+    doc["orderDate"] = sale["orderDate"].strftime("%Y-%m-%d %H:%M:%S")
+    doc["createdAt"] = sale["createdAt"].strftime("%Y-%m-%d %H:%M:%S")
+    doc["updatedAt"] = sale["updatedAt"].strftime("%Y-%m-%d %H:%M:%S")
+    doc["orderItems"] = [dict(item, bookDetails=_book_details(dataset.books_by_id[item["bookId"]], list_view))
+                         for item in sale["orderItems"] if item["bookId"] in dataset.books_by_id]
+    doc["totalItems"] = sum(item["quantity"] for item in sale["orderItems"])
+    return _project(doc, fields)
+
+
+def _rollup_sale(dataset, sale):
+    return {
+        "_id": sale["_id"],
+        "type": sale["type"],
+        "orderStatus": sale["orderStatus"],
+        "orderDate": sale["orderDate"].strftime("%Y-%m-%d %H:%M:%S"),
+        "totalPrice": sale["totalPrice"],
+        "orderItems": [{"bookId": item["bookId"], "quantity": item["quantity"], "price": item["price"],
+                        "bookDetails": _book_details(dataset.books_by_id[item["bookId"]], True)}
+                       for item in sale["orderItems"] if item["bookId"] in dataset.books_by_id],
+    }
+
+
+def _parse_date(value, end=False):
+    for fmt in ("%Y-%m-%d", "%m/%d/%Y"):
+        try:
+            parsed = datetime.strptime(value, fmt).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+        return parsed + timedelta(days=1, microseconds=-1) if end else parsed
+    return None
+
+
+def _filter_sales(dataset, query):
+    sales = dataset.sales
+    start = _parse_date(query["startDate"]) if query.get("startDate") else None
+    end = _parse_date(query["endDate"], end=True) if query.get("endDate") else None
+    book_ids = None
+    if query.get("bookTitle") or query.get("genre"):
+        title = (query.get("bookTitle") or "").lower()
+        genres = set(query["genre"].split(",")) if query.get("genre") else None
+        book_ids = {book["_id"] for book in dataset.books
+                    if title in book["title"].lower() and (genres is None or book["genre"] in genres)}
+    for sale in sales:
+        if start and sale["orderDate"] < start or end and sale["orderDate"] > end:
+            continue
+        if query.get("type") and sale["type"] != query["type"]:
+            continue
+        if query.get("orderStatus") and sale["orderStatus"] != query["orderStatus"]:
+            continue
+        if query.get("customerId") and sale["customerId"] != query["customerId"]:
+            continue
+        if book_ids is not None and not any(item["bookId"] in book_ids for item in sale["orderItems"]):
+            continue
+        yield sale
+
+
+def _sales_summary(sales):
+    by_type, by_status = {}, {}
+    revenue = items = 0
+    for sale in sales:
+        revenue += sale["totalPrice"]
+        items += sum(item["quantity"] for item in sale["orderItems"])
+        entry = by_type.setdefault(sale["type"], {"_id": sale["type"], "count": 0, "revenue": 0})
+        entry["count"] += 1
+        entry["revenue"] += sale["totalPrice"]
+        by_status.setdefault(sale["orderStatus"], {"_id": sale["orderStatus"], "count": 0})["count"] += 1
+    count = sum(entry["count"] for entry in by_type.values())
+    return {"totalRevenue": round(revenue, 2), "totalOrders": count, "totalItems": items,
+            "averageOrderValue": round(revenue / count, 2) if count else 0,
+            "salesByType": list(by_type.values()), "salesByStatus": list(by_status.values())}
+
+
+class Stats:
+    """Request and byte counters, per route"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.requests = 0
+            self.bytes = 0
+            self.not_modified = 0
+            self.routes = {}
+
+    def record(self, route, status, sent):
+        with self.lock:
+            self.requests += 1
+            self.bytes += sent
+            if status == 304:
+                self.not_modified += 1
+            entry = self.routes.setdefault(route, {"requests": 0, "bytes": 0})
+            entry["requests"] += 1
+            entry["bytes"] += sent
+
+    def snapshot(self):
+        with self.lock:
+            return {"requests": self.requests, "bytes": self.bytes, "not_modified": self.not_modified,
+                    "routes": {route: dict(entry) for route, entry in sorted(self.routes.items())}}
+
+
+class MockApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    @property
+    def dataset(self):
+        return self.server.dataset
+
+    def _route(self):
+        return f"{self.command} {OBJECT_ID.sub(':id', urlparse(self.path).path)}"
+
+    def _send_json(self, body, status=200, headers=None):
+        """Send a JSON body the way Express does: strong ETag, 304, compression"""
+        if self.command == "GET" and status == 200 and not self.path.startswith("/_bench/"):
+            # Encoding the same list twice is wasted mock time, not app time
+            cache = self.server.bodies
+            key = (self.path, self.dataset.version)
+            with self.server.bodies_lock:
+                cached = cache.get(key)
+                if cached:
+                    cache.move_to_end(key)
+            if not cached:
+                data = json.dumps(body, separators=(",", ":")).encode()
+                etag = '"%s"' % hashlib.sha1(data).hexdigest()
+                compressed = gzip.compress(data, 6) if len(data) > COMPRESS_THRESHOLD else None
+                cached = (data, etag, compressed)
+                with self.server.bodies_lock:
+                    cache[key] = cached
+                    while len(cache) > BODY_CACHE_ENTRIES:
+                        cache.popitem(last=False)
+            data, etag, compressed = cached
+            headers = dict(headers or {}, ETag=etag)
+            if self.headers.get("If-None-Match") == etag:
+                return self._write(304, b"", headers)
+        else:
+            data = json.dumps(body, separators=(",", ":")).encode()
+            compressed = gzip.compress(data, 6) if len(data) > COMPRESS_THRESHOLD else None
+
+        headers = dict(headers or {}, **{"Content-Type": "application/json; charset=utf-8"})
+        if compressed is not None and "gzip" in self.headers.get("Accept-Encoding", ""):
+            headers["Content-Encoding"] = "gzip"
+            headers["Vary"] = "Accept-Encoding"
+            data = compressed
+        self._write(status, data, headers)
+
+    def _write(self, status, data, headers):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if data:
+            self.wfile.write(data)
+        if not self.path.startswith("/_bench/"):
+            self.server.stats.record(self._route(), status, len(data))
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        path = url.path
+        data = self.dataset
+
+        if path == "/_bench/stats":
+            return self._send_json(self.server.stats.snapshot(), headers={"Cache-Control": "no-store"})
+
+        if path == "/api/books":
+            books = data.books
+            if query.get("ids"):
+                ids = set(query["ids"].split(","))
+                books = [book for book in books if book["_id"] in ids]
+            for field in ("title", "author", "genre"):
+                if query.get(field):
+                    books = [book for book in books if book[field] == query[field]]
+            if query.get("sort") and query["sort"] != "title":
+                books = sorted(books, key=lambda book: book.get(query["sort"]) or 0)
+            if query.get("order") == "desc":
+                books = books[::-1]
+            fields = _fields(query)
+            headers = {}
+            if "limit" in query:
+                skip = max(int(query.get("skip", 0)), 0)
+                headers["X-Total-Count"] = str(len(books))
+                books = books[skip:skip + max(int(query["limit"]), 1)]
+            return self._send_json([_project(book, fields) for book in books], headers=headers)
+
+        if path == "/api/books/changes":
+            fields = _fields(query)
+            cursor = _iso(datetime.now(timezone.utc))
+            if query.get("since"):
+                since = query["since"]
+                changed = [_project(book, fields) for book in data.books if book["updatedAt"] >= since]
+                return self._send_json({"fullSync": False, "books": changed, "deleted": [], "cursor": cursor})
+            return self._send_json({"fullSync": True, "books": [_project(book, fields) for book in data.books],
+                                    "deleted": [], "cursor": cursor})
+
+        match = re.fullmatch(r"/api/books/(\w+)", path)
+        if match:
+            book = data.books_by_id.get(match.group(1))
+            return self._send_json(book) if book else self._send_json({"error": "Book not found"}, 404)
+
+        if path == "/api/sales/changes":
+            cursor = _iso(datetime.now(timezone.utc))
+            since = datetime.fromisoformat(query["since"].replace("Z", "+00:00")) if query.get("since") else None
+            sales = [_rollup_sale(data, sale) for sale in data.sales if since is None or sale["updatedAt"] >= since]
+            return self._send_json({"fullSync": since is None, "sales": sales, "deleted": [], "cursor": cursor})
+
+        if path == "/api/sales":
+            sales = _filter_sales(data, query)
+            if query.get("before"):
+                before_date, before_id = query["before"].split("_")
+                before = (datetime.fromisoformat(before_date.replace("Z", "+00:00")), before_id)
+                sales = (sale for sale in sales if (sale["orderDate"], sale["_id"]) < before)
+            fields = _fields(query)
+            list_view = query.get("view") == "list"
+            headers = {}
+            if query.get("limit"):
+                limit = max(int(query["limit"]), 1)
+                page = []
+                for sale in sales:
+                    page.append(sale)
+                    if len(page) > limit:
+                        break
+                if len(page) > limit:
+                    page = page[:limit]
+                    last = page[-1]
+                    headers["X-Next-Cursor"] = f"{_iso(last['orderDate'])}_{last['_id']}"
+                sales = page
+            return self._send_json([_format_sale(data, sale, fields, list_view) for sale in sales], headers=headers)
+
+        if path == "/api/reports/sales/summary":
+            return self._send_json(_sales_summary(_filter_sales(data, query)))
+
+        if path == "/api/reports/sales/daily":
+            days = {}
+            for sale in _filter_sales(data, query):
+                day = days.setdefault(sale["orderDate"].strftime("%Y-%m-%d"), {
+                    "_id": sale["orderDate"].strftime("%Y-%m-%d"), "totalSales": 0, "totalItems": 0, "orderCount": 0})
+                day["totalSales"] = round(day["totalSales"] + sale["totalPrice"], 2)
+                day["totalItems"] += sum(item["quantity"] for item in sale["orderItems"])
+                day["orderCount"] += 1
+            return self._send_json(sorted(days.values(), key=lambda day: day["_id"]))
+
+        if path in ("/api/reports/sales/top-genres", "/api/reports/sales/top-books"):
+            by_genre = path.endswith("top-genres")
+            totals = {}
+            for sale in _filter_sales(data, query):
+                for item in sale["orderItems"]:
+                    book = data.books_by_id.get(item["bookId"])
+                    if not book:
+                        continue
+                    key = book["genre"] if by_genre else book["_id"]
+                    entry = totals.setdefault(key, {"_id": key, "totalSales": 0, "revenue": 0} if by_genre else
+                                              {"_id": key, "title": book["title"], "author": book["author"],
+                                               "totalSold": 0, "revenue": 0})
+                    entry["totalSales" if by_genre else "totalSold"] += item["quantity"]
+                    entry["revenue"] = round(entry["revenue"] + item["price"] * item["quantity"], 2)
+            limit = int(query.get("limit") or (5 if by_genre else 10))
+            ranked = sorted(totals.values(), key=lambda entry: entry["revenue"], reverse=True)
+            return self._send_json(ranked[:limit])
+
+        if path == "/api/manufacturerOrders":
+            orders = data.orders
+            for field in ("orderNumber", "supplierName", "status"):
+                if query.get(field):
+                    orders = [order for order in orders if order[field] == query[field]]
+            fields = _fields(query)
+            return self._send_json([_project(order, fields) for order in orders])
+
+        match = re.fullmatch(r"/api/manufacturerOrders/(\w+)", path)
+        if match:
+            order = next((order for order in data.orders if order["_id"] == match.group(1)), None)
+            return self._send_json(order) if order else self._send_json({"error": "Order not found"}, 404)
+
+        if path == "/api/users":
+            return self._send_json(data.users)
+
+        self._send_json({"error": "Not Found"}, 404)
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        body = self._read_body()
+
+        if path == "/_bench/reset":
+            self.server.stats.reset()
+            return self._send_json({"ok": True})
+
+        if path in ("/api/auth/login", "/api/users/login"):
+            user = self.dataset.users[0]
+            return self._send_json({"success": True, "data": {
+                "token": "benchmark-token", "user": dict(user, id=user["_id"], customerId=_object_id(4, 0))}})
+
+        if path == "/api/books":
+            with self.dataset.lock:
+                book = dict(body, _id=_object_id(6, len(self.dataset.books)))
+                self.dataset.books.append(book)
+                self.dataset.books_by_id[book["_id"]] = book
+                self.dataset.version += 1
+            return self._send_json(book, 201)
+
+        self._send_json({"error": "Not Found"}, 404)
+
+    def do_PUT(self):
+        path = urlparse(self.path).path
+        body = self._read_body()
+        match = re.fullmatch(r"/api/books/(\w+)", path)
+        if match and match.group(1) in self.dataset.books_by_id:
+            with self.dataset.lock:
+                book = self.dataset.books_by_id[match.group(1)]
+                book.update(body, updatedAt=_iso(datetime.now(timezone.utc)))
+                self.dataset.version += 1
+            return self._send_json(book)
+        self._send_json({"error": "Not Found"}, 404)
+
+
+def start(dataset, host="127.0.0.1", port=0):
+    """Serve a dataset on a background thread; returns the server (see server.server_port)"""
+    server = ThreadingHTTPServer((host, port), MockApiHandler)
+    server.daemon_threads = True
+    server.dataset = dataset
+    server.stats = Stats()
+    server.bodies = OrderedDict()
+    server.bodies_lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def add_dataset_arguments(parser):
+    parser.add_argument("--size", choices=SIZES, default="small", help="dataset preset (default: small)")
+    parser.add_argument("--books", type=int, help="number of books (overrides --size)")
+    parser.add_argument("--sales", type=int, help="number of sales (overrides --size)")
+    parser.add_argument("--orders", type=int, help="number of manufacturer orders (overrides --size)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed of the dataset")
+
+
+def dataset_from_args(args):
+    books, sales, orders = SIZES[args.size]
+    return Dataset(
+        books=books if args.books is None else args.books,
+        sales=sales if args.sales is None else args.sales,
+        orders=orders if args.orders is None else args.orders,
+        seed=args.seed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a seeded mock of the Bodhi API")
+    add_dataset_arguments(parser)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3000)
+    args = parser.parse_args()
+
+    dataset = dataset_from_args(args)
+    server = start(dataset, args.host, args.port)
+    print(f"Serving {dataset.sizes()} at http://{args.host}:{server.server_port}/api (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
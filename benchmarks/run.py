@@ -0,0 +1,323 @@
+"""Benchmark the staff and storefront apps against the local mock API.
+
+Each scenario opens a page of Bookstore_UI.py or client-customer/Home.py
+headlessly with Streamlit's AppTest and records, per phase:
+
+  cold    process caches cleared (st.cache_data, st.cache_resource and the
+          on-disk catalog/rollup files), new session
+  warm    new session, caches left from the previous run (a second user)
+  rerun   the same session run again (any widget interaction)
+
+the render time (median, min and max over --repeat runs), and the API
+requests and bytes sent by the mock during the last run. Results are written
+as JSON; pass an earlier file as --baseline to compare two commits:
+
+    python benchmarks/run.py --size medium --output before.json
+    git checkout my-branch
+    python benchmarks/run.py --size medium --output after.json --baseline before.json
+
+Each app runs in its own subprocess, so the two apps' imports and
+process-wide caches never mix.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.request import Request, urlopen
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mock_api import add_dataset_arguments, dataset_from_args, start  # noqa: E402
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+STAFF_APP = REPO_ROOT / "Bookstore_UI.py"
+CUSTOMER_DIR = REPO_ROOT / "client-customer"
+CUSTOMER_APP = CUSTOMER_DIR / "Home.py"
+PHASES = ("cold", "warm", "rerun")
+
+
+# Scenarios: name -> (open, act). open(at) brings a new session to the
+# starting point, act(at) is the run being measured.
+
+def _staff_page(script):
+    def open_page(at):
+        at.switch_page(f"bookstore_ui/views/{script}.py")
+    return open_page
+
+
+def _filter_sales_by_title(at):
+    at.text_input(key="book_title_filter").input("River")
+
+
+def _search_storefront(at):
+    next(box for box in at.text_input if box.label.startswith("Search books")).input("River Garden")
+
+
+def _open_first_book(at):
+    next(button for button in at.button if button.key and button.key.startswith("details_")).click()
+
+
+STAFF_SCENARIOS = {
+    "Home": (None, None),
+    "Inventory": (_staff_page("inventory"), None),
+    "Sales": (_staff_page("sales"), None),
+    "Sales, book title filter": (_staff_page("sales"), _filter_sales_by_title),
+    "Orders": (_staff_page("orders"), None),
+    "Admin": (_staff_page("admin"), None),
+}
+
+CUSTOMER_SCENARIOS = {
+    "Storefront": (None, None),
+    "Storefront search": (None, _search_storefront),
+    "Book details": (None, _open_first_book),
+}
+
+
+def _api(api_url, path, method="GET"):
+    base = api_url.rsplit("/api", 1)[0]
+    with urlopen(Request(base + path, method=method, data=b"" if method == "POST" else None)) as response:
+        return json.loads(response.read())
+
+
+class _Worker:
+    """Runs one app's scenarios inside this process"""
+
+    def __init__(self, app, api_url, cache_dir, timeout):
+        self.app = app
+        self.api_url = api_url
+        self.cache_dir = Path(cache_dir)
+        self.timeout = timeout
+        if app == "staff":
+            os.chdir(REPO_ROOT)
+            sys.path.insert(0, str(REPO_ROOT))
+            self.script, self.scenarios = STAFF_APP, STAFF_SCENARIOS
+        else:
+            os.chdir(CUSTOMER_DIR)
+            sys.path.insert(0, str(CUSTOMER_DIR))
+            self.script, self.scenarios = CUSTOMER_APP, CUSTOMER_SCENARIOS
+
+    def new_session(self):
+        from streamlit.testing.v1 import AppTest
+
+        at = AppTest.from_file(str(self.script), default_timeout=self.timeout)
+        at.secrets["api"] = {"base_url": self.api_url}
+        if self.app == "staff":
+            at.secrets["cache"] = {"rollup_path": str(self.cache_dir / "sales_rollups.sqlite3")}
+            at.session_state.logged_in = True
+            at.session_state.role = "admin"
+            at.session_state.token = "benchmark-token"
+            at.session_state.name = "Benchmark Admin"
+            at.session_state.user = {"email": "staff0@bodhi.example"}
+        else:
+            # No background refreshes during a run; server covers are not fetched by AppTest
+            at.secrets["catalog"] = {"refresh_interval": 3600,
+                                     "snapshot_path": str(self.cache_dir / "catalog.sqlite3")}
+        return at
+
+    def clear_caches(self):
+        import streamlit as st
+
+        st.cache_data.clear()
+        st.cache_resource.clear()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        self.cache_dir.mkdir(parents=True)
+
+    def measure(self, at, action):
+        _api(self.api_url, "/_bench/reset", "POST")
+        started = time.perf_counter()
+        action()
+        at.run()
+        elapsed = time.perf_counter() - started
+        return elapsed, _api(self.api_url, "/_bench/stats"), [e.message for e in at.exception]
+
+    def run_scenario(self, open_page, act):
+        """Run a scenario once, returning {phase: (seconds, stats, errors)}"""
+        results = {}
+        at = None
+        for phase in PHASES:
+            if phase == "cold":
+                self.clear_caches()
+            if phase in ("cold", "warm"):
+                at = self.new_session()
+                if open_page:
+                    open_page(at)
+                if act:
+                    at.run()
+                    results[phase] = self.measure(at, lambda: act(at))
+                else:
+                    results[phase] = self.measure(at, lambda: None)
+            else:
+                results[phase] = self.measure(at, lambda: None)
+        return results
+
+    def run(self, repeat):
+        # Imports (pandas, ...) and the first script compile are paid once per
+        # process; keep them out of the first measured run
+        self.clear_caches()
+        self.new_session().run()
+
+        results = []
+        for name, (open_page, act) in self.scenarios.items():
+            runs = [self.run_scenario(open_page, act) for _ in range(repeat)]
+            for phase in PHASES:
+                seconds = [run[phase][0] for run in runs]
+                _, stats, errors = runs[-1][phase]
+                results.append({
+                    "app": self.app,
+                    "scenario": name,
+                    "phase": phase,
+                    "seconds": {"median": statistics.median(seconds), "min": min(seconds), "max": max(seconds)},
+                    "requests": stats["requests"],
+                    "bytes": stats["bytes"],
+                    "not_modified": stats["not_modified"],
+                    "routes": stats["routes"],
+                    "errors": errors,
+                })
+            print(f"  {self.app}: {name} done", file=sys.stderr)
+        return results
+
+
+def _git_revision():
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                                  capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{revision}-dirty" if dirty else revision
+
+
+def _streamlit_version():
+    try:
+        import streamlit
+    except ImportError:
+        return None
+    return streamlit.__version__
+
+
+def _format_bytes(count):
+    for unit in ("B", "KB", "MB"):
+        if count < 1024:
+            return f"{count:.0f}{unit}"
+        count /= 1024
+    return f"{count:.1f}GB"
+
+
+def print_table(results, baseline=None):
+    """Print the results, with the change against a baseline run when given"""
+    previous = {}
+    if baseline:
+        previous = {(r["app"], r["scenario"], r["phase"]): r for r in baseline["results"]}
+
+    print(f"{'app':9} {'scenario':26} {'phase':6} {'median':>9} {'requests':>9} {'bytes':>9}"
+          + (f" {'was':>9} {'change':>8} {'requests':>9} {'bytes':>9}" if baseline else ""))
+    for result in results:
+        line = (f"{result['app']:9} {result['scenario']:26} {result['phase']:6} "
+                f"{result['seconds']['median'] * 1000:7.0f}ms {result['requests']:9d} "
+                f"{_format_bytes(result['bytes']):>9}")
+        old = previous.get((result["app"], result["scenario"], result["phase"]))
+        if old:
+            change = result["seconds"]["median"] / old["seconds"]["median"] - 1 if old["seconds"]["median"] else 0
+            line += (f" {old['seconds']['median'] * 1000:7.0f}ms {change:+8.0%} {old['requests']:9d} "
+                     f"{_format_bytes(old['bytes']):>9}")
+        if result["errors"]:
+            line += f"  ERROR: {result['errors'][0][:60]}"
+        print(line)
+
+
+def regressions(results, baseline, threshold):
+    """Scenario phases whose median time grew by more than threshold (a fraction)"""
+    previous = {(r["app"], r["scenario"], r["phase"]): r for r in baseline["results"]}
+    slower = []
+    for result in results:
+        old = previous.get((result["app"], result["scenario"], result["phase"]))
+        if old and old["seconds"]["median"] and \
+                result["seconds"]["median"] > old["seconds"]["median"] * (1 + threshold):
+            slower.append(result)
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Bodhi Streamlit apps against a mock API")
+    add_dataset_arguments(parser)
+    parser.add_argument("--apps", nargs="+", choices=("staff", "customer"), default=["staff", "customer"])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per scenario phase (default: 3)")
+    parser.add_argument("--timeout", type=float, default=120, help="seconds allowed per script run")
+    parser.add_argument("--output", default="benchmark_results.json", help="where to write the JSON results")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--max-regression", type=float,
+                        help="with --baseline, exit 1 if a median is this many percent slower")
+    # Internal: run one app's scenarios in this process
+    parser.add_argument("--worker", choices=("staff", "customer"), help=argparse.SUPPRESS)
+    parser.add_argument("--api-url", help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        with tempfile.TemporaryDirectory(prefix="bodhi-bench-") as cache_dir:
+            results = _Worker(args.worker, args.api_url, cache_dir, args.timeout).run(args.repeat)
+        Path(args.result_file).write_text(json.dumps(results))
+        return
+
+    started = time.perf_counter()
+    dataset = dataset_from_args(args)
+    print(f"Generated {dataset.sizes()} in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    server = start(dataset)
+    api_url = f"http://127.0.0.1:{server.server_port}/api"
+
+    results = []
+    try:
+        for app in args.apps:
+            print(f"Running {app} app scenarios...", file=sys.stderr)
+            with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as result_file:
+                pass
+            try:
+                subprocess.run([sys.executable, __file__, "--worker", app, "--api-url", api_url,
+                                "--repeat", str(args.repeat), "--timeout", str(args.timeout),
+                                "--result-file", result_file.name],
+                               # The apps print debug output of their own
+                               stdout=subprocess.DEVNULL, check=True)
+                results.extend(json.loads(Path(result_file.name).read_text()))
+            finally:
+                os.unlink(result_file.name)
+    finally:
+        server.shutdown()
+
+    report = {
+        "meta": {
+            "revision": _git_revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "streamlit": _streamlit_version(),
+            "platform": platform.platform(),
+            "dataset": dict(dataset.sizes(), seed=args.seed),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2))
+
+    baseline = json.loads(Path(args.baseline).read_text()) if args.baseline else None
+    if baseline and baseline["meta"]["dataset"] != report["meta"]["dataset"]:
+        print(f"Warning: baseline dataset {baseline['meta']['dataset']} differs from this run's", file=sys.stderr)
+    print_table(results, baseline)
+    print(f"\nResults written to {args.output}")
+
+    if baseline and args.max_regression is not None:
+        slower = regressions(results, baseline, args.max_regression / 100)
+        if slower:
+            print(f"{len(slower)} scenario phase(s) more than {args.max_regression:g}% slower than the baseline")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
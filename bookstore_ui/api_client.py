@@ -0,0 +1,224 @@
+import threading
+from collections import OrderedDict
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Shared HTTP client for the staff app.
+#
+# Every helper in bookstore.py goes through one requests.Session so that
+# TCP/TLS connections to the API are pooled and kept alive across calls and
+# across reruns instead of being re-opened for every request.
+#
+# Responses are compressed on the wire (gzip, plus br/zstd when brotli or
+# zstandard is installed) and response.json() decodes the body once, with
+# orjson when it is installed; repeated calls return the same parsed object,
+# so callers must treat it as read-only.
+#
+# _memoize_json and _decode mirror client-customer/services/http_client.py;
+# keep the two in step. They can't share one module: the storefront is deployed
+# on its own with client-customer/ as its import root, and a hyphenated
+# directory isn't importable from here.
+#
+# GETs are also coalesced ("single-flight"): while a GET is in flight, an
+# identical one (same URL, params and headers, so the same auth scope) from any
+# session waits for it and shares its response instead of reaching the API.
+#
+# GET responses that carry an ETag are kept (up to validator_cache_entries of
+# them) and the next identical GET is sent with If-None-Match. When the API
+# answers 304 the kept response, with its already parsed JSON, is returned, so
+# unchanged data costs neither a download nor a parse.
+
+DEFAULT_CONNECT_TIMEOUT = 3.05
+DEFAULT_READ_TIMEOUT = 30
+DEFAULT_POOL_CONNECTIONS = 4
+DEFAULT_POOL_MAXSIZE = 16
+DEFAULT_VALIDATOR_CACHE_ENTRIES = 32
+
+
+def _freeze(value):
+    """Hashable form of request params (dict, list of pairs, str or None)"""
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _memoize_json(response, **kwargs):
+    """Response hook: make response.json() decode the body once, with orjson if available"""
+    parse = response.json
+    parsed = []
+
+    def json(**kwargs):
+        if kwargs:
+            return parse(**kwargs)
+        if not parsed:
+            parsed.append(_decode(response, parse))
+        return parsed[0]
+
+    response.json = json
+    return response
+
+
+def _decode(response, parse):
+    if orjson is not None:
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            pass  # not UTF-8 JSON; let requests raise its usual error
+    return parse()
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
+
+class ApiClient:
+    def __init__(self, headers_provider=None, connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout=DEFAULT_READ_TIMEOUT, pool_connections=DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE, host_pool_sizes=None,
+                 validator_cache_entries=DEFAULT_VALIDATOR_CACHE_ENTRIES):
+        self.headers_provider = headers_provider
+        self.timeout = (connect_timeout, read_timeout)
+
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+        self._counts = {"gets": 0, "coalesced": 0, "not_modified": 0}
+        self._validated = OrderedDict()  # request key -> (etag, response)
+        self.validator_cache_entries = validator_cache_entries
+
+        self.session = requests.Session()
+        # The session is shared by every logged-in user of this process, so it
+        # must never remember cookies from one user's responses for another.
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        self.session.headers["Accept-Encoding"] = make_headers(accept_encoding=True)["accept-encoding"]
+        self.session.hooks["response"].append(_memoize_json)
+
+        default_adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", default_adapter)
+        self.session.mount("http://", default_adapter)
+
+        # Per-host pools, e.g. {"https://bodhi-23sn.onrender.com": 32}
+        for prefix, maxsize in (host_pool_sizes or {}).items():
+            self.mount_host(prefix, maxsize)
+
+    def mount_host(self, prefix, pool_maxsize):
+        """Give one host (URL prefix) its own connection pool size"""
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=int(pool_maxsize))
+        self.session.mount(prefix, adapter)
+
+    def request(self, method, url, headers=None, auth=True, **kwargs):
+        """Send a request with the default auth headers and timeouts applied"""
+        merged_headers = {}
+        if auth and self.headers_provider:
+            merged_headers.update(self.headers_provider())
+        if headers:
+            merged_headers.update(headers)
+
+        kwargs.setdefault("timeout", self.timeout)
+        if method != "GET" or kwargs.get("stream") or set(kwargs) - {"params", "timeout"}:
+            return self.session.request(method, url, headers=merged_headers, **kwargs)
+
+        key = (url, _freeze(kwargs.get("params")), _freeze(merged_headers))
+        with self._flights_lock:
+            self._counts["gets"] += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self._counts["coalesced"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.response
+
+        try:
+            flight.response = self._send_conditional(key, url, merged_headers, kwargs)
+            return flight.response
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._flights_lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def _send_conditional(self, key, url, headers, kwargs):
+        """GET, revalidating a kept response with If-None-Match when there is one"""
+        # Callers sending their own validator handle the 304 themselves
+        conditional = "If-None-Match" not in headers
+        with self._flights_lock:
+            kept = self._validated.get(key) if conditional else None
+        if kept:
+            headers = dict(headers, **{"If-None-Match": kept[0]})
+
+        response = self.session.request("GET", url, headers=headers, **kwargs)
+        if kept and response.status_code == 304:
+            with self._flights_lock:
+                self._counts["not_modified"] += 1
+                if key in self._validated:
+                    self._validated.move_to_end(key)
+            return kept[1]
+
+        if conditional:
+            etag = response.headers.get("ETag")
+            with self._flights_lock:
+                if response.status_code == 200 and etag and self.validator_cache_entries:
+                    self._validated[key] = (etag, response)
+                    self._validated.move_to_end(key)
+                    while len(self._validated) > self.validator_cache_entries:
+                        self._validated.popitem(last=False)
+                else:
+                    self._validated.pop(key, None)
+        return response
+
+    def stats(self):
+        """GETs sent, how many shared an in-flight request or were answered 304"""
+        with self._flights_lock:
+            return dict(self._counts, in_flight=len(self._flights), validators=len(self._validated))
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+@st.cache_resource
+def get_api_client(_headers_provider=None):
+    """Return the process-wide API client, configured from the [api] secrets"""
+    api_config = st.secrets["api"]
+    return ApiClient(
+        headers_provider=_headers_provider,
+        connect_timeout=float(api_config.get("connect_timeout", DEFAULT_CONNECT_TIMEOUT)),
+        read_timeout=float(api_config.get("read_timeout", DEFAULT_READ_TIMEOUT)),
+        pool_connections=int(api_config.get("pool_connections", DEFAULT_POOL_CONNECTIONS)),
+        pool_maxsize=int(api_config.get("pool_maxsize", DEFAULT_POOL_MAXSIZE)),
+        host_pool_sizes=dict(api_config.get("host_pool_sizes", {})),
+        validator_cache_entries=int(api_config.get("validator_cache_entries",
+                                                   DEFAULT_VALIDATOR_CACHE_ENTRIES)),
+    )
@@ -0,0 +1,199 @@
+import codecs
+import csv
+import io
+import json
+import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# Bulk inventory import.
+#
+# Rows are read from the uploaded file, validated, and grouped into batches
+# that are upserted by ISBN through the bulk mode of POST /books. CSV and JSON
+# Lines files are read one row at a time; a JSON array is parsed whole, so
+# large imports should use JSON Lines. A bounded number of batches is in
+# flight at once, so load on the API stays flat however large the file is.
+#
+# ISBNs are sent exactly as written (trimmed): the server matches the stored
+# ISBN string, so rewriting it here would miss books saved with separators.
+# Only the columns present in the file are sent, so re-importing a price list
+# leaves stock and language alone; the server fills defaults for new books.
+
+DEFAULT_BATCH_SIZE = 250
+DEFAULT_WORKERS = 4
+
+# Accepted column names (lowercased, spaces and underscores removed) per field
+COLUMN_ALIASES = {
+    "title": ("title",),
+    "author": ("author", "authors"),
+    "genre": ("genre", "category"),
+    "isbn": ("isbn", "isbn13", "isbn10"),
+    "quantity": ("quantity", "qty", "stock", "copies"),
+    "price": ("price",),
+    "language": ("language", "lang"),
+    "summary": ("summary", "description"),
+    "publisher": ("publisher",),
+    "publicationDate": ("publicationdate", "published", "publishdate"),
+    "pageCount": ("pagecount", "pages"),
+    "coverImageUrl": ("coverimageurl", "cover", "coverurl"),
+}
+REQUIRED_FIELDS = ("title", "author", "genre", "isbn", "price")
+
+_ALIAS_TO_FIELD = {alias: field for field, aliases in COLUMN_ALIASES.items() for alias in aliases}
+
+
+def normalize_isbn(value):
+    """Return the ISBN without separators if its check digit is valid, else None.
+
+    Used only to validate; the ISBN is uploaded as written.
+    """
+    isbn = re.sub(r"[\s-]", "", str(value or "")).upper()
+    if re.fullmatch(r"\d{9}[\dX]", isbn):
+        total = sum((10 - i) * (10 if ch == "X" else int(ch)) for i, ch in enumerate(isbn))
+        return isbn if total % 11 == 0 else None
+    if re.fullmatch(r"\d{13}", isbn):
+        total = sum(int(ch) * (1 if i % 2 == 0 else 3) for i, ch in enumerate(isbn))
+        return isbn if total % 10 == 0 else None
+    return None
+
+
+def validate_row(row):
+    """Map a raw row onto book fields; returns (book, list of problems)"""
+    book = {}
+    for column, value in row.items():
+        field = _ALIAS_TO_FIELD.get(re.sub(r"[\s_]", "", str(column or "")).lower())
+        if field and value not in (None, ""):
+            book[field] = value.strip() if isinstance(value, str) else value
+
+    problems = [f"missing {field}" for field in REQUIRED_FIELDS if not book.get(field)]
+
+    if book.get("isbn"):
+        book["isbn"] = str(book["isbn"]).strip()
+        if not normalize_isbn(book["isbn"]):
+            problems.append(f"invalid ISBN '{book['isbn']}'")
+
+    if book.get("price") is not None:
+        try:
+            book["price"] = round(float(str(book["price"]).lstrip("$").replace(",", "")), 2)
+            if book["price"] < 0:
+                problems.append("price cannot be negative")
+        except ValueError:
+            problems.append(f"invalid price '{book['price']}'")
+
+    if book.get("quantity") is not None:
+        try:
+            quantity = float(book["quantity"])
+            if quantity < 0 or not quantity.is_integer():
+                problems.append("quantity must be a whole number of at least 0")
+            book["quantity"] = int(quantity)
+        except (TypeError, ValueError):
+            problems.append(f"invalid quantity '{book['quantity']}'")
+
+    return book, problems
+
+
+def iter_rows(file, filename):
+    """Yield (row number, row dict) from a CSV, JSON array or JSON Lines upload.
+
+    CSV and JSON Lines are decoded line by line; a JSON array is loaded into
+    memory in full before its rows are yielded.
+    """
+    name = filename.lower()
+    if name.endswith(".csv"):
+        reader = csv.DictReader(codecs.iterdecode(file, "utf-8-sig"))
+        # Row 1 is the header
+        for number, row in enumerate(reader, start=2):
+            yield number, row
+    elif name.endswith((".jsonl", ".ndjson")):
+        for number, line in enumerate(codecs.iterdecode(file, "utf-8-sig"), start=1):
+            if line.strip():
+                yield number, json.loads(line)
+    else:
+        rows = json.load(codecs.getreader("utf-8-sig")(file))
+        if isinstance(rows, dict):
+            rows = rows.get("books", [])
+        for number, row in enumerate(rows, start=1):
+            yield number, row
+
+
+class ImportReport:
+    def __init__(self):
+        self.rows = 0
+        self.inserted = 0
+        self.updated = 0
+        self.errors = []  # {"row", "isbn", "error"}
+
+    def add_error(self, number, isbn, problem):
+        self.errors.append({"row": number, "isbn": isbn, "error": problem})
+
+    def errors_csv(self):
+        out = io.StringIO()
+        writer = csv.DictWriter(out, fieldnames=["row", "isbn", "error"])
+        writer.writeheader()
+        writer.writerows(self.errors)
+        return out.getvalue()
+
+
+def import_books(rows, post_batch, batch_size=DEFAULT_BATCH_SIZE, workers=DEFAULT_WORKERS,
+                 on_progress=None):
+    """Validate rows and upsert them in batches with at most `workers` in flight.
+
+    post_batch(books) must return the parsed bulk POST /books response
+    ({"inserted", "updated", "errors": [{"index", "error"}]}) or raise.
+    on_progress(report) is called from the calling thread after every batch.
+    """
+    report = ImportReport()
+    in_flight = {}
+
+    def collect(done):
+        for future in done:
+            numbers, books = in_flight.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                for number, book in zip(numbers, books):
+                    report.add_error(number, book.get("isbn"), f"batch failed: {e}")
+                continue
+            report.inserted += result.get("inserted", 0)
+            report.updated += result.get("updated", 0)
+            for error in result.get("errors", []):
+                index = error.get("index", 0)
+                report.add_error(numbers[index], books[index].get("isbn"), error.get("error"))
+        if on_progress:
+            on_progress(report)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        numbers, batch = [], []
+
+        def submit():
+            # Wait for a slot so at most `workers` batches are held in memory
+            if len(in_flight) >= workers:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+            in_flight[executor.submit(post_batch, batch)] = (numbers, batch)
+
+        try:
+            for number, row in rows:
+                report.rows += 1
+                if not isinstance(row, dict):
+                    report.add_error(number, None, "row is not an object")
+                    continue
+                book, problems = validate_row(row)
+                if problems:
+                    report.add_error(number, book.get("isbn"), "; ".join(problems))
+                    continue
+                numbers.append(number)
+                batch.append(book)
+                if len(batch) >= batch_size:
+                    submit()
+                    numbers, batch = [], []
+        except (csv.Error, UnicodeDecodeError, ValueError) as e:
+            report.add_error(report.rows + 1, None, f"could not read file: {e}")
+
+        if batch:
+            submit()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            collect(done)
+
+    report.errors.sort(key=lambda error: error["row"])
+    return report
@@ -1,8 +1,15 @@
+import os
 import time
+import uuid
 
 import requests
 import streamlit as st
 
+from bookstore_ui.api_client import get_api_client
+from bookstore_ui.catalog_cache import (apply_changes, get_catalog_cache, make_key,
+                                        make_page_key)
+from bookstore_ui.fuzzy_search import TrigramIndex
+
 API_BASE_URL = st.secrets["api"]["base_url"]
 if not API_BASE_URL:
     raise ValueError("API_BASE_URL is not set in Streamlit secrets.")
@@ -11,7 +18,36 @@ API_BOOKS_URL = API_BOOKS_URL = f"{API_BASE_URL}/books"
 API_USER_URL = f"{API_BASE_URL}/users"
 API_AUTH_URL = f"{API_BASE_URL}/auth"
 API_MFRORDER_URL = f"{API_BASE_URL}/manufacturerOrders"
-API_SALESREPORTS_URL = f"{API_BASE_URL}/reports/sales"
+API_SALES_URL = f"{API_BASE_URL}/sales"
+
+# Read timeout (seconds) for the Sales Records pull, and how long a session
+# reuses it before pulling again
+REPORT_TIMEOUT = float(st.secrets["api"].get("report_timeout", 15))
+SALES_CACHE_TTL = float(st.secrets.get("cache", {}).get("sales_ttl", 60))
+SALES_PAGE_SIZE = 25
+
+# Bulk import: books per POST, batches in flight at once, and read timeout per batch
+import_config = st.secrets.get("import", {})
+IMPORT_BATCH_SIZE = int(import_config.get("batch_size", 250))
+IMPORT_WORKERS = int(import_config.get("workers", 4))
+IMPORT_TIMEOUT = float(import_config.get("timeout", 60))
+
+# Rows fetched per request when exporting (the API's largest page sizes)
+EXPORT_PAGE_SIZE = 500
+EXPORT_SALES_PAGE_SIZE = 200
+
+# Fields the list views use (the API's ?fields= projection); dialogs that show
+# or edit everything about one record fetch the whole document
+BOOK_LIST_FIELDS = "title,author,genre,isbn,language,quantity,price,updatedAt"
+SALE_LIST_FIELDS = "orderDate,type,orderStatus,paymentMethod,totalPrice,shippingAddress,orderItems"
+ORDER_LIST_FIELDS = "orderNumber,status,supplierName,orderDate,totalCost"
+
+# Pooled, keep-alive client shared by every function below. Auth headers are
+# resolved per request from the calling user's session.
+api_client = get_api_client(_headers_provider=lambda: get_auth_headers())
+
+# Shared TTL cache of GET /books results, patched by the write helpers below
+catalog_cache = get_catalog_cache()
 
 # Define all functions
 
@@ -49,10 +85,44 @@ def formatDatetime(datetime):
         
     return (f"{date} {time}")
 
+# Bring the cached, unfiltered catalog up to date with only the books changed
+# or deleted since its last sync. Returns None if the sync endpoint fails.
+def sync_catalog():
+    cache_key = make_key()
+    books, cursor = catalog_cache.peek(cache_key)
+    params = {'since': cursor} if cursor else {}
+    params['fields'] = BOOK_LIST_FIELDS
+
+    response = api_client.get(f"{API_BOOKS_URL}/changes", params=params)
+    if response.status_code != 200:
+        return None
+
+    changes = response.json()
+    if changes['fullSync'] or books is None:
+        books = changes['books']
+    elif not changes['books'] and not changes['deleted']:
+        # Unchanged: keep the entry (and its version) for another TTL
+        catalog_cache.touch(cache_key, changes['cursor'])
+        return books
+    else:
+        books = apply_changes(books, changes['books'], changes['deleted'])
+    catalog_cache.put(cache_key, books, cursor=changes['cursor'])
+    return books
+
 # function to fetch all books- Passed testing
 
 def fetch_books(genre=None, title=None, author=None):
-    params = {}
+    cache_key = make_key(genre=genre, author=author, title=title)
+    books = catalog_cache.get(cache_key)
+    if books is not None:
+        return books
+
+    if cache_key == make_key():
+        books = sync_catalog()
+        if books is not None:
+            return books
+
+    params = {'fields': BOOK_LIST_FIELDS}
     if genre:
         params['genre'] = genre
     if title:
@@ -61,18 +131,94 @@ def fetch_books(genre=None, title=None, author=None):
         params['author'] = author
    
 
-    response = requests.get(API_BOOKS_URL, params=params, headers=get_auth_headers())
+    response = api_client.get(API_BOOKS_URL, params=params)
     
     if response.status_code == 200:
-        return response.json()  
+        books = response.json()
+        catalog_cache.put(cache_key, books)
+        return books
     else:
         st.error("Failed to fetch books. Please try again.")
         return []
 
+# Function to fetch one page of books for the inventory table. Returns
+# (books, total matching books); only that page is transferred.
+def fetch_books_page(page=1, page_size=50, sort="title", order="asc", genre=None, title=None, author=None):
+    skip = (max(page, 1) - 1) * page_size
+    cache_key = make_page_key(genre=genre, author=author, title=title,
+                              sort=sort, order=order, skip=skip, limit=page_size)
+    cached = catalog_cache.get_page(cache_key)
+    if cached is not None:
+        return cached
+
+    params = {'sort': sort, 'order': order, 'skip': skip, 'limit': page_size,
+              'fields': BOOK_LIST_FIELDS}
+    if genre:
+        params['genre'] = genre
+    if title:
+        params['title'] = title
+    if author:
+        params['author'] = author
+
+    response = api_client.get(API_BOOKS_URL, params=params)
+    if response.status_code == 200:
+        books = response.json()
+        total = int(response.headers.get('X-Total-Count', len(books)))
+        catalog_cache.put_page(cache_key, books, total)
+        return books, total
+    else:
+        st.error("Failed to fetch books. Please try again.")
+        return [], 0
+
+# Function to page through every book matching the filters, for exports.
+# Bypasses the catalog cache so an export does not evict the inventory pages.
+def iter_book_pages(sort="title", order="asc", genre=None, title=None, author=None,
+                    page_size=EXPORT_PAGE_SIZE):
+    from bookstore_ui.exports import BOOK_COLUMNS
+
+    params = {'sort': sort, 'order': order, 'limit': page_size,
+              'fields': ",".join(name for name, _ in BOOK_COLUMNS if name != "_id")}
+    for name, value in (('genre', genre), ('title', title), ('author', author)):
+        if value:
+            params[name] = value
+
+    skip = 0
+    while True:
+        response = api_client.get(API_BOOKS_URL, params=dict(params, skip=skip))
+        response.raise_for_status()
+        books = response.json()
+        if books:
+            yield books
+        if len(books) < page_size:
+            return
+        skip += len(books)
+
+# Closest existing titles or authors for a filter value that matched nothing.
+# The trigram index is built from the cached catalog and kept, per field,
+# until the catalog cache gives the catalog a new version.
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _fuzzy_index(field, catalog_version, _books):
+    return TrigramIndex(_books, fields=(field,))
+
+def suggest_books(query, field, k=5):
+    fetch_books()  # bring the cached catalog up to date
+    books, version = catalog_cache.versioned(make_key())
+    if books is None:
+        index = TrigramIndex(fetch_books(), fields=(field,))
+    else:
+        index = _fuzzy_index(field, version, books)
+
+    suggestions = {}
+    for score, book, _ in index.search(query, k=k * 4):
+        value = book.get(field)
+        if value not in suggestions:
+            suggestions[value] = score
+    return list(suggestions.items())[:k]
+
 # function to get one book by id
 def fetch_book_by_id(book_id):
 
-    response = requests.get(API_BOOKS_URL + f'/{book_id}', headers=get_auth_headers())
+    response = api_client.get(API_BOOKS_URL + f'/{book_id}')
     
     if response.status_code == 200:
         return response.json()  
@@ -80,6 +226,36 @@ def fetch_book_by_id(book_id):
         st.error("Failed to fetch book. Please try again.")
         return []
 
+# Function to look up many books at once. Returns an id -> book map; ids that
+# no longer exist are simply missing from it. Books already resolved in this
+# session are served from st.session_state.book_lookup, so dialog reruns do
+# not go back to the API.
+MAX_IDS_PER_REQUEST = 150
+
+def fetch_books_by_ids(ids):
+    if 'book_lookup' not in st.session_state:
+        st.session_state.book_lookup = {}
+    lookup = st.session_state.book_lookup
+
+    wanted = list(dict.fromkeys(str(book_id) for book_id in ids))
+    missing = [book_id for book_id in wanted if book_id not in lookup]
+
+    for i in range(0, len(missing), MAX_IDS_PER_REQUEST):
+        chunk = missing[i:i + MAX_IDS_PER_REQUEST]
+        response = api_client.get(API_BOOKS_URL, params={'ids': ",".join(chunk)})
+        if response.status_code != 200:
+            st.error("Failed to fetch books. Please try again.")
+            break
+        for book in response.json():
+            lookup[book['_id']] = book
+
+    return {book_id: lookup[book_id] for book_id in wanted if book_id in lookup}
+
+# Drop a book from the session's id -> book map after it changes
+def forget_book(book_id):
+    if 'book_lookup' in st.session_state:
+        st.session_state.book_lookup.pop(str(book_id), None)
+
 # Function to add a book- Passed testing
 def add_book(title, author, genre, quantity, price, language, isbn):
     new_book = {
@@ -94,14 +270,51 @@ def add_book(title, author, genre, quantity, price, language, isbn):
     }
 
     # Send the data to the API
-    response = requests.post(API_BOOKS_URL, json=new_book, headers=get_auth_headers())
+    response = api_client.post(API_BOOKS_URL, json=new_book)
     
     # Handle the response
     if response.status_code == 201:
+        catalog_cache.add_book(response.json())
         st.success("Book added successfully!")
     else:
         st.error(f"Failed to add book: {response.text}")
         
+# Function to import books in bulk from an uploaded CSV or JSON file
+def import_inventory(uploaded_file):
+    """Upsert every valid row by ISBN, showing progress; returns the ImportReport"""
+    from bookstore_ui.book_import import import_books, iter_rows
+
+    # Batches are posted from worker threads, which cannot read session state
+    headers = get_auth_headers()
+
+    def post_batch(books):
+        response = api_client.post(API_BOOKS_URL, json=books, headers=headers, auth=False,
+                                   timeout=(api_client.timeout[0], IMPORT_TIMEOUT))
+        if response.status_code != 200:
+            raise requests.exceptions.HTTPError(response.text, response=response)
+        return response.json()
+
+    progress = st.progress(0.0, text="Starting import...")
+    size = max(uploaded_file.size, 1)
+
+    def on_progress(report):
+        progress.progress(
+            min(uploaded_file.tell() / size, 1.0),
+            text=f"{report.rows:,} rows read: {report.inserted:,} added, "
+                 f"{report.updated:,} updated, {len(report.errors):,} rejected",
+        )
+
+    report = import_books(iter_rows(uploaded_file, uploaded_file.name), post_batch,
+                          batch_size=IMPORT_BATCH_SIZE, workers=IMPORT_WORKERS,
+                          on_progress=on_progress)
+    on_progress(report)
+    progress.progress(1.0)
+
+    # Imported rows may have changed any cached book
+    catalog_cache.clear()
+    st.session_state.pop("book_lookup", None)
+    return report
+
 # Function to update an existing book 
 def update_book(book_id, title, author, genre, quantity, price, language=None, isbn=None):
     updated_book = {
@@ -117,8 +330,10 @@ def update_book(book_id, title, author, genre, quantity, price, language=None, i
     if isbn:
         updated_book["isbn"] = isbn
         
-    response = requests.put(f"{API_BOOKS_URL}/{book_id}", json=updated_book, headers=get_auth_headers())
+    response = api_client.put(f"{API_BOOKS_URL}/{book_id}", json=updated_book)
+    forget_book(book_id)
     if response.status_code == 200:
+        catalog_cache.update_book(response.json())
         st.success(f"Book '{title}' updated successfully!")
         return True
     else:
@@ -128,8 +343,10 @@ def update_book(book_id, title, author, genre, quantity, price, language=None, i
     
 # Function to delete a book
 def delete_book(book_id):
-    response = requests.delete(f"{API_BOOKS_URL}/{book_id}", headers=get_auth_headers())
+    response = api_client.delete(f"{API_BOOKS_URL}/{book_id}")
+    forget_book(book_id)
     if response.status_code == 200:
+        catalog_cache.delete_book(book_id)
         st.success("Book deleted successfully.")
     else:
         st.error(f"Failed to delete the book: {response.text}")
@@ -139,7 +356,7 @@ def delete_book(book_id):
     
 # Function to fetch mfr order by id
 def fetch_order_by_id(order_id):
-    response = requests.get(API_MFRORDER_URL + f'/{order_id}', headers=get_auth_headers())
+    response = api_client.get(API_MFRORDER_URL + f'/{order_id}')
     if response.status_code == 200:
         return response.json()  # Returns list of orders as JSON
     else:
@@ -149,7 +366,7 @@ def fetch_order_by_id(order_id):
  
 # Function to fetch manufacturer orders
 def fetch_orders(orderNo=None, supplierName=None, status=None):
-    params = {}
+    params = {"fields": ORDER_LIST_FIELDS}
     if orderNo:
         print(orderNo)
         params["orderNumber"] = orderNo
@@ -158,7 +375,7 @@ def fetch_orders(orderNo=None, supplierName=None, status=None):
     if status:
          params['status'] = str(status).lower()
         
-    response = requests.get(API_MFRORDER_URL, params=params, headers=get_auth_headers())
+    response = api_client.get(API_MFRORDER_URL, params=params)
     if response.status_code == 200:
         return response.json()  # Returns list of orders as JSON
     else:
@@ -179,18 +396,9 @@ def update_mfr_order(order_id, orderNumber, supplierName, status, booksOrdered,
 
     # if order status is received, add qty to stock
     if status == 'received':
-        for book in booksOrdered:
-            bookDetails = fetch_book_by_id(book['bookId'])
-            update_book(
-                book_id=book['bookId'], 
-                title=bookDetails['title'], 
-                author=bookDetails['author'], 
-                genre=bookDetails['genre'], 
-                quantity=(int(bookDetails['quantity']) + int(book['quantity'])), 
-                price=bookDetails['price']
-            )
-        
-    response = requests.put(f"{API_MFRORDER_URL}/{order_id}", json=updated_order, headers=get_auth_headers())
+        return receive_mfr_order(order_id, orderNumber, updated_order)
+
+    response = api_client.put(f"{API_MFRORDER_URL}/{order_id}", json=updated_order)
     if response.status_code == 200:
         st.success(f"Book '{orderNumber}' updated successfully!")
         return True
@@ -198,6 +406,29 @@ def update_mfr_order(order_id, orderNumber, supplierName, status, booksOrdered,
         st.error(f"Failed to update order: {response.text}")
         return False
 
+# Function to receive an order: mark it received and add every line to stock
+def receive_mfr_order(order_id, orderNumber, updated_order):
+    # One key per receive, reused by any retry, so stock is never added twice
+    receive_keys = st.session_state.setdefault("receive_keys", {})
+    key = receive_keys.setdefault(order_id, uuid.uuid4().hex)
+
+    response = api_client.post(
+        f"{API_MFRORDER_URL}/{order_id}/receive",
+        json=updated_order,
+        headers={"Idempotency-Key": key},
+    )
+    if response.status_code != 200:
+        st.error(f"Failed to receive order: {response.text}")
+        return False
+
+    books = response.json()["books"]
+    for book in books:
+        forget_book(book["_id"])
+        catalog_cache.update_book(book)
+    receive_keys.pop(order_id, None)
+    st.success(f"Order '{orderNumber}' received and added to stock!")
+    return True
+
 # delete book from order
 def remove_book(bookId):
     new_order_list = []
@@ -215,8 +446,9 @@ def display_books():
         st.session_state['booksOrdered'] = []
 
     cols = st.columns([4,2])
+    books = fetch_books_by_ids(book['bookId'] for book in st.session_state['booksOrdered'])
     for bookOrdered in st.session_state['booksOrdered']:
-        book = fetch_book_by_id(bookOrdered['bookId'])
+        book = books.get(str(bookOrdered['bookId']), {'title': "(deleted book)"})
         cols[0].write(book['title'])
         cols[1].write(bookOrdered['quantity'])
         #if cols[2].button("🗑️", key=f'remove_{bookOrdered['bookId']}'):
@@ -226,7 +458,7 @@ def display_books():
 
 def cancel_order(order_id):
     orderIdFormatted = str(order_id)
-    response = requests.put(f"{API_MFRORDER_URL}/cancel/{orderIdFormatted}", headers=get_auth_headers())
+    response = api_client.put(f"{API_MFRORDER_URL}/cancel/{orderIdFormatted}")
     if response.status_code == 200:
         st.success(f"Order canceled successfully!")
         st.rerun()
@@ -245,7 +477,7 @@ def add_user_api(email, password, first_name, last_name, role):
         "role": role
     }
     try:
-        response = requests.post(f"{API_AUTH_URL}/register", json=new_user)
+        response = api_client.post(f"{API_AUTH_URL}/register", json=new_user, auth=False)
         response_data = response.json()
         
         if response.status_code == 201:
@@ -268,7 +500,7 @@ def update_user_api(user_id, email, first_name, last_name, role, is_active, pass
         update_data["password"] = password
 
     try:
-        response = requests.put(f"{API_USER_URL}/{user_id}", json=update_data, headers=get_auth_headers())
+        response = api_client.put(f"{API_USER_URL}/{user_id}", json=update_data)
         response_data = response.json()
         
         if response.status_code == 200:
@@ -281,7 +513,7 @@ def update_user_api(user_id, email, first_name, last_name, role, is_active, pass
 # Function to delete user
 def delete_user_api(user_id):
     try:
-        response = requests.delete(f"{API_USER_URL}/{user_id}", headers=get_auth_headers())
+        response = api_client.delete(f"{API_USER_URL}/{user_id}")
         
         if response.status_code == 200:
             return True, "User deleted successfully!"
@@ -298,7 +530,7 @@ def fetch_users_api():
         # Add debug logging
         print("Fetching users with headers:", headers)
         
-        response = requests.get(f"{API_USER_URL}", headers=headers)
+        response = api_client.get(f"{API_USER_URL}", auth=False, headers=headers)
         # Add debug logging
         print("Users API response status:", response.status_code)
         print("Users API response:", response.text)
@@ -326,7 +558,7 @@ def handle_login():
         # Add debug logging
         print("Attempting login with email:", credentials['email'])
         
-        response = requests.post(f"{API_AUTH_URL}/login", json=credentials)
+        response = api_client.post(f"{API_AUTH_URL}/login", json=credentials, auth=False)
         response_data = response.json()
         
         # Add debug logging
@@ -401,6 +633,342 @@ def get_auth_headers():
     
     return headers
 
+# Function to pull the sales for a date range once and keep them for the session
+def load_sales_analytics(start_date=None, end_date=None):
+    """Return SalesAnalytics for the date range, reusing this session's last pull"""
+    from bookstore_ui.sales_analytics import SalesAnalytics
+
+    key = (start_date, end_date)
+    cached = st.session_state.get("sales_analytics")
+    if cached and cached[0] == key and time.monotonic() - cached[1] < SALES_CACHE_TTL:
+        return cached[2]
+
+    params = {"startDate": start_date, "endDate": end_date}
+    params = {k: v for k, v in params.items() if v}
+    response = api_client.get(
+        API_SALES_URL,
+        params=dict(params, view="list", fields=SALE_LIST_FIELDS),
+        timeout=(api_client.timeout[0], REPORT_TIMEOUT),
+    )
+    response.raise_for_status()
+    # Same ETag as the last pull: the sales are unchanged (the API answered
+    # 304), so keep the frame instead of rebuilding it
+    etag = response.headers.get("ETag")
+    if cached and cached[0] == key and etag and cached[3] == etag:
+        analytics = cached[2]
+    else:
+        analytics = SalesAnalytics.from_sales(response.json())
+    st.session_state.sales_analytics = (key, time.monotonic(), analytics, etag)
+    return analytics
+
+# Function to fetch one page of matching sales, newest first
+def fetch_sales_page(filter_params, before=None, limit=SALES_PAGE_SIZE):
+    """Return (sales, cursor for the next page or None)"""
+    params = dict(filter_params, limit=limit, view="list", fields=SALE_LIST_FIELDS)
+    if before:
+        params["before"] = before
+    response = api_client.get(API_SALES_URL, params=params,
+                              timeout=(api_client.timeout[0], REPORT_TIMEOUT))
+    response.raise_for_status()
+    return response.json(), response.headers.get("X-Next-Cursor")
+
+# Function to page through every sale matching the filters, for exports
+def iter_sales_pages(filter_params, page_size=EXPORT_SALES_PAGE_SIZE):
+    cursor = None
+    while True:
+        sales, cursor = fetch_sales_page(filter_params, before=cursor, limit=page_size)
+        if sales:
+            yield sales
+        if not cursor:
+            return
+
+# Function to bring the shared daily sales rollups up to date
+def sync_sales_rollups(rollups):
+    """Apply the sales changed since the last sync, at most once per SALES_CACHE_TTL"""
+    if not rollups.is_stale(SALES_CACHE_TTL):
+        return
+    cursor, _ = rollups.sync_state()
+    response = api_client.get(
+        f"{API_SALES_URL}/changes",
+        params={"since": cursor} if cursor else None,
+        timeout=(api_client.timeout[0], REPORT_TIMEOUT),
+    )
+    response.raise_for_status()
+    rollups.apply_changes(response.json())
+
+def remove_export_file(export):
+    try:
+        os.remove(export["path"])
+    except OSError:
+        pass
+
+# Export controls: write the pages to a temporary file, then offer it for
+# download until the filters change or a new export is prepared
+def render_export(key, make_pages, columns, filters):
+    from bookstore_ui.exports import FORMATS, parquet_available, write_export
+
+    formats = [fmt for fmt in FORMATS if fmt != "Parquet" or parquet_available()]
+    col1, col2 = st.columns([3, 1])
+    fmt = col1.radio("Format", formats, horizontal=True, key=f"{key}_export_format")
+    state_key = f"{key}_export"
+    export = st.session_state.get(state_key)
+
+    if col2.button("Prepare Export", key=f"{key}_export_button"):
+        progress = st.empty()
+        try:
+            path, rows = write_export(
+                make_pages(), columns, fmt,
+                on_progress=lambda n: progress.caption(f"{n:,} rows written..."),
+            )
+        except requests.exceptions.RequestException as e:
+            st.error(f"Export failed: {str(e)}")
+            return
+        finally:
+            progress.empty()
+        if export:
+            remove_export_file(export)
+        export = st.session_state[state_key] = {"path": path, "format": fmt, "rows": rows, "filters": filters}
+    elif export and export["filters"] != filters:
+        remove_export_file(export)
+        export = st.session_state[state_key] = None
+
+    if export:
+        suffix, mime = FORMATS[export["format"]]
+
+        # Read only when the button is clicked, not into memory on every rerun
+        def read_export(path=export["path"]):
+            with open(path, "rb") as f:
+                return f.read()
+
+        st.download_button(
+            f"Download {export['rows']:,} rows ({export['format']})",
+            data=read_export,
+            file_name=f"{key}{suffix}",
+            mime=mime,
+            key=f"{key}_export_download",
+        )
+
+def render_inventory_export(sort, order, filters):
+    from bookstore_ui.exports import BOOK_COLUMNS
+    render_export(
+        "inventory",
+        lambda: iter_book_pages(sort=sort, order=order, **filters),
+        BOOK_COLUMNS,
+        (sort, order, tuple(sorted(filters.items()))),
+    )
+
+def render_sales_export(filter_params):
+    from bookstore_ui.exports import SALE_ITEM_COLUMNS, sale_item_rows
+    render_export(
+        "sales",
+        lambda: (list(sale_item_rows(sales)) for sales in iter_sales_pages(filter_params)),
+        SALE_ITEM_COLUMNS,
+        tuple(sorted(filter_params.items())),
+    )
+
+#########################################################################
+#                       Sales report sections                           #
+#########################################################################
+
+def render_sales_summary(summary_data):
+    # Display key metrics in columns
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Total Revenue", f"${summary_data['totalRevenue']:,.2f}")
+    with col2:
+        st.metric("Total Orders", f"{summary_data['totalOrders']:,}")
+    with col3:
+        st.metric("Total Items", f"{summary_data['totalItems']:,}")
+    with col4:
+        st.metric("Avg Order Value", f"${summary_data['averageOrderValue']:,.2f}")
+
+    # Sales by Type and Status
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Sales by Type")
+        type_data = summary_data['salesByType']
+        if not type_data.empty:
+            st.bar_chart(type_data['revenue'])
+        else:
+            st.info("No sales type data available for the selected filters.")
+
+    with col2:
+        st.subheader("Sales by Status")
+        status_data = summary_data['salesByStatus']
+        if not status_data.empty:
+            st.bar_chart(status_data)
+        else:
+            st.info("No status data available for the selected filters.")
+
+def render_daily_sales(daily_data):
+    if not daily_data.empty:
+        # Allow user to select metric to view
+        metric = st.selectbox(
+            "Select Metric",
+            ["Total Sales ($)", "Total Items", "Order Count"],
+            key="daily_metric"
+        )
+
+        if metric == "Total Sales ($)":
+            st.line_chart(daily_data['totalSales'])
+        elif metric == "Total Items":
+            st.line_chart(daily_data['totalItems'])
+        else:
+            st.line_chart(daily_data['orderCount'])
+    else:
+        st.info("No daily sales data available for the selected filters.")
+
+def render_top_genres(genres_data):
+    if not genres_data.empty:
+        # Create two columns for revenue and quantity
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.subheader("By Revenue")
+            st.bar_chart(genres_data['revenue'])
+
+        with col2:
+            st.subheader("By Quantity")
+            st.bar_chart(genres_data['totalSales'])
+    else:
+        st.info("No genre data available for the selected filters.")
+
+def render_top_books(books_data):
+    if not books_data.empty:
+        st.dataframe(
+            books_data,
+            column_config={
+                "title": "Title",
+                "author": "Author",
+                "isbn": "ISBN",
+                "totalSold": "Copies Sold",
+                "revenue": st.column_config.NumberColumn("Revenue", format="$%.2f"),
+            },
+            hide_index=True,
+            use_container_width=True,
+        )
+    else:
+        st.info("No book sales available for the selected filters.")
+
+def render_sale(sale):
+    with st.expander(
+        f"Order #{sale.get('_id')} - {sale['orderDate']} - ${sale['totalPrice']:.2f}"
+    ):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.write("**Order Details**")
+            st.write(f"Type: {sale['type'].title()}")
+            st.write(f"Status: {sale['orderStatus'].title()}")
+            st.write(f"Payment Method: {sale['paymentMethod'].title()}")
+            st.write(f"Total Items: {sale['totalItems']}")
+
+        with col2:
+            st.write("**Shipping Details**")
+            if sale.get('shippingAddress'):
+                addr = sale['shippingAddress']
+                st.write(f"Street: {addr.get('street', 'N/A')}")
+                st.write(f"City: {addr.get('city', 'N/A')}")
+                st.write(f"State: {addr.get('state', 'N/A')}")
+                st.write(f"ZIP: {addr.get('zipCode', 'N/A')}")
+
+        st.write("**Ordered Items**")
+        for item in sale['orderItems']:
+            book = item.get('bookDetails') or {}
+            st.markdown(f"""
+            * **{book.get('title', 'Deleted book')}** by {book.get('author', 'N/A')}
+              * Quantity: {item['quantity']}
+              * Price: ${item['price']:.2f}
+              * Genre: {book.get('genre', 'N/A')}
+              * ISBN: {book.get('isbn', 'N/A')}
+            """)
+
+# Sales are listed a page at a time; "Load more" appends the next page
+def render_sales_details(filter_params):
+    state = st.session_state.get("sales_details")
+    if (state is None or state["filters"] != filter_params
+            or time.monotonic() - state["fetched_at"] > SALES_CACHE_TTL):
+        sales, cursor = fetch_sales_page(filter_params)
+        state = st.session_state.sales_details = {
+            "filters": dict(filter_params),
+            "fetched_at": time.monotonic(),
+            "sales": list(sales),  # extended below; the fetched list may be shared
+            "cursor": cursor,
+        }
+
+    if not state["sales"]:
+        st.info("No sales found matching the specified criteria.")
+        return
+
+    # Display sales in an expandable table
+    for sale in state["sales"]:
+        render_sale(sale)
+
+    st.caption(f"Showing the {len(state['sales'])} most recent matching sales.")
+    if state["cursor"] and st.button("Load more sales", key="load_more_sales"):
+        sales, cursor = fetch_sales_page(filter_params, before=state["cursor"])
+        state["sales"].extend(sales)
+        state["cursor"] = cursor
+        st.rerun()
+
+# Build the Sales Records sections. The charts come from the local daily
+# rollups whenever the filters map onto them, otherwise from a single pull of
+# the sales in the date range; the sales list is paged from the API.
+def load_sales_reports(filter_params):
+    from bookstore_ui.sales_rollups import get_sales_rollups
+
+    start_date = filter_params.get("startDate")
+    end_date = filter_params.get("endDate")
+    genres = filter_params.get("genre")
+    genres = genres.split(",") if genres else []
+
+    def pull_sales():
+        with st.spinner("Loading sales..."):
+            analytics = load_sales_analytics(start_date, end_date)
+        return analytics.filter(
+            sale_type=filter_params.get("type"),
+            order_status=filter_params.get("orderStatus"),
+            genres=genres,
+            book_title=filter_params.get("bookTitle"),
+        )
+
+    report = None
+    # Rollups have no title dimension, and orders spanning several selected
+    # genres cannot be de-duplicated from per-genre rows
+    if not filter_params.get("bookTitle") and len(genres) <= 1:
+        rollups = get_sales_rollups()
+        try:
+            sync_sales_rollups(rollups)
+        except requests.exceptions.RequestException as e:
+            if rollups.sync_state()[1] is None:
+                rollups = None
+            else:
+                st.warning(f"Could not refresh sales rollups, showing the last synced figures: {str(e)}")
+        if rollups is not None:
+            report = rollups.report(start_date, end_date, filter_params.get("type"),
+                                    filter_params.get("orderStatus"), genres[0] if genres else None)
+
+    if report is None:
+        try:
+            report = pull_sales()
+        except requests.exceptions.RequestException as e:
+            st.error(f"Error loading sales records: {str(e)}")
+            return
+
+    sections = [
+        ("Sales Overview", lambda: render_sales_summary(report.summary())),
+        ("Sales Trends", lambda: render_daily_sales(report.daily())),
+        ("Top Selling Genres", lambda: render_top_genres(report.top_genres())),
+        ("Top Selling Books", lambda: render_top_books(report.top_books())),
+        ("Sales Details", lambda: render_sales_details(filter_params)),
+    ]
+    for title, render in sections:
+        st.header(title)
+        try:
+            render()
+        except Exception as e:
+            st.error(f"Error loading {title.lower()}: {str(e)}")
+
 #########################################################################
 #                            Modals                                     #
 #########################################################################
@@ -492,7 +1060,7 @@ def create_order():
                 "orderDate": str(order_date),
                 "expectedDeliveryDate": str(expected_delivery_date)
             }
-            response = requests.post(API_MFRORDER_URL, json=new_order, headers=get_auth_headers())
+            response = api_client.post(API_MFRORDER_URL, json=new_order)
                     
             # Handle the response
             if response.status_code == 201:
@@ -535,10 +1103,13 @@ def order_details(order_id):
                 header_cols[1].write("Author")
                 header_cols[2].write("Genre")
                 header_cols[3].write("Order Quantity")
+                books = fetch_books_by_ids(book['bookId'] for book in order['booksOrdered'])
                 for book in order['booksOrdered']:
+                    book_details = books.get(str(book['bookId']))
+                    if not book_details:
+                        st.write("One or more books from the order has been deleted from the system.")
+                        continue
 
-                    book_details = fetch_book_by_id(str(book['bookId']))
-                            
                     cols = st.columns([2, 2, 2, 1])
                     cols[0].write(book_details["title"])
                     cols[1].write(book_details["author"])
@@ -577,18 +1148,18 @@ def order_details(order_id):
             header_cols[1].write("Author")
             header_cols[2].write("Genre")
             header_cols[3].write(" Order Quantity")
-            try:
-                for book in order['booksOrdered']:
-                    book_details = fetch_book_by_id(str(book['bookId']))
-                    cols = st.columns([2, 2, 2, 1])
-                    cols[0].write(book_details['title'])
-                    cols[1].write(book_details['author'])
-                    cols[2].write(book_details['genre'])
-                    cols[3].write(str(book['quantity']))
-            except:
-                st.write("One or more books from the order has been deleted from the system.")
-
-            # in case a book from the order is deleted^^
+            books = fetch_books_by_ids(book['bookId'] for book in order['booksOrdered'])
+            for book in order['booksOrdered']:
+                book_details = books.get(str(book['bookId']))
+                # in case a book from the order is deleted
+                if not book_details:
+                    st.write("One or more books from the order has been deleted from the system.")
+                    continue
+                cols = st.columns([2, 2, 2, 1])
+                cols[0].write(book_details['title'])
+                cols[1].write(book_details['author'])
+                cols[2].write(book_details['genre'])
+                cols[3].write(str(book['quantity']))
 
             # if the status is shipped, give the user the ability to receive it
             if order['status'] == 'shipped':
@@ -0,0 +1,240 @@
+import threading
+import time
+from collections import OrderedDict
+
+import streamlit as st
+
+# Process-wide TTL cache for GET /books results.
+#
+# Entries are keyed by the inventory filter tuple (genre, author, title), the
+# same filters the API matches exactly. Writes made through the staff app patch
+# the entries they affect instead of flushing the whole cache. An entry may also
+# carry a delta-sync cursor, letting an expired unfiltered catalog be brought up
+# to date from GET /books/changes instead of being downloaded again.
+#
+# Paginated results (see make_page_key) are cached the same way, but since a
+# write can shift rows across page boundaries, affected pages are dropped
+# rather than patched.
+#
+# Every change to an entry gives it a new version number, so derived data
+# (such as the fuzzy search index) can be rebuilt only when the books change.
+
+DEFAULT_TTL = 60
+DEFAULT_MAX_ENTRIES = 64
+
+FILTER_FIELDS = ("genre", "author", "title")
+
+
+def make_key(genre=None, author=None, title=None):
+    return (genre or None, author or None, title or None)
+
+
+def make_page_key(genre=None, author=None, title=None, sort="title", order="asc", skip=0, limit=50):
+    return make_key(genre, author, title) + (sort, order, skip, limit)
+
+
+def is_page_key(key):
+    return len(key) > len(FILTER_FIELDS)
+
+
+def matches_filter(key, book):
+    """True if the API would return this book for the given filter key"""
+    return all(value is None or book.get(field) == value
+               for field, value in zip(FILTER_FIELDS, key))
+
+
+def _sort_key(book):
+    return book.get("title", "")
+
+
+def apply_changes(books, changed, deleted):
+    """Merge a delta-sync response into a book list, keeping it sorted by title"""
+    by_id = {book["_id"]: book for book in books}
+    for book_id in deleted:
+        by_id.pop(book_id, None)
+    for book in changed:
+        by_id[book["_id"]] = book
+    return sorted(by_id.values(), key=_sort_key)
+
+
+class CatalogCache:
+    def __init__(self, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, books)
+        self._cursors = {}  # key -> delta-sync cursor the entry is current to
+        self._totals = {}  # page key -> total number of matching books
+        self._versions = {}  # key -> version of the entry's books
+        self._last_version = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.patches = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        """Return a copy of the cached book list, or None on a miss"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                # Expired synced entries are kept so peek() can delta-sync them
+                if entry is not None and key not in self._cursors:
+                    del self._entries[key]
+                    self._versions.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(entry[1])
+
+    def get_page(self, key):
+        """Return (books, total) for a cached page, or None on a miss"""
+        books = self.get(key)
+        if books is None:
+            return None
+        with self._lock:
+            total = self._totals.get(key)
+        return None if total is None else (books, total)
+
+    def put_page(self, key, books, total):
+        with self._lock:
+            self._totals[key] = total
+        self.put(key, books)
+
+    def peek(self, key):
+        """Return (books, cursor) for a synced entry even if it has expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            cursor = self._cursors.get(key)
+            if entry is None or cursor is None:
+                return None, None
+            return list(entry[1]), cursor
+
+    def versioned(self, key):
+        """Return (books, version) for a cached entry, or (None, None).
+
+        The list is the cached one itself (entries are replaced, never
+        mutated), so treat it as read-only.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, None
+            return entry[1], self._versions[key]
+
+    def _bump(self, key):
+        self._last_version += 1
+        self._versions[key] = self._last_version
+
+    def touch(self, key, cursor):
+        """Keep a synced entry's books for another TTL, now current to cursor"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, entry[1])
+            self._entries.move_to_end(key)
+            self._cursors[key] = cursor
+
+    def put(self, key, books, cursor=None):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, list(books))
+            self._bump(key)
+            self._entries.move_to_end(key)
+            if cursor is not None:
+                self._cursors[key] = cursor
+            else:
+                self._cursors.pop(key, None)
+            while len(self._entries) > self.max_entries:
+                evicted_key, _ = self._entries.popitem(last=False)
+                self._forget(evicted_key)
+                self.evictions += 1
+
+    def _forget(self, key):
+        self._cursors.pop(key, None)
+        self._versions.pop(key, None)
+        self._totals.pop(key, None)
+
+    def _invalidate(self, key):
+        del self._entries[key]
+        self._forget(key)
+        self.invalidations += 1
+
+    def add_book(self, book):
+        """Insert a newly created book into every entry whose filter it matches"""
+        with self._lock:
+            for key, (expires_at, books) in list(self._entries.items()):
+                if not matches_filter(key, book):
+                    continue
+                if is_page_key(key):
+                    self._invalidate(key)
+                else:
+                    self._entries[key] = (expires_at, sorted(books + [book], key=_sort_key))
+                    self._bump(key)
+                    self.patches += 1
+
+    def update_book(self, book):
+        """Replace, add or drop an edited book in each entry as its filter dictates; drop every page"""
+        book_id = book["_id"]
+        with self._lock:
+            for key, (expires_at, books) in list(self._entries.items()):
+                # The old version isn't known, so a page of the filter the book
+                # left may have shifted as well
+                if is_page_key(key):
+                    self._invalidate(key)
+                    continue
+                remaining = [b for b in books if b.get("_id") != book_id]
+                if not matches_filter(key, book) and len(remaining) == len(books):
+                    continue
+                if matches_filter(key, book):
+                    remaining = sorted(remaining + [book], key=_sort_key)
+                self._entries[key] = (expires_at, remaining)
+                self._bump(key)
+                self.patches += 1
+
+    def delete_book(self, book_id):
+        with self._lock:
+            for key, (expires_at, books) in list(self._entries.items()):
+                if not is_page_key(key):
+                    remaining = [b for b in books if b.get("_id") != book_id]
+                    if len(remaining) != len(books):
+                        self._entries[key] = (expires_at, remaining)
+                        self._bump(key)
+                        self.patches += 1
+                # Only the id is known here, so any page may have shifted
+                else:
+                    self._invalidate(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._cursors.clear()
+            self._totals.clear()
+            self._versions.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "patches": self.patches,
+                "invalidations": self.invalidations,
+            }
+
+
+@st.cache_resource
+def get_catalog_cache():
+    """Return the process-wide catalog cache, configured from the [cache] secrets"""
+    cache_config = st.secrets.get("cache", {})
+    return CatalogCache(
+        ttl=float(cache_config.get("catalog_ttl", DEFAULT_TTL)),
+        max_entries=int(cache_config.get("catalog_max_entries", DEFAULT_MAX_ENTRIES)),
+    )
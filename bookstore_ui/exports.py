@@ -0,0 +1,146 @@
+import csv
+import os
+import tempfile
+
+# Streamed CSV / Parquet exports.
+#
+# Rows arrive a page at a time and each page is appended to a temporary file
+# before the next one is fetched, so memory holds one page regardless of how
+# many rows are exported. Parquet output needs pyarrow (installed alongside
+# Streamlit); each page becomes one row group.
+
+# (column, type) per export; type is one of "string", "int", "float"
+BOOK_COLUMNS = [
+    ("_id", "string"),
+    ("title", "string"),
+    ("author", "string"),
+    ("genre", "string"),
+    ("isbn", "string"),
+    ("language", "string"),
+    ("publisher", "string"),
+    ("quantity", "int"),
+    ("price", "float"),
+    ("updatedAt", "string"),
+]
+SALE_ITEM_COLUMNS = [
+    ("saleId", "string"),
+    ("orderDate", "string"),
+    ("type", "string"),
+    ("orderStatus", "string"),
+    ("paymentMethod", "string"),
+    ("totalPrice", "float"),
+    ("bookId", "string"),
+    ("title", "string"),
+    ("author", "string"),
+    ("isbn", "string"),
+    ("genre", "string"),
+    ("quantity", "int"),
+    ("price", "float"),
+]
+
+FORMATS = {
+    "CSV": (".csv", "text/csv"),
+    "Parquet": (".parquet", "application/vnd.apache.parquet"),
+}
+
+
+def parquet_available():
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def sale_item_rows(sales):
+    """One export row per order item, with the sale's fields repeated"""
+    for sale in sales:
+        for item in sale.get("orderItems", []):
+            book = item.get("bookDetails") or {}
+            yield {
+                "saleId": sale.get("_id"),
+                "orderDate": sale.get("orderDate"),
+                "type": sale.get("type"),
+                "orderStatus": sale.get("orderStatus"),
+                "paymentMethod": sale.get("paymentMethod"),
+                "totalPrice": sale.get("totalPrice"),
+                "bookId": item.get("bookId"),
+                "title": book.get("title"),
+                "author": book.get("author"),
+                "isbn": book.get("isbn"),
+                "genre": book.get("genre"),
+                "quantity": item.get("quantity"),
+                "price": item.get("price"),
+            }
+
+
+def _coerce(value, kind):
+    if value is None or value == "":
+        return None
+    try:
+        if kind == "int":
+            return int(value)
+        if kind == "float":
+            return float(value)
+    except (TypeError, ValueError):
+        return None
+    return str(value)
+
+
+class _CsvWriter:
+    def __init__(self, path, columns):
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=[name for name, _ in columns],
+                                      extrasaction="ignore")
+        self._writer.writeheader()
+
+    def write(self, rows):
+        self._writer.writerows(rows)
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetWriter:
+    def __init__(self, path, columns):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        types = {"string": pa.string(), "int": pa.int64(), "float": pa.float64()}
+        self._pa = pa
+        self._columns = columns
+        self._schema = pa.schema([(name, types[kind]) for name, kind in columns])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write(self, rows):
+        rows = [{name: _coerce(row.get(name), kind) for name, kind in self._columns} for row in rows]
+        if rows:
+            self._writer.write_table(self._pa.Table.from_pylist(rows, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+
+def write_export(pages, columns, fmt="CSV", on_progress=None):
+    """Write an iterable of row pages to a temporary file; returns (path, row count).
+
+    The caller owns the file and should delete it once it has been served.
+    """
+    suffix, _ = FORMATS[fmt]
+    fd, path = tempfile.mkstemp(prefix="bodhi-export-", suffix=suffix)
+    os.close(fd)
+    writer = _ParquetWriter(path, columns) if fmt == "Parquet" else _CsvWriter(path, columns)
+    rows_written = 0
+    try:
+        for rows in pages:
+            rows = list(rows)
+            writer.write(rows)
+            rows_written += len(rows)
+            if on_progress:
+                on_progress(rows_written)
+    except BaseException:
+        writer.close()
+        os.remove(path)
+        raise
+    writer.close()
+    return path, rows_written
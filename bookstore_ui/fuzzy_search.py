@@ -0,0 +1,92 @@
+import re
+import time
+import unicodedata
+from collections import Counter, defaultdict
+
+# Typo-tolerant title/author lookups for the inventory filters.
+#
+# The API matches the title and author filters exactly, so a misspelled or
+# unaccented name finds nothing. This index is built locally from the cached
+# catalog and suggests the closest existing titles and authors instead.
+#
+# fold, tokenize, trigrams and TrigramIndex mirror client-customer/utils/search.py;
+# keep the two in step. They can't share one module: the storefront is deployed
+# on its own with client-customer/ as its import root (it imports "utils",
+# "services", ...), and a hyphenated directory isn't importable from here.
+
+TOKEN_RE = re.compile(r"[0-9a-z]+")
+
+
+def fold(text):
+    """Lowercase text and strip diacritics (e.g. "Dostoïevski" -> "dostoievski")"""
+    decomposed = unicodedata.normalize("NFKD", str(text or ""))
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(fold(text))
+
+
+FUZZY_FIELDS = ("title", "author")
+MIN_FUZZY_SCORE = 0.3
+MAX_FUZZY_CANDIDATES = 2000
+DEFAULT_FUZZY_BUDGET_MS = 50
+
+
+def trigrams(text):
+    grams = set()
+    for token in tokenize(text):
+        padded = f"  {token} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+class TrigramIndex:
+    def __init__(self, books, fields=FUZZY_FIELDS):
+        self.books = books
+        self._entries = []  # (book position, field, trigrams)
+        postings = defaultdict(list)
+
+        for pos, book in enumerate(books):
+            for field in fields:
+                grams = trigrams(book.get(field))
+                if not grams:
+                    continue
+                entry_id = len(self._entries)
+                self._entries.append((pos, field, grams))
+                for gram in grams:
+                    postings[gram].append(entry_id)
+
+        self._postings = dict(postings)
+
+    def search(self, query, k=10, min_score=MIN_FUZZY_SCORE, budget_ms=DEFAULT_FUZZY_BUDGET_MS):
+        """Top-k (score, book, matched field) for a possibly misspelled query"""
+        deadline = time.perf_counter() + budget_ms / 1000
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+
+        # Rarest trigrams first: they are the most selective
+        known = sorted((g for g in query_grams if g in self._postings),
+                       key=lambda g: len(self._postings[g]))
+        candidates = Counter()
+        for gram in known:
+            for entry_id in self._postings[gram]:
+                candidates[entry_id] += 1
+            if len(candidates) >= MAX_FUZZY_CANDIDATES or time.perf_counter() > deadline:
+                break
+
+        best = {}
+        for entry_id, _ in candidates.most_common(MAX_FUZZY_CANDIDATES):
+            pos, field, grams = self._entries[entry_id]
+            shared = len(query_grams & grams)
+            # Mostly "how much of the query was found", nudged towards
+            # entries of similar length
+            score = 0.7 * shared / len(query_grams) + 0.3 * 2 * shared / (len(query_grams) + len(grams))
+            if score >= min_score and score > best.get(pos, (0.0, ""))[0]:
+                best[pos] = (score, field)
+            if time.perf_counter() > deadline:
+                break
+
+        ranked = sorted(best.items(), key=lambda item: (-item[1][0], item[0]))[:k]
+        return [(round(score, 3), self.books[pos], field) for pos, (score, field) in ranked]
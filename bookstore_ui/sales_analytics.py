@@ -0,0 +1,112 @@
+import pandas as pd
+
+# Local analytics for the Sales Records page.
+#
+# The sales for a date range are pulled from GET /sales once and flattened into
+# a frame with one row per order item. Every report on the page (summary, daily
+# trend, top genres and top books) is a vectorized groupby over that frame, so
+# changing the type, status, genre or title filters, or the chart metric, needs
+# no further requests.
+#
+# Type and status filters select whole orders; genre and title filters select
+# order items, and revenue is the price x quantity of the selected items.
+
+SALE_FIELDS = {
+    "_id": "sale_id",
+    "type": "type",
+    "orderStatus": "orderStatus",
+    "paymentMethod": "paymentMethod",
+    "orderDate": "orderDate",
+    "totalPrice": "totalPrice",
+}
+ITEM_FIELDS = {
+    "item.bookId": "bookId",
+    "item.quantity": "quantity",
+    "item.price": "price",
+    "item.bookDetails.title": "title",
+    "item.bookDetails.author": "author",
+    "item.bookDetails.isbn": "isbn",
+    "item.bookDetails.genre": "genre",
+}
+COLUMNS = list(SALE_FIELDS.values()) + list(ITEM_FIELDS.values())
+CATEGORICAL_COLUMNS = ("type", "orderStatus", "paymentMethod", "genre")
+
+
+def sales_frame(sales):
+    """Flatten GET /sales results into one row per order item"""
+    if not sales:
+        items = pd.DataFrame(columns=COLUMNS)
+    else:
+        items = pd.json_normalize(
+            sales,
+            record_path="orderItems",
+            meta=list(SALE_FIELDS),
+            record_prefix="item.",
+            errors="ignore",
+        )
+        items = items.rename(columns={**SALE_FIELDS, **ITEM_FIELDS}).reindex(columns=COLUMNS)
+
+    items["orderDate"] = pd.to_datetime(items["orderDate"], errors="coerce")
+    items["day"] = items["orderDate"].dt.normalize()
+    items["totalPrice"] = pd.to_numeric(items["totalPrice"], errors="coerce").fillna(0.0)
+    items["quantity"] = pd.to_numeric(items["quantity"], errors="coerce").fillna(0).astype("int64")
+    items["price"] = pd.to_numeric(items["price"], errors="coerce").fillna(0.0)
+    items["revenue"] = items["price"] * items["quantity"]
+    for column in CATEGORICAL_COLUMNS:
+        items[column] = items[column].astype("category")
+    return items
+
+
+class SalesAnalytics:
+    def __init__(self, items):
+        self.items = items
+
+    @classmethod
+    def from_sales(cls, sales):
+        return cls(sales_frame(sales))
+
+    def filter(self, sale_type=None, order_status=None, genres=None, book_title=None):
+        """Return the analytics restricted to the given filters (no request made)"""
+        items = self.items
+        mask = pd.Series(True, index=items.index)
+        if sale_type:
+            mask &= items["type"] == sale_type
+        if order_status:
+            mask &= items["orderStatus"] == order_status
+        if genres:
+            mask &= items["genre"].isin(genres)
+        if book_title:
+            mask &= items["title"].str.contains(book_title, case=False, regex=False, na=False)
+        return SalesAnalytics(items[mask])
+
+    def summary(self):
+        items = self.items
+        total_revenue = float(items["revenue"].sum())
+        total_orders = int(items["sale_id"].nunique())
+        return {
+            "totalRevenue": total_revenue,
+            "totalOrders": total_orders,
+            "totalItems": int(items["quantity"].sum()),
+            "averageOrderValue": total_revenue / total_orders if total_orders else 0.0,
+            "salesByType": items.groupby("type", observed=True).agg(
+                count=("sale_id", "nunique"), revenue=("revenue", "sum")),
+            "salesByStatus": items.groupby("orderStatus", observed=True)["sale_id"].nunique(),
+        }
+
+    def daily(self):
+        """Revenue, items and order count per day, indexed by date"""
+        return self.items.groupby("day").agg(
+            totalSales=("revenue", "sum"),
+            totalItems=("quantity", "sum"),
+            orderCount=("sale_id", "nunique"),
+        )
+
+    def top_genres(self, limit=5):
+        genres = self.items.groupby("genre", observed=True).agg(
+            totalSales=("quantity", "sum"), revenue=("revenue", "sum"))
+        return genres.sort_values("totalSales", ascending=False).head(limit)
+
+    def top_books(self, limit=10):
+        books = self.items.groupby(["title", "author", "isbn"]).agg(
+            totalSold=("quantity", "sum"), revenue=("revenue", "sum"))
+        return books.sort_values("totalSold", ascending=False).head(limit).reset_index()
@@ -0,0 +1,277 @@
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from contextlib import closing
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+# Daily sales rollups kept in a local SQLite file.
+#
+# Sales are aggregated per day x type x status x genre (and per day x book for
+# the top-books table), so a dashboard query reads one row per day and
+# dimension instead of every order item. The rollups are kept current from
+# GET /sales/changes: each changed sale first has its previous contribution
+# subtracted (from the per-sale rows in sale_items) and is then added back, so
+# applying the same change twice is harmless and deletes are exact.
+
+DEFAULT_ROLLUP_PATH = Path(__file__).resolve().parent.parent / ".cache" / "sales_rollups.sqlite3"
+
+ALL_GENRES = "*"  # genre of the rows that total every genre in a sale
+UNKNOWN_GENRE = "Unknown"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sale_items (
+    sale_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    genre TEXT NOT NULL,
+    book TEXT NOT NULL,
+    title TEXT,
+    author TEXT,
+    isbn TEXT,
+    items INTEGER NOT NULL,
+    revenue REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sale_items_by_sale ON sale_items (sale_id);
+CREATE TABLE IF NOT EXISTS daily_sales (
+    day TEXT NOT NULL,
+    type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    genre TEXT NOT NULL,
+    orders INTEGER NOT NULL,
+    items INTEGER NOT NULL,
+    revenue REAL NOT NULL,
+    PRIMARY KEY (day, type, status, genre)
+);
+CREATE TABLE IF NOT EXISTS daily_books (
+    day TEXT NOT NULL,
+    type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    genre TEXT NOT NULL,
+    book TEXT NOT NULL,
+    title TEXT,
+    author TEXT,
+    isbn TEXT,
+    items INTEGER NOT NULL,
+    revenue REAL NOT NULL,
+    PRIMARY KEY (day, type, status, book)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    cursor TEXT,
+    synced_at REAL
+);
+"""
+
+_UPSERT_SALES = """
+INSERT INTO daily_sales (day, type, status, genre, orders, items, revenue)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (day, type, status, genre) DO UPDATE SET
+    orders = orders + excluded.orders,
+    items = items + excluded.items,
+    revenue = revenue + excluded.revenue
+"""
+
+_UPSERT_BOOKS = """
+INSERT INTO daily_books (day, type, status, genre, book, title, author, isbn, items, revenue)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (day, type, status, book) DO UPDATE SET
+    items = items + excluded.items,
+    revenue = revenue + excluded.revenue
+"""
+
+_CHUNK_SIZE = 500  # stay well below SQLite's bound-parameter limit
+
+
+def _item_rows(sale):
+    """One sale_items row per order item of a GET /sales/changes sale"""
+    day = str(sale.get("orderDate") or "")[:10]
+    for item in sale.get("orderItems") or []:
+        book = item.get("bookDetails") or {}
+        quantity = int(item.get("quantity") or 0)
+        yield (
+            sale["_id"],
+            day,
+            sale.get("type") or "",
+            sale.get("orderStatus") or "",
+            book.get("genre") or UNKNOWN_GENRE,
+            str(item.get("bookId") or book.get("isbn") or book.get("title") or ""),
+            book.get("title"),
+            book.get("author"),
+            book.get("isbn"),
+            quantity,
+            float(item.get("price") or 0) * quantity,
+        )
+
+
+def _contributions(rows, sign):
+    """Aggregate sale_items rows into (daily_sales, daily_books) deltas"""
+    sales = defaultdict(lambda: [0, 0, 0.0])
+    books = {}
+    genres_by_sale = defaultdict(set)
+
+    for sale_id, day, sale_type, status, genre, book, title, author, isbn, items, revenue in rows:
+        for key in ((day, sale_type, status, ALL_GENRES), (day, sale_type, status, genre)):
+            totals = sales[key]
+            totals[1] += sign * items
+            totals[2] += sign * revenue
+        genres_by_sale[(sale_id, day, sale_type, status)].add(genre)
+
+        key = (day, sale_type, status, book)
+        entry = books.setdefault(key, [genre, title, author, isbn, 0, 0.0])
+        entry[4] += sign * items
+        entry[5] += sign * revenue
+
+    # Each sale counts once in its all-genres row and once per genre it touches
+    for (_, day, sale_type, status), genres in genres_by_sale.items():
+        sales[(day, sale_type, status, ALL_GENRES)][0] += sign
+        for genre in genres:
+            sales[(day, sale_type, status, genre)][0] += sign
+
+    return (
+        [key + tuple(totals) for key, totals in sales.items()],
+        [key[:3] + (entry[0], key[3]) + tuple(entry[1:]) for key, entry in books.items()],
+    )
+
+
+class SalesRollups:
+    def __init__(self, path=DEFAULT_ROLLUP_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        return sqlite3.connect(self.path, timeout=5)
+
+    def sync_state(self):
+        """Return (cursor, synced_at) of the last applied change set"""
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute("SELECT cursor, synced_at FROM sync_state WHERE id = 1").fetchone()
+        return row if row else (None, None)
+
+    def is_stale(self, max_age):
+        _, synced_at = self.sync_state()
+        return synced_at is None or time.time() - synced_at > max_age
+
+    def apply_changes(self, changes):
+        """Fold a GET /sales/changes response into the rollups in one transaction"""
+        new_rows = [row for sale in changes["sales"] for row in _item_rows(sale)]
+        with self._lock, closing(self._connect()) as conn, conn:
+            if changes["fullSync"]:
+                conn.execute("DELETE FROM sale_items")
+                conn.execute("DELETE FROM daily_sales")
+                conn.execute("DELETE FROM daily_books")
+            else:
+                sale_ids = list(changes["deleted"]) + [sale["_id"] for sale in changes["sales"]]
+                for start in range(0, len(sale_ids), _CHUNK_SIZE):
+                    chunk = sale_ids[start:start + _CHUNK_SIZE]
+                    placeholders = ",".join("?" * len(chunk))
+                    old_rows = conn.execute(
+                        f"SELECT * FROM sale_items WHERE sale_id IN ({placeholders})", chunk
+                    ).fetchall()
+                    self._add(conn, old_rows, sign=-1)
+                    conn.execute(f"DELETE FROM sale_items WHERE sale_id IN ({placeholders})", chunk)
+
+            conn.executemany("INSERT INTO sale_items VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", new_rows)
+            self._add(conn, new_rows, sign=1)
+            conn.execute("DELETE FROM daily_sales WHERE orders <= 0")
+            conn.execute("DELETE FROM daily_books WHERE items <= 0")
+            conn.execute(
+                "INSERT OR REPLACE INTO sync_state (id, cursor, synced_at) VALUES (1, ?, ?)",
+                (changes["cursor"], time.time()),
+            )
+
+    def _add(self, conn, rows, sign):
+        sales, books = _contributions(rows, sign)
+        conn.executemany(_UPSERT_SALES, sales)
+        conn.executemany(_UPSERT_BOOKS, books)
+
+    def report(self, start_date=None, end_date=None, sale_type=None, order_status=None, genre=None):
+        return RollupReport(self, start_date, end_date, sale_type, order_status, genre)
+
+    def query(self, sql, params):
+        with closing(self._connect()) as conn, conn:
+            return pd.read_sql_query(sql, conn, params=params)
+
+
+class RollupReport:
+    """Sales Records reports for one set of filters, read from the rollups.
+
+    Offers the same report methods as SalesAnalytics; each query touches one
+    row per day and dimension in the date range.
+    """
+
+    def __init__(self, rollups, start_date, end_date, sale_type, order_status, genre):
+        self._rollups = rollups
+        clauses, params = [], []
+        for clause, value in (("day >= ?", start_date), ("day <= ?", end_date),
+                              ("type = ?", sale_type), ("status = ?", order_status)):
+            if value:
+                clauses.append(clause)
+                params.append(value)
+        self._where = " AND ".join(clauses) or "1"
+        self._params = params
+        self._genre = genre
+
+    def _sales(self, select, group_by=None, genre=None):
+        sql = (f"SELECT {select} FROM daily_sales WHERE {self._where} AND genre = ?"
+               + (f" GROUP BY {group_by}" if group_by else ""))
+        return self._rollups.query(sql, self._params + [genre or self._genre or ALL_GENRES])
+
+    def summary(self):
+        totals = self._sales("SUM(orders) AS orders, SUM(items) AS items, SUM(revenue) AS revenue").iloc[0]
+        total_orders = int(totals["orders"] or 0)
+        total_revenue = float(totals["revenue"] or 0.0)
+        return {
+            "totalRevenue": total_revenue,
+            "totalOrders": total_orders,
+            "totalItems": int(totals["items"] or 0),
+            "averageOrderValue": total_revenue / total_orders if total_orders else 0.0,
+            "salesByType": self._sales(
+                "type, SUM(orders) AS count, SUM(revenue) AS revenue", group_by="type"
+            ).set_index("type"),
+            "salesByStatus": self._sales(
+                "status AS orderStatus, SUM(orders) AS count", group_by="status"
+            ).set_index("orderStatus")["count"],
+        }
+
+    def daily(self):
+        """Revenue, items and order count per day, indexed by date"""
+        daily = self._sales(
+            "day, SUM(revenue) AS totalSales, SUM(items) AS totalItems, SUM(orders) AS orderCount",
+            group_by="day",
+        )
+        daily["day"] = pd.to_datetime(daily["day"])
+        return daily.set_index("day")
+
+    def top_genres(self, limit=5):
+        genre_clause = "genre = ?" if self._genre else "genre != ?"
+        return self._rollups.query(
+            f"SELECT genre, SUM(items) AS totalSales, SUM(revenue) AS revenue FROM daily_sales "
+            f"WHERE {self._where} AND {genre_clause} "
+            f"GROUP BY genre ORDER BY totalSales DESC LIMIT ?",
+            self._params + [self._genre or ALL_GENRES, limit],
+        ).set_index("genre")
+
+    def top_books(self, limit=10):
+        genre_clause = " AND genre = ?" if self._genre else ""
+        return self._rollups.query(
+            f"SELECT MAX(title) AS title, MAX(author) AS author, MAX(isbn) AS isbn, "
+            f"SUM(items) AS totalSold, SUM(revenue) AS revenue FROM daily_books "
+            f"WHERE {self._where}{genre_clause} "
+            f"GROUP BY book ORDER BY totalSold DESC LIMIT ?",
+            self._params + ([self._genre] if self._genre else []) + [limit],
+        )
+
+
+@st.cache_resource
+def get_sales_rollups():
+    """Return the process-wide rollup store, configured from the [cache] secrets"""
+    cache_config = st.secrets.get("cache", {})
+    return SalesRollups(Path(cache_config.get("rollup_path", DEFAULT_ROLLUP_PATH)))
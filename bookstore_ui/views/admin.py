@@ -0,0 +1,71 @@
+import time
+
+import streamlit as st
+
+from bookstore_ui.bookstore import create_user, delete_user_api, edit_user, fetch_users_api
+
+# The page is only registered for admins; also refuse direct loads
+if st.session_state.role != "admin":
+    st.error("Access Denied. This page is for administrators only.")
+    st.stop()
+
+st.title("⚙️ Admin Dashboard")
+
+# User Management Section
+st.header("👥 User Management")
+
+# Fetch all users
+users = fetch_users_api()
+
+# Create new user button
+if st.button("➕ Create New User"):
+    create_user()
+
+if users:
+    # Display users in a table
+    st.subheader("Current Users")
+    
+    # Table headers
+    cols = st.columns([2, 2, 2, 1, 1, 1])
+    cols[0].write("**Name**")
+    cols[1].write("**Email**")
+    cols[2].write("**Role**")
+    cols[3].write("**Status**")
+    cols[4].write("**Actions**")
+    cols[5].write("")
+    
+    # Display each user
+    for user in users:
+        cols = st.columns([2, 2, 2, 1, 1, 1])
+        cols[0].write(f"{user.get('firstName', '')} {user.get('lastName', '')}")
+        cols[1].write(user.get('email', 'N/A'))
+        
+        # Role with color
+        role = user.get('role', 'N/A').title()
+        role_color = {
+            'Admin': 'red',
+            'Employee': 'blue',
+            'Customer': 'green'
+        }.get(role, 'grey')
+        cols[2].markdown(f"<span style='color: {role_color};'>{role}</span>", unsafe_allow_html=True)
+        
+        # Status with color
+        status = "🟢 Active" if user.get('isActive', True) else "🔴 Inactive"
+        cols[3].write(status)
+        
+        # Edit button
+        if cols[4].button("✏️", key=f"edit_user_{user['_id']}"):
+            edit_user(user)
+        
+        # Delete button (prevent deleting own account)
+        if user.get('email') != st.session_state.user.get('email'):
+            if cols[5].button("🗑️", key=f"delete_user_{user['_id']}"):
+                success, message = delete_user_api(user['_id'])
+                if success:
+                    st.success(message)
+                    time.sleep(1)
+                    st.rerun()
+                else:
+                    st.error(message)
+else:
+    st.info("No users found. Create a new user to get started.")
@@ -0,0 +1,17 @@
+import streamlit as st
+
+from bookstore_ui.Login_UI import logout
+
+st.title("📚 Bodhi Books Management System")
+st.subheader("Preserving Literary Treasures, One Page at a Time")
+st.write("""
+Welcome to the **Bodhi Books Management System** — your gateway to efficiently managing our exclusive collection of rare and antique books.
+
+This app is designed to empower our employees with the tools they need to:
+- **Manage inventory** of rare books
+- **Create purchase orders** for restocking
+- **View sales records** and generate reports
+
+Use the sidebar to navigate through the different sections of the app.
+""")   
+logout()
@@ -0,0 +1,183 @@
+import pandas as pd
+import streamlit as st
+
+from bookstore_ui.bookstore import (add_book, api_client, catalog_cache, delete_book,
+                                    edit_book, fetch_books_page, import_inventory,
+                                    render_inventory_export, suggest_books)
+
+st.title("📦 Inventory Management")
+st.subheader("Manage Your Rare Book Collection")
+st.write("""
+Welcome to the **Inventory Management** section. Here you can:
+- View and search our current inventory of rare books.
+- Add new books to the collection.
+- Update book information, including stock levels and prices.
+- Remove books that are no longer available.
+""")
+
+# Track the selected book for editing
+if "selected_book" not in st.session_state:
+    st.session_state.selected_book = None
+    
+# Add New Book Button and Form
+with st.expander("➕ Add New Book"):
+    with st.form("add_book_form", clear_on_submit=True):
+        new_title = st.text_input("Book Title")
+        new_author = st.text_input("Author")
+        new_genre = st.selectbox("Genre", ["Fiction", "Non-Fiction", "Science", "Biography"])
+        new_quantity = st.number_input("Quantity", min_value=1, value=1)
+        new_price = st.number_input("Price", min_value=0.0, value=1.0)
+        new_language = st.text_input("Language")
+        new_isbn = st.text_input("ISBN")
+        add_submitted = st.form_submit_button("Add Book")
+        if add_submitted:
+            add_book(new_title, new_author, new_genre, new_quantity, new_price, new_language, new_isbn)
+
+# Bulk import from a CSV or JSON file, upserting by ISBN
+with st.expander("📥 Import Books from File"):
+    st.write("Upload a CSV, JSON or JSON Lines file with title, author, genre, isbn and price "
+             "columns, plus optional quantity and language. Books whose ISBN already exists (written "
+             "the same way) are updated, changing only the columns in the file; new books start "
+             "with 0 in stock in English. Use JSON Lines rather than a JSON array for very large files.")
+    import_file = st.file_uploader("Inventory file", type=["csv", "json", "jsonl", "ndjson"], key="import_file")
+    if import_file and st.button("Import Books"):
+        report = import_inventory(import_file)
+        st.success(f"Imported {report.rows - len(report.errors):,} of {report.rows:,} rows: "
+                   f"{report.inserted:,} added, {report.updated:,} updated.")
+        if report.errors:
+            st.warning(f"{len(report.errors):,} rows were rejected.")
+            st.dataframe(report.errors, use_container_width=True, hide_index=True)
+            st.download_button(
+                "Download Error Report",
+                data=report.errors_csv(),
+                file_name="import_errors.csv",
+                mime="text/csv",
+            )
+
+# Filters for the search
+st.subheader("Filter Inventory")
+col1, col2, col3 = st.columns(3)
+
+with col1:
+    filter_by_genre = st.checkbox("Filter by Genre")
+    selected_genre = st.text_input("Genre") if filter_by_genre else None
+
+with col2:
+    filter_by_author = st.checkbox("Filter by Author")
+    selected_author = st.text_input("Author", key="inventory_author_filter") if filter_by_author else None
+
+with col3:
+    filter_by_title = st.checkbox("Filter by Title")
+    selected_title = st.text_input("Title", key="inventory_title_filter") if filter_by_title else None
+
+# Update fetch_books function based on selected filters
+filters = {
+    "genre": selected_genre if filter_by_genre else None,
+    "author": selected_author if filter_by_author else None,
+    "title": selected_title if filter_by_title else None,
+}
+
+active_filters = {k: v for k, v in filters.items() if v is not None}
+st.subheader("Inventory List")
+
+# Table controls; only the selected page is fetched and rendered
+sort_options = {"Title": "title", "Author": "author", "Genre": "genre", "Stock": "quantity", "Price": "price"}
+control_cols = st.columns([2, 2, 1, 1])
+sort_label = control_cols[0].selectbox("Sort by", list(sort_options), key="inventory_sort")
+sort_order = control_cols[1].radio(
+    "Order", ["asc", "desc"], horizontal=True, key="inventory_order",
+    format_func=lambda x: "Ascending" if x == "asc" else "Descending"
+)
+page_size = control_cols[2].selectbox("Rows per page", [25, 50, 100], index=1, key="inventory_page_size")
+
+# Go back to the first page whenever the query changes
+query_signature = (tuple(active_filters.items()), sort_label, sort_order, page_size)
+if st.session_state.get("inventory_query") != query_signature or "inventory_page" not in st.session_state:
+    st.session_state.inventory_query = query_signature
+    st.session_state.inventory_page = 1
+
+# Fetch the current page of books using the API
+books, total = fetch_books_page(
+    page=st.session_state.inventory_page,
+    page_size=page_size,
+    sort=sort_options[sort_label],
+    order=sort_order,
+    **active_filters,
+)
+page_count = max(1, -(-total // page_size))
+if st.session_state.inventory_page > page_count:
+    st.session_state.inventory_page = page_count
+    st.rerun()
+control_cols[3].number_input("Page", min_value=1, max_value=page_count, step=1, key="inventory_page")
+
+# Catalog cache counters for operators
+if st.session_state.role == "admin":
+    with st.expander("Catalog Cache Statistics"):
+        st.json(catalog_cache.stats())
+        st.caption("API GETs (coalesced: answered by an identical request already in flight)")
+        st.json(api_client.stats())
+        if st.button("Clear Catalog Cache"):
+            catalog_cache.clear()
+            st.rerun()
+
+# Title/author filters match exactly; when nothing matched, offer the
+# closest names from the catalog instead
+if not books:
+    for field, value in (("title", selected_title), ("author", selected_author)):
+        if not value:
+            continue
+        suggestions = suggest_books(value, field)
+        if suggestions:
+            st.write(f"No exact {field} match for \"{value}\". Did you mean:")
+            suggestion_cols = st.columns(len(suggestions))
+            for i, (suggestion, score) in enumerate(suggestions):
+                suggestion_cols[i].button(
+                    f"{suggestion} ({score:.0%})",
+                    key=f"suggest_{field}_{i}",
+                    on_click=lambda key, text: st.session_state.update({key: text}),
+                    args=(f"inventory_{field}_filter", suggestion),
+                )
+
+if books:
+    # One dataframe widget for the whole page instead of a row of
+    # widgets per book
+    inventory_df = pd.DataFrame([{
+        "Title": book.get("title", "N/A"),
+        "Author": book.get("author", "N/A"),
+        "Genre": book.get("genre", "N/A"),
+        "Stock": book.get("quantity", 0),
+        "Price": book.get("price", 0),
+    } for book in books])
+    # Highlight stock if it's low
+    styled_df = (inventory_df.style
+                 .map(lambda quantity: "color: red;" if quantity < 20 else "", subset=["Stock"])
+                 .format({"Price": "${:.2f}"}))
+
+    selection = st.dataframe(
+        styled_df,
+        hide_index=True,
+        use_container_width=True,
+        on_select="rerun",
+        selection_mode="single-row",
+        key="inventory_table",
+    )
+    first_row = (st.session_state.inventory_page - 1) * page_size + 1
+    st.caption(f"Showing {first_row}-{first_row + len(books) - 1} of {total} books. Select a row to edit or delete it.")
+
+    # "Edit" and "Delete" actions for the selected book
+    if selection.selection.rows:
+        book = books[selection.selection.rows[0]]
+        action_cols = st.columns([4, 1, 1])
+        action_cols[0].write(f"Selected: **{book.get('title', 'N/A')}**")
+        if action_cols[1].button("Edit", key=f"edit_{book['_id']}"):
+            edit_book(book)
+
+        if action_cols[2].button("Delete", key=f"delete_{book['_id']}"):
+            delete_book(book["_id"])
+            st.success(f"Book '{book['title']}' deleted successfully.")
+            st.session_state.refresh_inventory = True
+            st.rerun()
+
+# Export every book matching the current filters, not just this page
+with st.expander("⬇️ Export Inventory"):
+    render_inventory_export(sort_options[sort_label], sort_order, active_filters)
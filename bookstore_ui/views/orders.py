@@ -0,0 +1,72 @@
+import streamlit as st
+
+from bookstore_ui.bookstore import (cancel_order, create_order, fetch_orders, formatDate,
+                                    order_details)
+
+st.title("🛒 Orders")
+st.subheader("Manage Purchase Orders")
+st.write("""
+    Welcome to the **Orders** section. Here you can:
+    - View and manage existing purchase orders.
+    - Create new orders for books running low on stock.
+    - Ensure a steady supply of rare books for our customers.
+""")
+# Section: Create Purchase Order Form
+if st.button("Create Order"):
+    if 'booksOrdered' in st.session_state:
+        del st.session_state['booksOrdered']
+    create_order()
+
+# Filters for the search
+st.subheader("Filter Orders")
+col1, col2, col3 = st.columns(3)
+
+with col1:
+    filter_by_orderNo = st.checkbox("Filter by Order No.")
+    selected_orderNo = st.text_input("Order Number") if filter_by_orderNo else None
+
+with col2:
+    filter_by_supplier = st.checkbox("Filter by Supplier")
+    selected_supplier = st.text_input("Supplier Name") if filter_by_supplier else None
+
+with col3:
+    filter_by_status = st.checkbox("Filter by Status")
+    selected_status = st.selectbox(label="Status", options=["Pending", "Shipped", "Received", "Canceled"]) if filter_by_status else None
+
+# Update fetch_books function based on selected filters
+filters = {
+    "orderNo": selected_orderNo if filter_by_orderNo else None,
+    "supplierName": selected_supplier if filter_by_supplier else None,
+    "status": selected_status if filter_by_status else None,
+}
+
+# if order details not selected, hide this state
+if "selected_order" not in st.session_state:
+    st.session_state.selected_order = None
+
+# Section: View Existing Purchase Orders
+st.subheader("Existing Purchase Orders")
+
+orders = fetch_orders(**{k: v for k, v in filters.items() if v is not None})
+if orders:
+    header_cols = st.columns([3, 2, 3, 2, 2, 2, 2])
+    header_cols[0].write("Order Number")
+    header_cols[1].write("Status")
+    header_cols[2].write("Supplier Name")
+    header_cols[3].write("Ordered On")
+    header_cols[4].write("Total Cost")
+    header_cols[5].write("")
+    header_cols[6].write("")
+    for order in orders:
+        order_id = order['_id']
+        date = ""
+        cols = st.columns([3, 2, 3, 2, 2, 2, 2])
+        cols[0].write(order.get("orderNumber", "N/A"))
+        cols[1].write(str(order.get("status", "N/A")).capitalize())
+        cols[2].write(order.get("supplierName", "N/A"))
+        cols[3].write(formatDate(order['orderDate']))
+        cols[4].write(f"${order['totalCost']:.2f}")
+        if cols[5].button("Details", key=f'order_{order_id}'):
+            order_details(order_id)
+        if cols[6].button("Cancel", key=f'cancel_{order_id}'):
+            cancel_order(order_id)
@@ -0,0 +1,62 @@
+import streamlit as st
+
+from bookstore_ui.bookstore import load_sales_reports, render_sales_export
+
+st.title("📊 Sales Records")
+
+# Filters Section at the top
+st.header("🔍 Filter Sales Data")
+col1, col2, col3 = st.columns(3)
+with col1:
+    start_date = st.date_input("Start Date", key="sales_start_date")
+    sale_type = st.selectbox(
+        "Sale Type",
+        ["All", "online", "instore"],  # Changed to match backend values
+        format_func=lambda x: x.title() if x != "All" else x,
+        key="sale_type_filter"
+    )
+
+with col2:
+    end_date = st.date_input("End Date", key="sales_end_date")
+    status = st.selectbox(
+        "Order Status",
+        ["All", "pending", "shipped", "received", "canceled"],  # Changed to match backend values
+        format_func=lambda x: x.title() if x != "All" else x,
+        key="status_filter"
+    )
+
+with col3:
+    book_title = st.text_input("Book Title", key="book_title_filter")
+    genres = st.multiselect(
+        "Genres",
+        ["Science", "Science Fiction", "Mystery", "Fiction", "Romance", "Comic", "Non-Fiction"],
+        key="genre_filter"
+    )
+
+# Build filter parameters
+filter_params = {
+    "startDate": start_date.isoformat() if start_date else None,
+    "endDate": end_date.isoformat() if end_date else None,
+    "type": sale_type if sale_type != "All" else None,  # Removed .lower() since values already match
+    "orderStatus": status if status != "All" else None,  # Removed .lower() since values already match
+    "bookTitle": book_title if book_title else None,
+}
+
+# Add genres as a comma-separated list if any are selected
+if genres:
+    filter_params["genre"] = ",".join(genres)
+
+# Remove None values
+filter_params = {k: v for k, v in filter_params.items() if v is not None}
+
+# Debug filter parameters
+with st.expander("Debug Filters"):
+    st.write("Applied Filters:", filter_params)
+
+with st.expander("⬇️ Export Sales"):
+    st.caption("One row per book sold in the matching sales.")
+    render_sales_export(filter_params)
+
+# The sales for the date range are fetched once; changing any other
+# filter is answered from that copy.
+load_sales_reports(filter_params)
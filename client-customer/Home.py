@@ -20,9 +20,11 @@ initialize_session_state()
 # Render authentication menu in sidebar
 render_auth_menu()
 
-# Render shopping cart sidebar (except on checkout and auth pages)
+# Render shopping cart sidebar (except on checkout and auth pages). The cart
+# and the catalog views are fragments, so each reruns on its own.
 if st.session_state.page not in ['checkout', 'login', 'register']:
-    render_shopping_cart()
+    with st.sidebar:
+        render_shopping_cart()
 
 # Render main content based on current page
 if st.session_state.page == 'details' and st.session_state.current_book:
@@ -1,15 +1,38 @@
 import streamlit as st
+from services.api import fetch_book_details
+from services.catalog import get_catalog_snapshot
 from utils.cart import add_to_cart
-from utils.helpers import format_date, navigate_to
+from utils.helpers import cover_image_url, format_date, navigate_to
 
 
+@st.fragment
+def render_add_to_cart(book):
+    """Quantity picker and Add to Cart button, rerun on their own"""
+    if book.get('quantity', 0) > 0:
+        quantity = st.number_input("Quantity", min_value=1, 
+                                 max_value=book.get('quantity'), value=1)
+        if st.button("Add to Cart 🛒", type="primary", use_container_width=True):
+            add_to_cart(book, quantity)
+            # Full rerun so the cart sidebar shows the new item
+            st.rerun()
+        
+        if book.get('quantity') < 10:
+            st.markdown(f'<div class="stock-warning">Only {book.get("quantity")} left in stock!</div>', 
+                      unsafe_allow_html=True)
+    else:
+        st.error("Out of Stock")
+
 def render_book_details():
     """Render the book details page"""
     if not st.session_state.current_book:
         navigate_to('main')
         return
         
+    # Long fields (summary, publisher, ...) come from the full document; price
+    # and stock from the shared snapshot, which is kept current
     book = st.session_state.current_book
+    details = fetch_book_details(book.get('_id')) or {}
+    book = {**book, **details, **(get_catalog_snapshot().get(book.get('_id')) or {})}
     
     # Back button and title in same row
     col1, col2 = st.columns([1, 5])
@@ -23,21 +46,10 @@ def render_book_details():
     col1, col2 = st.columns([1, 2])
     
     with col1:
-        st.image(book.get('coverImageUrl', 'http://dummyimage.com/180x100.png/dddddd/000000'),
+        st.image(cover_image_url(book, "detail"),
                 use_container_width=True)
         
-        if book.get('quantity', 0) > 0:
-            quantity = st.number_input("Quantity", min_value=1, 
-                                     max_value=book.get('quantity'), value=1)
-            if st.button("Add to Cart 🛒", type="primary", use_container_width=True):
-                add_to_cart(book, quantity)
-                st.rerun()
-            
-            if book.get('quantity') < 10:
-                st.markdown(f'<div class="stock-warning">Only {book.get("quantity")} left in stock!</div>', 
-                          unsafe_allow_html=True)
-        else:
-            st.error("Out of Stock")
+        render_add_to_cart(book)
     
     with col2:
         st.subheader(f"By {book.get('author', 'Unknown Author')}")
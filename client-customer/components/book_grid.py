@@ -1,42 +1,66 @@
 import streamlit as st
 
-from services.api import fetch_books
+from services.api import fuzzy_search_books, search_books
+from services.catalog import render_catalog_freshness
 from utils.cart import add_to_cart
-from utils.helpers import navigate_to
+from utils.helpers import cover_image_url, navigate_to
 
+# Cards built per page of the grid
+GRID_PAGE_SIZE = int(st.secrets.get("catalog", {}).get("grid_page_size", 12))
 
+
+@st.fragment
 def render_main_page():
-    """Render the main page with book grid"""
+    """Render the main page with book grid.
+
+    A fragment: searching, filtering and paging rerun only the grid, and only
+    one page of cards is built. Adding to the cart reruns the whole app once
+    so the cart sidebar picks up the item.
+    """
     st.title("Welcome to Bodhi Bookstore 📚")
     
     # Search and Filter Section
     col1, col2 = st.columns([2, 1])
     with col1:
-        search_query = st.text_input("Search books by title or author")
+        search_query = st.text_input("Search books by title, author or ISBN")
     with col2:
         genre_filter = st.selectbox("Filter by genre", 
                                   ["All", "Fiction", "Non-Fiction", "Science", "History"])
     
-    # Display Books
-    books = fetch_books()
-    filtered_books = books
-    
-    if search_query:
-        filtered_books = [book for book in filtered_books 
-                         if search_query.lower() in book.get('title', '').lower() 
-                         or search_query.lower() in book.get('author', '').lower()]
-    
-    if genre_filter != "All":
-        filtered_books = [book for book in filtered_books 
-                         if book.get('genre') == genre_filter]
+    # Display Books, ranked by the catalog's prebuilt search index
+    filtered_books = search_books(search_query,
+                                  genre=genre_filter if genre_filter != "All" else None)
+    render_catalog_freshness()
+
+    # No exact hits: fall back to the closest titles and authors
+    if search_query and not filtered_books:
+        matches = fuzzy_search_books(search_query)
+        if genre_filter != "All":
+            matches = [m for m in matches if m[1].get('genre') == genre_filter]
+        if matches:
+            st.info(f"No exact matches for \"{search_query}\". Showing the closest titles and authors.")
+            filtered_books = [book for _, book, _ in matches]
+        else:
+            st.info(f"No books found for \"{search_query}\".")
     
+    # Only the current page of cards is built; go back to the first page
+    # whenever the search changes
+    query = (search_query, genre_filter)
+    if st.session_state.get('grid_query') != query:
+        st.session_state.grid_query = query
+        st.session_state.grid_page = 1
+    page_count = max(1, -(-len(filtered_books) // GRID_PAGE_SIZE))
+    page = min(st.session_state.grid_page, page_count)
+    start = (page - 1) * GRID_PAGE_SIZE
+    page_books = filtered_books[start:start + GRID_PAGE_SIZE]
+
     # Display books in a grid
     cols = st.columns(3)
-    for idx, book in enumerate(filtered_books):
+    for idx, book in enumerate(page_books):
         with cols[idx % 3]:
             st.write("---")
             with st.container():
-                st.image(book.get('coverImageUrl', 'http://dummyimage.com/180x100.png/dddddd/000000'),
+                st.image(cover_image_url(book, "grid"),
                         use_container_width=True)
                 st.subheader(book.get('title', 'Untitled'))
                 st.write(f"By {book.get('author', 'Unknown Author')}")
@@ -44,12 +68,33 @@ def render_main_page():
                 
                 col1, col2 = st.columns(2)
                 with col1:
-                    if st.button("View Details 📖", key=f"details_{idx}"):
+                    if st.button("View Details 📖", key=f"details_{book['_id']}"):
                         navigate_to('details', book)
                 with col2:
                     if book.get('quantity', 0) > 0:
-                        if st.button("Add to Cart 🛒", key=f"add_{idx}"):
+                        if st.button("Add to Cart 🛒", key=f"add_{book['_id']}"):
                             add_to_cart(book)
-                            st.rerun()
+                            st.rerun()  # full rerun: the cart sidebar changed
                     else:
-                        st.write("Out of Stock") 
\ No newline at end of file
+                        st.write("Out of Stock")
+
+    if page_count > 1:
+        render_pager(page, page_count, start, len(page_books), len(filtered_books))
+
+def _go_to_page(page):
+    st.session_state.grid_page = page
+
+def render_pager(page, page_count, start, shown, total):
+    """Previous/next controls under the grid"""
+    st.write("---")
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        st.button("← Previous", key="grid_prev", disabled=page <= 1,
+                  on_click=_go_to_page, args=(page - 1,), use_container_width=True)
+    with col2:
+        st.markdown(f"<div style='text-align: center'>Page {page} of {page_count} · "
+                    f"books {start + 1}-{start + shown} of {total}</div>",
+                    unsafe_allow_html=True)
+    with col3:
+        st.button("Next →", key="grid_next", disabled=page >= page_count,
+                  on_click=_go_to_page, args=(page + 1,), use_container_width=True) 
\ No newline at end of file
@@ -4,45 +4,55 @@ from utils.cart import remove_from_cart, update_cart_quantity
 from utils.helpers import navigate_to
 
 
+def _on_quantity_change(index, key):
+    update_cart_quantity(index, st.session_state[key])
+
+
+@st.fragment
 def render_shopping_cart():
-    """Render the shopping cart sidebar"""
-    with st.sidebar:
-        st.title("Shopping Cart 🛒")
-        if not st.session_state.cart:
-            st.write("Your cart is empty")
-            st.write("---")
-            st.write("Start shopping by browsing our collection!")
-        else:
-            total_items = sum(item["quantity"] for item in st.session_state.cart)
-            st.write(f"**{total_items} items in cart**")
-            
-            for idx, item in enumerate(st.session_state.cart):
-                st.markdown(f"""
-                <div class="cart-item">
-                    <div>{item['title']}</div>
-                    <div class="price-tag">${item['price']:.2f}</div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                col1, col2, col3 = st.columns([2, 1, 1])
-                with col1:
-                    new_quantity = st.number_input(
-                        "Qty",
-                        min_value=1,
-                        value=item["quantity"],
-                        key=f"qty_{idx}"
-                    )
-                    if new_quantity != item["quantity"]:
-                        update_cart_quantity(idx, new_quantity)
-                        st.rerun()
-                with col2:
-                    if st.button("🗑️", key=f"remove_{idx}"):
-                        remove_from_cart(idx)
-                        st.rerun()
-            
-            st.write("---")
-            st.markdown(f'<h3 class="price-tag">Total: ${st.session_state.total_amount:.2f}</h3>', 
-                       unsafe_allow_html=True)
-            
-            if st.button("Proceed to Checkout →", type="primary", use_container_width=True):
-                navigate_to('checkout') 
\ No newline at end of file
+    """Render the shopping cart; call it inside ``with st.sidebar:``.
+
+    The cart is a fragment: changing a quantity or removing an item reruns
+    only the cart, not the catalog page next to it.
+    """
+    st.title("Shopping Cart 🛒")
+    if not st.session_state.cart:
+        st.write("Your cart is empty")
+        st.write("---")
+        st.write("Start shopping by browsing our collection!")
+    else:
+        total_items = sum(item["quantity"] for item in st.session_state.cart)
+        st.write(f"**{total_items} items in cart**")
+
+        for idx, item in enumerate(st.session_state.cart):
+            st.markdown(f"""
+            <div class="cart-item">
+                <div>{item['title']}</div>
+                <div class="price-tag">${item['price']:.2f}</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+            # Widgets are keyed by book so they follow the item when others
+            # are removed, and re-synced in case the book was added again
+            qty_key = f"qty_{item['bookId']}"
+            st.session_state[qty_key] = item["quantity"]
+
+            col1, col2, col3 = st.columns([2, 1, 1])
+            with col1:
+                st.number_input(
+                    "Qty",
+                    min_value=1,
+                    key=qty_key,
+                    on_change=_on_quantity_change,
+                    args=(idx, qty_key),
+                )
+            with col2:
+                st.button("🗑️", key=f"remove_{item['bookId']}",
+                          on_click=remove_from_cart, args=(idx,))
+
+        st.write("---")
+        st.markdown(f'<h3 class="price-tag">Total: ${st.session_state.total_amount:.2f}</h3>',
+                   unsafe_allow_html=True)
+
+        if st.button("Proceed to Checkout →", type="primary", use_container_width=True):
+            navigate_to('checkout')
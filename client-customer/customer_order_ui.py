@@ -11,6 +11,9 @@ import pandas as pd
 import requests
 import streamlit as st
 
+from services.api import search_books
+from services.catalog import render_catalog_freshness
+
 # Must be the first Streamlit command
 st.set_page_config(layout="wide", page_title="Bodhi Bookstore")
 
@@ -68,21 +71,6 @@ if 'last_action' not in st.session_state:
 # API endpoints
 API_BASE_URL = st.secrets["api"]["base_url"]
 
-def fetch_books():
-    try:
-        response = requests.get(f"{API_BASE_URL}/books")
-        return response.json()
-    except:
-        st.error("Unable to connect to the server. Using sample data.")
-        return [
-            {"_id": "1", "title": "Sample Book", "author": "Sample Author", 
-             "genre": "Fiction", "price": 29.99, "quantity": 10, 
-             "summary": "A sample book description", "isbn": "123-456-789",
-             "publisher": "Sample Publisher", "pages": 300,
-             "language": "English", "publicationDate": "2024-01-01T00:00:00.000Z",
-             "coverImageUrl": "http://dummyimage.com/180x100.png/dddddd/000000"}
-        ]
-
 def show_toast(message, is_error=False):
     """Show a temporary notification"""
     if is_error:
@@ -352,18 +340,9 @@ def render_main_page():
         genre_filter = st.selectbox("Filter by genre", 
                                   ["All", "Fiction", "Non-Fiction", "Science", "History"])
     
-    # Display Books
-    books = fetch_books()
-    filtered_books = books
-    
-    if search_query:
-        filtered_books = [book for book in filtered_books 
-                         if search_query.lower() in book.get('title', '').lower() 
-                         or search_query.lower() in book.get('author', '').lower()]
-    
-    if genre_filter != "All":
-        filtered_books = [book for book in filtered_books 
-                         if book.get('genre') == genre_filter]
+    # Display Books, ranked by the catalog's prebuilt search index
+    filtered_books = search_books(search_query, genre=genre_filter if genre_filter != "All" else None)
+    render_catalog_freshness()
     
     # Display books in a grid
     cols = st.columns(3)
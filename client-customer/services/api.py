@@ -1,9 +1,11 @@
 from datetime import datetime
 from typing import Dict, Optional, Tuple
 
-import requests
 import streamlit as st
 
+from services.catalog import REQUEST_TIMEOUT, get_catalog_snapshot, get_catalog_store
+from services.http_client import session
+
 
 class ApiService:
     def __init__(self):
@@ -32,18 +34,19 @@ class ApiService:
                 "orderDate": datetime.now().isoformat()
             })
 
-            response = requests.post(
+            response = session.post(
                 f"{self.base_url}/sales",
                 headers=self.get_headers(),
                 json=order_data
             )
 
+            response_data = response.json()
             if response.status_code == 201:
-                return True, response.json()
+                return True, response_data
             else:
-                error_msg = response.json().get("error", "Failed to create order")
-                if "details" in response.json():
-                    error_msg += f": {response.json()['details']}"
+                error_msg = response_data.get("error", "Failed to create order")
+                if "details" in response_data:
+                    error_msg += f": {response_data['details']}"
                 st.error(f"Order submission failed: {error_msg}")
                 return False, response
 
@@ -63,30 +66,30 @@ def get_auth_headers():
         headers["Authorization"] = f"Bearer {st.session_state.token}"
     return headers
 
-def fetch_books():
-    """Fetch all books from the API"""
+@st.cache_data(ttl=300, show_spinner=False)
+def _fetch_book(book_id: str) -> Dict:
+    response = session.get(f"{st.secrets['api']['base_url']}/books/{book_id}", timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return response.json()
+
+def fetch_book_details(book_id: str) -> Optional[Dict]:
+    """Return the full book document for the details page, or None if it can't be fetched.
+
+    The shared catalog only holds the fields the grid needs; successful
+    lookups are cached for a few minutes (failures are not cached).
+    """
     try:
-        response = requests.get(
-            f"{st.secrets['api']['base_url']}/books",
-            headers=get_auth_headers()
-        )
-        return response.json()
-    except:
-        st.error("Unable to connect to the server. Using sample data.")
-        return [
-            {
-                "_id": "1", 
-                "title": "Sample Book", 
-                "author": "Sample Author", 
-                "genre": "Fiction", 
-                "price": 29.99, 
-                "quantity": 10, 
-                "summary": "A sample book description", 
-                "isbn": "123-456-789",
-                "publisher": "Sample Publisher", 
-                "pages": 300,
-                "language": "English", 
-                "publicationDate": "2024-01-01T00:00:00.000Z",
-                "coverImageUrl": "http://dummyimage.com/180x100.png/dddddd/000000"
-            }
-        ] 
\ No newline at end of file
+        return _fetch_book(book_id)
+    except Exception:
+        return None
+
+def search_books(query: str = "", genre: Optional[str] = None):
+    """Search the shared catalog snapshot by title, author, ISBN and genre"""
+    snapshot = get_catalog_snapshot()
+    if not snapshot.books and get_catalog_store().last_error:
+        st.error("Unable to connect to the server. Please try again shortly.")
+    return snapshot.index.search(query, genre=genre)
+
+def fuzzy_search_books(query: str, k: int = 12):
+    """Closest titles and authors for a query with typos, as (score, book, field)"""
+    return get_catalog_snapshot().fuzzy_index.search(query, k=k)
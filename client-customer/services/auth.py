@@ -4,6 +4,8 @@ from typing import Dict, Optional
 import requests
 import streamlit as st
 
+from services.http_client import session
+
 
 class AuthService:
     def __init__(self):
@@ -26,7 +28,7 @@ class AuthService:
             # Add debug logging
             # st.write("Debug - Sending registration data:", {**registration_data, 'password': '*****'})
             
-            response = requests.post(
+            response = session.post(
                 f"{self.base_url}/auth/register",
                 json=registration_data,
                 headers={'Content-Type': 'application/json'}
@@ -78,7 +80,7 @@ class AuthService:
     def login(self, email: str, password: str) -> bool:
         """Login user"""
         try:
-            response = requests.post(
+            response = session.post(
                 f"{self.base_url}/auth/login",
                 headers={
                     'Content-Type': 'application/json'
@@ -185,7 +187,7 @@ class AuthService:
             # st.write("Debug - Fetching profile with ID:", customer_id)
             
             # Fetch customer profile using the customers endpoint
-            response = requests.get(
+            response = session.get(
                 f"{self.base_url}/customers/{customer_id}",
                 headers=headers
             )
@@ -235,7 +237,7 @@ class AuthService:
             # st.write("Debug - Update data:", profile_data)
             
             # Use the customers endpoint with the profile ID
-            response = requests.put(
+            response = session.put(
                 f"{self.base_url}/customers/{profile_id}",
                 headers=headers,
                 json=profile_data
@@ -280,7 +282,7 @@ class AuthService:
                 st.error("Customer profile ID not found")
                 return None
                 
-            response = requests.get(
+            response = session.get(
                 f"{self.base_url}/sales",
                 headers=self.get_headers(),
                 params={
@@ -329,7 +331,7 @@ class AuthService:
             # Debug the formatted order
             # st.write("Debug - Formatted Order:", formatted_order)
 
-            response = requests.post(
+            response = session.post(
                 f"{self.base_url}/sales",
                 headers=self.get_headers(),
                 json=formatted_order
@@ -338,12 +340,13 @@ class AuthService:
             # Debug the response
             # st.write("Debug - Order Response:", response.json())
 
+            response_data = response.json()
             if response.status_code == 201:
-                return response.json()
+                return response_data
             else:
-                error_msg = response.json().get("error", "Failed to create order")
-                if "details" in response.json():
-                    error_msg += f": {response.json()['details']}"
+                error_msg = response_data.get("error", "Failed to create order")
+                if "details" in response_data:
+                    error_msg += f": {response_data['details']}"
                 st.error(f"Order submission failed: {error_msg}")
                 return None
 
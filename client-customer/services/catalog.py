@@ -0,0 +1,199 @@
+import threading
+import time
+from datetime import datetime
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import streamlit as st
+
+from services.catalog_disk import (DEFAULT_SNAPSHOT_PATH, load_snapshot,
+                                   save_cursor, save_snapshot)
+from services.http_client import session
+from utils.search import CatalogIndex, TrigramIndex
+
+DEFAULT_REFRESH_INTERVAL = 60  # seconds between background refreshes
+DEFAULT_FIRST_LOAD_TIMEOUT = 30  # seconds a session waits for the very first load
+REQUEST_TIMEOUT = (3.05, 30)
+
+# Fields the grid, search index and cart use; the details page fetches the rest
+# (summary, publisher, ...) per book with fetch_book_details
+CATALOG_FIELDS = "title,author,genre,isbn,price,quantity,coverImageUrl,updatedAt"
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """An immutable view of the whole catalog, shared by every session.
+
+    Treat the book dicts as read-only: the same objects are handed to every
+    shopper in this process.
+    """
+    books: Tuple[Dict, ...] = ()
+    fetched_at: Optional[float] = None
+    version: int = 0
+
+    @cached_property
+    def by_id(self) -> Dict[str, Dict]:
+        return {book["_id"]: book for book in self.books}
+
+    @cached_property
+    def index(self) -> CatalogIndex:
+        """Search index, built once per snapshot (i.e. only when the catalog changes)"""
+        return CatalogIndex(self.books)
+
+    @cached_property
+    def fuzzy_index(self) -> TrigramIndex:
+        """Typo-tolerant title/author index, built on first use per snapshot"""
+        return TrigramIndex(self.books)
+
+    def get(self, book_id: str) -> Optional[Dict]:
+        return self.by_id.get(book_id)
+
+
+def apply_changes(books, changed, deleted) -> Tuple[Dict, ...]:
+    """Merge a delta-sync response into a catalog, keeping it sorted by title"""
+    by_id = {book["_id"]: book for book in books}
+    for book_id in deleted:
+        by_id.pop(book_id, None)
+    for book in changed:
+        by_id[book["_id"]] = book
+    return tuple(sorted(by_id.values(), key=lambda book: book.get("title", "")))
+
+
+class CatalogStore:
+    """Holds the current catalog snapshot and refreshes it in the background.
+
+    Sessions only ever read ``snapshot``; the refresher builds a complete new
+    snapshot and swaps it in with a single assignment, so readers never see a
+    half-updated catalog and backend load depends only on the refresh interval.
+
+    After the first full download, refreshes use GET /books/changes with the
+    server's sync cursor, so each one transfers only the books changed or
+    deleted since the previous refresh.
+
+    Every successful sync is also written to an on-disk snapshot. A new process
+    starts from that file straight away (and keeps delta-syncing from its
+    cursor), and it is what shoppers see while the API is slow or down.
+    """
+
+    def __init__(self, base_url: str, refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+                 snapshot_path: Optional[Path] = DEFAULT_SNAPSHOT_PATH):
+        self.base_url = base_url
+        self.refresh_interval = refresh_interval
+        self.snapshot_path = snapshot_path
+        self.last_error: Optional[str] = None
+        self.last_synced_at: Optional[float] = None
+        self.from_disk = False
+        self._cursor: Optional[str] = None
+        self._snapshot = CatalogSnapshot()
+        self._first_attempt = threading.Event()
+        self._refresh_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+        saved = load_snapshot(snapshot_path) if snapshot_path else None
+        if saved:
+            books, fetched_at, self._cursor = saved
+            self._snapshot = CatalogSnapshot(books=books, fetched_at=fetched_at, version=1)
+            self.last_synced_at = fetched_at
+            self.from_disk = True
+            # Sessions can be served from disk without waiting for the API
+            self._first_attempt.set()
+
+    @property
+    def snapshot(self) -> CatalogSnapshot:
+        return self._snapshot
+
+    def _fetch_changes(self) -> Dict:
+        params = {"since": self._cursor} if self._cursor else {}
+        params["fields"] = CATALOG_FIELDS
+        response = session.get(f"{self.base_url}/books/changes", params=params, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return response.json()
+
+    def refresh(self) -> bool:
+        """Sync the catalog and atomically replace the snapshot if it changed"""
+        with self._refresh_lock:
+            try:
+                changes = self._fetch_changes()
+            except Exception as e:
+                self.last_error = str(e)
+                self._first_attempt.set()
+                return False
+
+            if changes["fullSync"]:
+                books = tuple(changes["books"])
+            elif changes["books"] or changes["deleted"]:
+                books = apply_changes(self._snapshot.books, changes["books"], changes["deleted"])
+            else:
+                books = None  # nothing changed; keep the current snapshot
+
+            now = time.time()
+            if books is not None:
+                self._snapshot = CatalogSnapshot(
+                    books=books,
+                    fetched_at=now,
+                    version=self._snapshot.version + 1,
+                )
+            self._cursor = changes["cursor"]
+            self.last_synced_at = now
+            self.last_error = None
+            self.from_disk = False
+            self._first_attempt.set()
+
+            if self.snapshot_path:
+                if books is not None:
+                    save_snapshot(self.snapshot_path, books, now, self._cursor)
+                else:
+                    save_cursor(self.snapshot_path, now, self._cursor)
+            return True
+
+    def _run(self):
+        while True:
+            self.refresh()
+            time.sleep(self.refresh_interval)
+
+    def start(self):
+        """Start the background refresher (once per process)"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="catalog-refresher", daemon=True)
+            self._thread.start()
+
+    def wait_for_first_load(self, timeout: float = DEFAULT_FIRST_LOAD_TIMEOUT) -> bool:
+        """Block until the first refresh attempt has finished (successful or not)"""
+        return self._first_attempt.wait(timeout)
+
+
+@st.cache_resource
+def get_catalog_store() -> CatalogStore:
+    """Return the process-wide catalog store, starting its refresher"""
+    catalog_config = st.secrets.get("catalog", {})
+    store = CatalogStore(
+        base_url=st.secrets["api"]["base_url"],
+        refresh_interval=float(catalog_config.get("refresh_interval", DEFAULT_REFRESH_INTERVAL)),
+        snapshot_path=Path(catalog_config.get("snapshot_path", DEFAULT_SNAPSHOT_PATH)),
+    )
+    store.start()
+    return store
+
+
+def get_catalog_snapshot() -> CatalogSnapshot:
+    """Return the current shared snapshot, waiting for the first load on cold start"""
+    store = get_catalog_store()
+    store.wait_for_first_load()
+    return store.snapshot
+
+
+def render_catalog_freshness():
+    """Show how current the catalog is, and warn when serving a saved copy"""
+    store = get_catalog_store()
+    if store.last_synced_at is None:
+        return
+    synced = datetime.fromtimestamp(store.last_synced_at).strftime("%b %d, %Y %I:%M %p")
+    if store.last_error:
+        st.warning(f"We can't reach the bookstore server right now. "
+                   f"Showing the catalog as of {synced}; stock and prices may have changed.")
+    elif store.from_disk:
+        st.caption(f"Showing saved catalog from {synced} while we check for updates.")
+    else:
+        st.caption(f"Catalog updated {synced}")
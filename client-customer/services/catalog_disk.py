@@ -0,0 +1,76 @@
+import json
+import logging
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# Last good catalog, persisted to a local SQLite file so a cold start can serve
+# books immediately and the storefront keeps working while the API is down.
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_PATH = Path(__file__).resolve().parent.parent / ".cache" / "catalog.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS catalog_snapshot (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    books TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    cursor TEXT
+)
+"""
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=5)
+    try:
+        conn.execute(_SCHEMA)
+    except sqlite3.Error:
+        conn.close()
+        raise
+    return conn
+
+
+def load_snapshot(path: Path) -> Optional[Tuple[Tuple[Dict, ...], float, Optional[str]]]:
+    """Return (books, fetched_at, sync cursor) from disk, or None if there is none"""
+    if not Path(path).exists():
+        return None
+    try:
+        with closing(_connect(Path(path))) as conn, conn:
+            row = conn.execute(
+                "SELECT books, fetched_at, cursor FROM catalog_snapshot WHERE id = 1"
+            ).fetchone()
+    except sqlite3.Error as e:
+        logger.warning("Could not read catalog snapshot %s: %s", path, e)
+        return None
+    if row is None:
+        return None
+    books, fetched_at, cursor = row
+    return tuple(json.loads(books)), fetched_at, cursor
+
+
+def save_snapshot(path: Path, books, fetched_at: float, cursor: Optional[str]):
+    """Replace the on-disk snapshot in a single transaction"""
+    try:
+        with closing(_connect(Path(path))) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO catalog_snapshot (id, books, fetched_at, cursor) "
+                "VALUES (1, ?, ?, ?)",
+                (json.dumps(list(books)), fetched_at, cursor),
+            )
+    except sqlite3.Error as e:
+        logger.warning("Could not write catalog snapshot %s: %s", path, e)
+
+
+def save_cursor(path: Path, fetched_at: float, cursor: Optional[str]):
+    """Advance the sync cursor when a refresh found no changes"""
+    try:
+        with closing(_connect(Path(path))) as conn, conn:
+            conn.execute(
+                "UPDATE catalog_snapshot SET fetched_at = ?, cursor = ? WHERE id = 1",
+                (fetched_at, cursor),
+            )
+    except sqlite3.Error as e:
+        logger.warning("Could not write catalog snapshot %s: %s", path, e)
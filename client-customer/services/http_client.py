@@ -0,0 +1,57 @@
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from urllib3.util import make_headers
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Shared HTTP session for every call the storefront makes to the API.
+#
+# Connections are pooled and kept alive, responses are compressed on the wire
+# (gzip, plus br/zstd when brotli or zstandard is installed), and
+# response.json() decodes the body once, with orjson when it is installed.
+# Repeated calls return the same parsed object.
+#
+# _memoize_json and _decode mirror bookstore_ui/api_client.py; keep the two in
+# step. This app is deployed on its own with client-customer/ as its import
+# root, so it can't import the staff app's package.
+
+
+def _memoize_json(response, **kwargs):
+    """Response hook: make response.json() decode the body once, with orjson if available"""
+    parse = response.json
+    parsed = []
+
+    def json(**kwargs):
+        if kwargs:
+            return parse(**kwargs)
+        if not parsed:
+            parsed.append(_decode(response, parse))
+        return parsed[0]
+
+    response.json = json
+    return response
+
+
+def _decode(response, parse):
+    if orjson is not None:
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            pass  # not UTF-8 JSON; let requests raise its usual error
+    return parse()
+
+
+def _create_session() -> requests.Session:
+    session = requests.Session()
+    # Shared by every shopper in this process: never carry cookies between them
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    session.headers["Accept-Encoding"] = make_headers(accept_encoding=True)["accept-encoding"]
+    session.hooks["response"].append(_memoize_json)
+    return session
+
+
+session = _create_session()
@@ -1,8 +1,26 @@
 from datetime import datetime
+from urllib.parse import quote
 
 import streamlit as st
 
 
+PLACEHOLDER_COVER = 'http://dummyimage.com/180x100.png/dddddd/000000'
+
+
+def cover_image_url(book, size="grid"):
+    """URL of the book's cover, resized ("grid" or "detail") and cached by the API server.
+
+    The book's updatedAt is part of the URL, so browsers can keep the image
+    until the book changes. Set ``server_covers = false`` under [catalog] to
+    link the original images instead.
+    """
+    if not book.get('coverImageUrl'):
+        return PLACEHOLDER_COVER
+    if not st.secrets.get("catalog", {}).get("server_covers", True) or not book.get('_id'):
+        return book['coverImageUrl']
+    version = quote(str(book.get('updatedAt', '')), safe='')
+    return f"{st.secrets['api']['base_url']}/covers/{book['_id']}?size={size}&v={version}"
+
 def format_date(date_str):
     """Format a date string to a readable format"""
     try:
@@ -0,0 +1,182 @@
+import re
+import time
+import unicodedata
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Inverted index over the catalog for storefront search.
+#
+# Title, author, ISBN and genre are split into folded tokens once per
+# catalog version. A query term matches any token it is a prefix of, found by
+# binary search over the sorted vocabulary, so lookups cost O(log V + matches)
+# rather than a scan of every book.
+
+TOKEN_RE = re.compile(r"[0-9a-z]+")
+
+FIELD_WEIGHTS = {
+    "title": 3.0,
+    "author": 2.0,
+    "isbn": 1.5,
+    "genre": 1.0,
+}
+EXACT_MATCH_BONUS = 2.0
+
+
+def fold(text) -> str:
+    """Lowercase text and strip diacritics (e.g. "Dostoïevski" -> "dostoievski")"""
+    decomposed = unicodedata.normalize("NFKD", str(text or ""))
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).lower()
+
+
+def tokenize(text) -> List[str]:
+    """Split text into folded alphanumeric tokens"""
+    return TOKEN_RE.findall(fold(text))
+
+
+def _isbn_tokens(isbn) -> List[str]:
+    # Index the ISBN both in pieces and with separators removed, so
+    # "978-0-14" and "978014" both find it
+    tokens = tokenize(isbn)
+    compact = "".join(tokens)
+    if compact and compact not in tokens:
+        tokens.append(compact)
+    return tokens
+
+
+class CatalogIndex:
+    def __init__(self, books: Sequence[Dict]):
+        self.books = books
+        postings = defaultdict(dict)  # token -> {book position: weight}
+        self._by_genre = defaultdict(set)
+
+        for pos, book in enumerate(books):
+            for field, weight in FIELD_WEIGHTS.items():
+                tokens = _isbn_tokens(book.get(field)) if field == "isbn" else tokenize(book.get(field))
+                for token in tokens:
+                    entry = postings[token]
+                    entry[pos] = max(entry.get(pos, 0.0), weight)
+            self._by_genre[book.get("genre")].add(pos)
+
+        self._postings = dict(postings)
+        self._vocabulary = sorted(self._postings)
+
+    def _expand(self, term: str) -> List[str]:
+        """Vocabulary tokens starting with term, exact match first"""
+        # Tokens are [0-9a-z]; "{" sorts after "z", so term + "{" bounds every
+        # token with this prefix
+        start = bisect_left(self._vocabulary, term)
+        end = bisect_left(self._vocabulary, term + "{", start)
+        return self._vocabulary[start:end]
+
+    def _score_term(self, term: str) -> Dict[int, float]:
+        scores = {}
+        for token in self._expand(term):
+            bonus = EXACT_MATCH_BONUS if token == term else 1.0
+            for pos, weight in self._postings[token].items():
+                scores[pos] = max(scores.get(pos, 0.0), weight * bonus)
+        return scores
+
+    def search(self, query: str = "", genre: Optional[str] = None,
+               limit: Optional[int] = None) -> List[Dict]:
+        """Books matching every query term, best matches first"""
+        allowed = self._by_genre.get(genre, set()) if genre else None
+        terms = list(dict.fromkeys(tokenize(query)))
+
+        if not terms:
+            positions = sorted(allowed) if allowed is not None else range(len(self.books))
+            results = [self.books[pos] for pos in positions]
+            return results[:limit] if limit else results
+
+        totals = None
+        for term in terms:
+            term_scores = self._score_term(term)
+            if totals is None:
+                totals = term_scores
+            else:
+                totals = {pos: score + term_scores[pos]
+                          for pos, score in totals.items() if pos in term_scores}
+            if not totals:
+                return []
+
+        if allowed is not None:
+            totals = {pos: score for pos, score in totals.items() if pos in allowed}
+
+        # Highest score first, catalog (title) order breaks ties
+        ranked = sorted(totals, key=lambda pos: (-totals[pos], pos))
+        if limit:
+            ranked = ranked[:limit]
+        return [self.books[pos] for pos in ranked]
+
+
+# Trigram index for typo-tolerant lookups.
+#
+# Titles and authors are broken into padded character trigrams. Candidates are
+# gathered from the query's rarest trigrams first and then scored exactly, so
+# common trigrams never force a scan of the whole catalog; a time budget caps
+# the work for very large catalogs.
+
+FUZZY_FIELDS = ("title", "author")
+MIN_FUZZY_SCORE = 0.3
+MAX_FUZZY_CANDIDATES = 2000
+DEFAULT_FUZZY_BUDGET_MS = 50
+
+
+def trigrams(text) -> frozenset:
+    grams = set()
+    for token in tokenize(text):
+        padded = f"  {token} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+class TrigramIndex:
+    def __init__(self, books: Sequence[Dict], fields: Sequence[str] = FUZZY_FIELDS):
+        self.books = books
+        self._entries: List[Tuple[int, str, frozenset]] = []  # (book position, field, trigrams)
+        postings = defaultdict(list)
+
+        for pos, book in enumerate(books):
+            for field in fields:
+                grams = trigrams(book.get(field))
+                if not grams:
+                    continue
+                entry_id = len(self._entries)
+                self._entries.append((pos, field, grams))
+                for gram in grams:
+                    postings[gram].append(entry_id)
+
+        self._postings = dict(postings)
+
+    def search(self, query: str, k: int = 10, min_score: float = MIN_FUZZY_SCORE,
+               budget_ms: float = DEFAULT_FUZZY_BUDGET_MS) -> List[Tuple[float, Dict, str]]:
+        """Top-k (score, book, matched field) for a possibly misspelled query"""
+        deadline = time.perf_counter() + budget_ms / 1000
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+
+        # Rarest trigrams first: they are the most selective
+        known = sorted((g for g in query_grams if g in self._postings),
+                       key=lambda g: len(self._postings[g]))
+        candidates = Counter()
+        for gram in known:
+            for entry_id in self._postings[gram]:
+                candidates[entry_id] += 1
+            if len(candidates) >= MAX_FUZZY_CANDIDATES or time.perf_counter() > deadline:
+                break
+
+        best: Dict[int, Tuple[float, str]] = {}
+        for entry_id, _ in candidates.most_common(MAX_FUZZY_CANDIDATES):
+            pos, field, grams = self._entries[entry_id]
+            shared = len(query_grams & grams)
+            # Mostly "how much of the query was found", nudged towards
+            # entries of similar length
+            score = 0.7 * shared / len(query_grams) + 0.3 * 2 * shared / (len(query_grams) + len(grams))
+            if score >= min_score and score > best.get(pos, (0.0, ""))[0]:
+                best[pos] = (score, field)
+            if time.perf_counter() > deadline:
+                break
+
+        ranked = sorted(best.items(), key=lambda item: (-item[1][0], item[0]))[:k]
+        return [(round(score, 3), self.books[pos], field) for pos, (score, field) in ranked]
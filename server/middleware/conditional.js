@@ -0,0 +1,82 @@
+const crypto = require('crypto');
+const Book = require('../models/book');
+const BookTombstone = require('../models/bookTombstone');
+const Customer = require('../models/customer');
+const MfrOrder = require('../models/mfrorders');
+const Sale = require('../models/sale');
+const SaleTombstone = require('../models/saleTombstone');
+const User = require('../models/user');
+
+/**
+ * Cheap version string of a collection that changes whenever a document is
+ * inserted, updated or deleted: document count, newest updatedAt (and how many
+ * documents share it) and the newest tombstone. Every part is an index lookup.
+ * @param {mongoose.Model} Model - Collection with timestamps and an updatedAt index
+ * @param {mongoose.Model} [Tombstone] - Its tombstone collection, if any
+ * @returns {Promise<string>}
+ */
+async function collectionVersion(Model, Tombstone) {
+  const [count, latest, tombstone] = await Promise.all([
+    Model.estimatedDocumentCount(),
+    Model.findOne().sort({ updatedAt: -1 }).select('updatedAt').lean(),
+    Tombstone ? Tombstone.findOne().sort({ deletedAt: -1 }).select('deletedAt').lean() : null,
+  ]);
+  const latestAt = latest && latest.updatedAt;
+  const atLatest = latestAt ? await Model.countDocuments({ updatedAt: latestAt }) : 0;
+  return [
+    count,
+    latestAt ? latestAt.getTime() : 0,
+    atLatest,
+    tombstone ? tombstone.deletedAt.getTime() : 0,
+  ].join(':');
+}
+
+const booksVersion = () => collectionVersion(Book, BookTombstone);
+
+// Sales responses embed book details, so they change with either collection
+const salesVersion = async () => {
+  const [sales, books] = await Promise.all([collectionVersion(Sale, SaleTombstone), booksVersion()]);
+  return `${sales}|${books}`;
+};
+
+// GET /api/sales also embeds customer and employee details outside the list view
+const salesListVersion = async (req) => {
+  const versions = [salesVersion()];
+  if (req.query.view !== 'list') {
+    versions.push(collectionVersion(Customer), collectionVersion(User));
+  }
+  return (await Promise.all(versions)).join('|');
+};
+
+const ordersVersion = () => collectionVersion(MfrOrder);
+
+/**
+ * Middleware answering conditional GETs before the route runs its query.
+ *
+ * The strong ETag is a hash of the request URL and the version of the data the
+ * route reads, so it is sent with the full response and a matching
+ * If-None-Match gets a 304 without the query being run. The version is taken
+ * before the route queries, so a change made meanwhile always yields a new ETag.
+ * @param {Function} version - async (req) => version string of the data read
+ */
+function conditionalGet(version) {
+  return async (req, res, next) => {
+    let current;
+    try {
+      current = await version(req);
+    } catch (error) {
+      // Fall back to an unconditional response
+      console.error('Error computing ETag:', error);
+      return next();
+    }
+
+    const hash = crypto.createHash('sha1').update(`${req.originalUrl}|${current}`).digest('base64url');
+    res.set({ ETag: `"${hash}"`, 'Cache-Control': 'private, no-cache' });
+    if (req.fresh) {
+      return res.status(304).end();
+    }
+    next();
+  };
+}
+
+module.exports = { booksVersion, collectionVersion, conditionalGet, ordersVersion, salesListVersion, salesVersion };
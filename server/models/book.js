@@ -74,5 +74,7 @@ const bookSchema = new mongoose.Schema({
 
 // Add index for common queries
 bookSchema.index({ title: 1, author: 1 });
+// Delta sync looks books up by modification time
+bookSchema.index({ updatedAt: 1 });
 
 module.exports = mongoose.model('Book', bookSchema);
\ No newline at end of file
@@ -0,0 +1,29 @@
+const mongoose = require('mongoose');
+
+// How long deletions are remembered for delta sync. Clients whose cursor is
+// older than this are told to do a full resync instead.
+const TOMBSTONE_RETENTION_DAYS = 30;
+
+// Tombstone Schema - records deleted books so clients can drop them
+const bookTombstoneSchema = new mongoose.Schema({
+  bookId: {
+    type: mongoose.Types.ObjectId,
+    required: true
+  },
+  deletedAt: {
+    type: Date,
+    default: Date.now,
+    required: true
+  }
+});
+
+// Expire tombstones once they fall out of the retention window
+bookTombstoneSchema.index(
+  { deletedAt: 1 },
+  { expireAfterSeconds: TOMBSTONE_RETENTION_DAYS * 24 * 60 * 60 }
+);
+
+const BookTombstone = mongoose.model('BookTombstone', bookTombstoneSchema);
+BookTombstone.RETENTION_DAYS = TOMBSTONE_RETENTION_DAYS;
+
+module.exports = BookTombstone;
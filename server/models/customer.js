@@ -55,6 +55,8 @@ customerSchema.virtual('fullName').get(function() {
 // Add index for common queries
 customerSchema.index({ phone: 1 });
 customerSchema.index({ userId: 1 });  // Index for faster lookups and cascading
+// Sales ETags look customers up by modification time
+customerSchema.index({ updatedAt: 1 });
 
 const Customer = mongoose.model('Customer', customerSchema);
 
@@ -53,10 +53,17 @@ const mfrOrderSchema = new mongoose.Schema({
     type: Date,
     default: Date.now
   },
+  // Idempotency-Key of the receive request that added this order to stock
+  receiveKey: {
+    type: String
+  },
 },
 {
   timestamps: true
 }
 );
 
+// Lets the order list be revalidated with a cheap "latest change" lookup
+mfrOrderSchema.index({ updatedAt: 1 });
+
 module.exports = mongoose.model('MfrOrder', mfrOrderSchema);
\ No newline at end of file
@@ -141,6 +141,11 @@ saleSchema.virtual('formattedAddress').get(function() {
     return `${street}, ${city}, ${state} ${zipCode}`;
 });
 
+// Rollup sync looks sales up by modification time
+saleSchema.index({ updatedAt: 1 });
+// Sales lists are paged newest first by (orderDate, _id)
+saleSchema.index({ orderDate: -1, _id: -1 });
+
 // Pre-save middleware to calculate and validate total price
 saleSchema.pre('save', async function(next) {
     try {
@@ -0,0 +1,29 @@
+const mongoose = require('mongoose');
+
+// How long deletions are remembered for delta sync. Clients whose cursor is
+// older than this are told to do a full resync instead.
+const TOMBSTONE_RETENTION_DAYS = 30;
+
+// Tombstone Schema - records deleted sales so clients can drop them from their rollups
+const saleTombstoneSchema = new mongoose.Schema({
+  saleId: {
+    type: mongoose.Types.ObjectId,
+    required: true
+  },
+  deletedAt: {
+    type: Date,
+    default: Date.now,
+    required: true
+  }
+});
+
+// Expire tombstones once they fall out of the retention window
+saleTombstoneSchema.index(
+  { deletedAt: 1 },
+  { expireAfterSeconds: TOMBSTONE_RETENTION_DAYS * 24 * 60 * 60 }
+);
+
+const SaleTombstone = mongoose.model('SaleTombstone', saleTombstoneSchema);
+SaleTombstone.RETENTION_DAYS = TOMBSTONE_RETENTION_DAYS;
+
+module.exports = SaleTombstone;
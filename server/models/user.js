@@ -53,6 +53,8 @@ const userSchema = new mongoose.Schema({
 // Add index for faster lookups
 userSchema.index({ customerId: 1 });
 userSchema.index({ employeeId: 1 });
+// Sales ETags look users up by modification time
+userSchema.index({ updatedAt: 1 });
 
 // Virtual for full name
 userSchema.virtual('fullName').get(function() {
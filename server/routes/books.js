@@ -2,6 +2,10 @@ const express = require('express');
 const router = express.Router();
 const mongoose = require('mongoose');
 const Book = require('../models/book');
+const BookTombstone = require('../models/bookTombstone');
+const { conditionalGet, booksVersion } = require('../middleware/conditional');
+const { changesCursor } = require('../utils/changes');
+const { parseFields, projectableFields } = require('../utils/fields');
 
 /**
  * @swagger
@@ -93,21 +97,85 @@ const Book = require('../models/book');
  *         schema:
  *           type: string
  *         description: Filter by genre
+ *       - in: query
+ *         name: ids
+ *         schema:
+ *           type: string
+ *         description: Comma-separated list of book IDs to fetch in one request
+ *       - in: query
+ *         name: sort
+ *         schema:
+ *           type: string
+ *           enum: [title, author, genre, quantity, price, updatedAt]
+ *         description: Field to sort by (default title)
+ *       - in: query
+ *         name: order
+ *         schema:
+ *           type: string
+ *           enum: [asc, desc]
+ *         description: Sort direction (default asc)
+ *       - in: query
+ *         name: limit
+ *         schema:
+ *           type: integer
+ *         description: Page size. When set, the total match count is returned in the X-Total-Count header.
+ *       - in: query
+ *         name: skip
+ *         schema:
+ *           type: integer
+ *         description: Number of books to skip (page offset)
+ *       - in: query
+ *         name: fields
+ *         schema:
+ *           type: string
+ *         description: Comma-separated fields to return (e.g. `title,author,price`); `_id` is always included
  *     responses:
  *       200:
  *         description: List of books
+ *         headers:
+ *           X-Total-Count:
+ *             schema:
+ *               type: integer
+ *             description: Total number of matching books (paginated requests only)
+ *           ETag:
+ *             schema:
+ *               type: string
+ *             description: Strong validator; send it back in If-None-Match to revalidate
  *         content:
  *           application/json:
  *             schema:
  *               type: array
  *               items:
  *                 $ref: '#/components/schemas/Book'
+ *       304:
+ *         description: Not modified since the ETag sent in If-None-Match (no body)
+ *       400:
+ *         description: Malformed `ids` list or unknown name in `fields`
  */
-router.get('/', async (req, res) => {
+const SORTABLE_FIELDS = ['title', 'author', 'genre', 'quantity', 'price', 'updatedAt'];
+const MAX_PAGE_SIZE = 500;
+// Fields a list request may project with ?fields=
+const BOOK_FIELDS = projectableFields(Book);
+
+router.get('/', conditionalGet(booksVersion), async (req, res) => {
   try {
-    const { title, author, genre } = req.query;
+    const { title, author, genre, ids } = req.query;
     let query = {};
 
+    const projection = parseFields(req.query.fields, BOOK_FIELDS);
+    if (projection.unknown.length) {
+      return res.status(400).json({ error: `Unknown fields: ${projection.unknown.join(', ')}` });
+    }
+
+    // Bulk lookup mode: ?ids=id1,id2,...
+    if (ids) {
+      const idList = [...new Set(ids.split(',').map(id => id.trim()).filter(id => id))];
+      if (!idList.every(id => mongoose.Types.ObjectId.isValid(id))) {
+        return res.status(400).json({ error: 'Invalid book ID format' });
+      }
+      query._id = { $in: idList.map(id => new mongoose.Types.ObjectId(id)) };
+    }
+
     if (title) query.title = title;
     if (author) query.author = author;
     if (genre) query.genre = genre;
@@ -115,9 +183,27 @@ router.get('/', async (req, res) => {
     console.log('Collection name:', Book.collection.name);
     console.log('Database name:', mongoose.connection.db.databaseName);
 
-    const books = await Book.find(query)
-      .select('-__v')
-      .sort({ title: 1 });
+    // Sorting; _id breaks ties so pages are stable
+    const sortField = SORTABLE_FIELDS.includes(req.query.sort) ? req.query.sort : 'title';
+    const sortOrder = req.query.order === 'desc' ? -1 : 1;
+    let findQuery = Book.find(query)
+      .select(projection.select || '-__v')
+      .sort({ [sortField]: sortOrder, _id: sortOrder });
+
+    // Pagination
+    if (req.query.limit !== undefined) {
+      const limit = Math.min(Math.max(parseInt(req.query.limit) || 0, 1), MAX_PAGE_SIZE);
+      const skip = Math.max(parseInt(req.query.skip) || 0, 0);
+      const [books, total] = await Promise.all([
+        findQuery.skip(skip).limit(limit),
+        Book.countDocuments(query)
+      ]);
+      console.log('Found books:', books.length, 'of', total);
+      res.set('X-Total-Count', String(total));
+      return res.json(books);
+    }
+
+    const books = await findQuery;
     console.log('Found books:', books.length);
     res.json(books);
   } catch (error) {
@@ -126,6 +212,102 @@ router.get('/', async (req, res) => {
   }
 });
 
+/**
+ * @swagger
+ * /api/books/changes:
+ *   get:
+ *     summary: Returns books changed or deleted since a sync cursor
+ *     description: >
+ *       Delta sync for clients that keep a local copy of the catalog. Pass the
+ *       cursor returned by the previous call as `since`; the response lists the
+ *       books created or updated since then and the IDs of books deleted since
+ *       then. Without `since`, or when `since` is older than the tombstone
+ *       retention window, the full catalog is returned with `fullSync: true`.
+ *       The cursor trails the server clock by a few seconds so that writes
+ *       still committing are not missed; changes near it may be returned
+ *       twice and must be applied idempotently.
+ *     tags:
+ *       - Book Inventory
+ *     parameters:
+ *       - in: query
+ *         name: since
+ *         schema:
+ *           type: string
+ *           format: date-time
+ *         description: Cursor returned by the previous sync
+ *       - in: query
+ *         name: fields
+ *         schema:
+ *           type: string
+ *         description: Comma-separated book fields to return; `_id` is always included
+ *     responses:
+ *       200:
+ *         description: Catalog changes
+ *         content:
+ *           application/json:
+ *             schema:
+ *               type: object
+ *               properties:
+ *                 fullSync:
+ *                   type: boolean
+ *                 books:
+ *                   type: array
+ *                   items:
+ *                     $ref: '#/components/schemas/Book'
+ *                 deleted:
+ *                   type: array
+ *                   items:
+ *                     type: string
+ *                 cursor:
+ *                   type: string
+ *                   format: date-time
+ *       400:
+ *         description: Invalid since cursor
+ */
+router.get('/changes', async (req, res) => {
+  try {
+    // Take the cursor before querying, less an overlap for writes still in
+    // flight, so they are picked up again next time rather than missed
+    const now = new Date();
+    const cursor = changesCursor(now);
+    const retentionStart = new Date(now.getTime() - BookTombstone.RETENTION_DAYS * 24 * 60 * 60 * 1000);
+
+    const projection = parseFields(req.query.fields, BOOK_FIELDS);
+    if (projection.unknown.length) {
+      return res.status(400).json({ error: `Unknown fields: ${projection.unknown.join(', ')}` });
+    }
+    const select = projection.select || '-__v';
+
+    let since = null;
+    if (req.query.since) {
+      since = new Date(req.query.since);
+      if (isNaN(since.getTime())) {
+        return res.status(400).json({ error: 'Invalid since cursor' });
+      }
+    }
+
+    if (!since || since < retentionStart) {
+      const books = await Book.find({}).select(select).sort({ title: 1 });
+      return res.json({ fullSync: true, books, deleted: [], cursor: cursor.toISOString() });
+    }
+
+    const [books, tombstones] = await Promise.all([
+      Book.find({ updatedAt: { $gte: since } }).select(select).sort({ title: 1 }),
+      BookTombstone.find({ deletedAt: { $gte: since } }).select('bookId')
+    ]);
+
+    res.json({
+      fullSync: false,
+      books,
+      deleted: tombstones.map(tombstone => tombstone.bookId.toString()),
+      cursor: cursor.toISOString()
+    });
+  } catch (error) {
+    console.error('Error in /api/books/changes:', error);
+    res.status(500).json({ error: 'Error fetching book changes' });
+  }
+});
+
 /**
  * @swagger
  * /api/books/{id}:
@@ -166,6 +348,82 @@ router.get('/:id', async (req, res) => {
   }
 });
 
+// Fields a bulk import may set on a book
+const IMPORT_FIELDS = ['title', 'author', 'genre', 'isbn', 'quantity', 'price', 'language',
+  'summary', 'publisher', 'publicationDate', 'pageCount', 'coverImageUrl'];
+const MAX_BULK_BOOKS = 1000;
+// Set only when an import creates a book, so updates keep existing values
+const IMPORT_INSERT_DEFAULTS = { quantity: 0, language: 'English' };
+
+// Upsert an array of books by ISBN in one unordered bulk write
+async function importBooks(req, res) {
+  const rows = req.body;
+  if (rows.length > MAX_BULK_BOOKS) {
+    return res.status(400).json({ error: `At most ${MAX_BULK_BOOKS} books can be imported per request` });
+  }
+
+  try {
+    const errors = [];
+    const operations = [];
+    const rowIndexes = []; // bulk operation index -> request row index
+
+    rows.forEach((row, index) => {
+      const fields = {};
+      for (const field of IMPORT_FIELDS) {
+        if (row && row[field] !== undefined && row[field] !== null && row[field] !== '') {
+          fields[field] = row[field];
+        }
+      }
+      const insertDefaults = {};
+      for (const [field, value] of Object.entries(IMPORT_INSERT_DEFAULTS)) {
+        if (fields[field] === undefined) insertDefaults[field] = value;
+      }
+      const validationError = new Book({ ...insertDefaults, ...fields }).validateSync();
+      if (validationError) {
+        errors.push({
+          index,
+          isbn: fields.isbn || null,
+          error: Object.values(validationError.errors).map(e => e.message).join('; ')
+        });
+        return;
+      }
+      operations.push({
+        updateOne: {
+          // Matched as stored: the schema only trims ISBNs, so clients send them as written
+          filter: { isbn: String(fields.isbn).trim() },
+          update: { $set: fields, $setOnInsert: insertDefaults },
+          upsert: true
+        }
+      });
+      rowIndexes.push(index);
+    });
+
+    let result = { insertedCount: 0, upsertedCount: 0, modifiedCount: 0 };
+    if (operations.length) {
+      try {
+        result = await Book.bulkWrite(operations, { ordered: false });
+      } catch (error) {
+        if (!error.writeErrors) throw error;
+        // Unordered: the other operations were still applied
+        result = error.result;
+        for (const writeError of error.writeErrors) {
+          const index = rowIndexes[writeError.index];
+          errors.push({ index, isbn: rows[index].isbn || null, error: writeError.errmsg });
+        }
+      }
+    }
+
+    res.json({
+      inserted: result.upsertedCount || 0,
+      updated: result.modifiedCount || 0,
+      errors: errors.sort((a, b) => a.index - b.index)
+    });
+  } catch (error) {
+    console.error('Error importing books:', error);
+    res.status(500).json({ error: 'Error importing books', details: error.message });
+  }
+}
+
 /**
  * @swagger
  * /api/books:
@@ -202,13 +460,24 @@ router.get('/:id', async (req, res) => {
  *                 type: number
  *               language:
  *                 type: string
+ *       description: >
+ *         A single book to create, or an array of up to 1000 books to import.
+ *         Imported books are upserted by ISBN: new ISBNs are created (quantity
+ *         defaults to 0, language to English) and existing ones have only the
+ *         given fields overwritten. Invalid rows are
+ *         reported by array index and do not stop the rest of the batch.
  *     responses:
+ *       200:
+ *         description: Bulk import result with inserted and updated counts and per-row errors
  *       201:
  *         description: Book created successfully
  *       400:
  *         description: Invalid input or ISBN already exists
  */
 router.post('/', async (req, res) => {
+  if (Array.isArray(req.body)) {
+    return importBooks(req, res);
+  }
   try {
     const { title, author, genre, isbn, quantity, price, language } = req.body;
     const id = new mongoose.Types.ObjectId;
@@ -323,6 +592,8 @@ router.delete('/:id', async (req, res) => {
     if (!book) {
       return res.status(404).json({ error: 'Book not found' });
     }
+    // Leave a tombstone so delta-syncing clients drop the book too
+    await BookTombstone.create({ bookId: book._id });
     res.json({ message: 'Book deleted successfully' });
   } catch (error) {
     res.status(500).json({ error: 'Error deleting book' });
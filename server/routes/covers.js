@@ -0,0 +1,101 @@
+const express = require('express');
+const router = express.Router();
+const Book = require('../models/book');
+const { COVER_SIZES, getCover, getPlaceholder } = require('../utils/coverCache');
+
+// Versioned URLs (?v=<book updatedAt>) change whenever the book does, so
+// browsers may keep them for a year; unversioned ones are kept for a day.
+const IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60;
+const DEFAULT_MAX_AGE = 24 * 60 * 60;
+
+/**
+ * @swagger
+ * /api/covers/{id}:
+ *   get:
+ *     summary: Get a book's cover image, resized and cached by the server
+ *     tags: [Books]
+ *     parameters:
+ *       - in: path
+ *         name: id
+ *         required: true
+ *         schema:
+ *           type: string
+ *         description: Book ID
+ *       - in: query
+ *         name: size
+ *         schema:
+ *           type: string
+ *           enum: [grid, detail]
+ *           default: grid
+ *         description: Grid thumbnail (300x450) or detail page image (600x900)
+ *       - in: query
+ *         name: v
+ *         schema:
+ *           type: string
+ *         description: Cache buster (the book's updatedAt); makes the response cacheable for a year
+ *     responses:
+ *       200:
+ *         description: WebP cover image
+ *         content:
+ *           image/webp: {}
+ *       304:
+ *         description: Not modified (If-None-Match matched)
+ *       400:
+ *         description: Invalid book ID or size
+ *       404:
+ *         description: >
+ *           Book not found or has no cover image; or its cover could not be
+ *           fetched (non-public host, origin error, not an image), in which
+ *           case a grey placeholder WebP is sent as the body
+ */
+router.get('/:id', async (req, res) => {
+  const size = req.query.size || 'grid';
+  if (!COVER_SIZES[size]) {
+    return res.status(400).json({ error: `size must be one of ${Object.keys(COVER_SIZES).join(', ')}` });
+  }
+
+  let book;
+  try {
+    book = await Book.findById(req.params.id).select('coverImageUrl').lean();
+  } catch (error) {
+    if (error.name === 'CastError') {
+      return res.status(400).json({ error: 'Invalid book ID format' });
+    }
+    return res.status(500).json({ error: 'Error fetching book' });
+  }
+  if (!book) {
+    return res.status(404).json({ error: 'Book not found' });
+  }
+  if (!book.coverImageUrl) {
+    return res.status(404).json({ error: 'Book has no cover image' });
+  }
+
+  let cover;
+  try {
+    cover = await getCover(book.coverImageUrl, size);
+  } catch (error) {
+    // Origin down, not public or not an image. Never redirect to the stored
+    // URL (it is user data); browsers still draw the placeholder on a 404.
+    console.error('Error preparing cover:', book.coverImageUrl, error.message);
+    res.set('Cache-Control', 'no-store');
+    try {
+      const placeholder = await getPlaceholder(size);
+      return res.status(404).type('image/webp').send(placeholder);
+    } catch (placeholderError) {
+      return res.status(404).json({ error: 'Cover image not available' });
+    }
+  }
+
+  const maxAge = req.query.v ? IMMUTABLE_MAX_AGE : DEFAULT_MAX_AGE;
+  res.set({
+    'Content-Type': 'image/webp',
+    'Cache-Control': `public, max-age=${maxAge}${req.query.v ? ', immutable' : ''}`,
+    ETag: cover.etag,
+  });
+  if (req.fresh) {
+    return res.status(304).end();
+  }
+  res.send(cover.body);
+});
+
+module.exports = router;
@@ -2,6 +2,12 @@ const express = require('express');
 const router = express.Router();
 const mongoose = require('mongoose');
 const MfrOrder = require('../models/mfrorders')
+const Book = require('../models/book');
+const { conditionalGet, ordersVersion } = require('../middleware/conditional');
+const { parseFields, projectableFields } = require('../utils/fields');
+
+// Fields a list request may project with ?fields=
+const ORDER_FIELDS = projectableFields(MfrOrder);
 
 /**
  * @swagger
@@ -85,6 +91,11 @@ const MfrOrder = require('../models/mfrorders')
  *         schema:
  *           type: string
  *         description: Order Status
+ *       - in: query
+ *         name: fields
+ *         schema:
+ *           type: string
+ *         description: Comma-separated order fields to return (e.g. `orderNumber,status,totalCost`); `_id` is always included
  *     responses:
  *       200:
  *         description: List of vendor orders
@@ -94,8 +105,10 @@ const MfrOrder = require('../models/mfrorders')
  *               type: array
  *               items:
  *                 $ref: '#/components/schemas/MfrOrder'
+ *       400:
+ *         description: Unknown field
  */
-router.get('/', async (req, res) => {
+router.get('/', conditionalGet(ordersVersion), async (req, res) => {
   try {
     const { orderNumber, supplierName, status } = req.query;
     let query = {};
@@ -104,11 +117,16 @@ router.get('/', async (req, res) => {
     if (supplierName) query.supplierName = supplierName;
     if (status) query.status = status;
 
+    const projection = parseFields(req.query.fields, ORDER_FIELDS);
+    if (projection.unknown.length) {
+      return res.status(400).json({ error: `Unknown fields: ${projection.unknown.join(', ')}` });
+    }
+
     console.log('Collection name:', MfrOrder.collection.name);
     console.log('Database name:', mongoose.connection.db.databaseName);
 
     const mfrOrders = await MfrOrder.find(query)
-      .select('-__v');
+      .select(projection.select || '-__v');
     console.log('Found orders:', mfrOrders.length);
     res.json(mfrOrders);
   } catch (error) {
@@ -244,6 +262,106 @@ router.put('/:id', async (req, res) => {
   }
 });
 
+/**
+ * @swagger
+ * /api/manufacturerOrders/{id}/receive:
+ *   post:
+ *     summary: Receive an order and add every line to stock
+ *     description: >
+ *       Marks the order received and increments the quantity of each ordered
+ *       book, all in one transaction. Send a unique Idempotency-Key per receive
+ *       attempt and reuse it on retries; a retry with the key that already
+ *       received the order returns it again without adding stock twice.
+ *     tags: 
+ *       - Manufacturer Orders
+ *     parameters:
+ *       - in: path
+ *         name: id
+ *         required: true
+ *         schema:
+ *           type: string
+ *         description: Order ID
+ *       - in: header
+ *         name: Idempotency-Key
+ *         required: true
+ *         schema:
+ *           type: string
+ *     responses:
+ *       200:
+ *         description: Order received; returns the order and the updated books
+ *       400:
+ *         description: Missing Idempotency-Key or invalid order ID
+ *       404:
+ *         description: Order not found
+ *       409:
+ *         description: Order was already received or is canceled
+ */
+router.post('/:id/receive', async (req, res) => {
+  const receiveKey = req.get('Idempotency-Key');
+  if (!receiveKey) {
+    return res.status(400).json({ error: 'Idempotency-Key header is required' });
+  }
+  if (!mongoose.Types.ObjectId.isValid(req.params.id)) {
+    return res.status(400).json({ error: 'Invalid order ID format' });
+  }
+
+  // Any other order fields sent along are saved with the status change
+  const fields = { ...req.body };
+  delete fields.status;
+  delete fields.booksOrdered;
+  delete fields.receiveKey;
+
+  const session = await mongoose.startSession();
+  try {
+    let order = null;
+    let conflict = null;
+    await session.withTransaction(async () => {
+      conflict = null;
+      order = await MfrOrder.findById(req.params.id).session(session);
+      if (!order) return;
+      if (order.status === 'received') {
+        // A retry of the request that received it is answered, not re-applied
+        if (order.receiveKey !== receiveKey) conflict = 'Order has already been received';
+        return;
+      }
+      if (order.status === 'canceled') {
+        conflict = 'Canceled orders cannot be received';
+        return;
+      }
+
+      Object.assign(order, fields, { status: 'received', receiveKey, updatedAt: Date.now() });
+      await order.save({ session });
+
+      if (order.booksOrdered.length) {
+        await Book.bulkWrite(
+          order.booksOrdered.map(line => ({
+            updateOne: {
+              filter: { _id: line.bookId },
+              update: { $inc: { quantity: line.quantity } }
+            }
+          })),
+          { session, ordered: false }
+        );
+      }
+    });
+
+    if (!order) {
+      return res.status(404).json({ error: 'Order not found' });
+    }
+    if (conflict) {
+      return res.status(409).json({ error: conflict });
+    }
+
+    const books = await Book.find({ _id: { $in: order.booksOrdered.map(line => line.bookId) } }).select('-__v');
+    res.json({ order, books });
+  } catch (error) {
+    console.error('Error receiving order:', error);
+    res.status(500).json({ error: 'Error receiving order', details: error.message });
+  } finally {
+    session.endSession();
+  }
+});
+
 /**
  * @swagger
  * /api/manufacturerOrders/cancel/{id}:
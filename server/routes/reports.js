@@ -2,6 +2,7 @@ const express = require('express');
 const router = express.Router();
 const Sale = require('../models/sale');
 const Book = require('../models/book');
+const { conditionalGet, salesVersion } = require('../middleware/conditional');
 
 // Helper function to build MongoDB query from request parameters
 function buildSalesQuery(req) {
@@ -76,7 +77,7 @@ function buildSalesQuery(req) {
  *           format: date
  *         description: End date for the report (YYYY-MM-DD)
  */
-router.get('/sales/daily', async (req, res) => {
+router.get('/sales/daily', conditionalGet(salesVersion), async (req, res) => {
     try {
         const query = buildSalesQuery(req);
 
@@ -145,7 +146,7 @@ router.get('/sales/daily', async (req, res) => {
  *           default: 5
  *         description: Number of top genres to return
  */
-router.get('/sales/top-genres', async (req, res) => {
+router.get('/sales/top-genres', conditionalGet(salesVersion), async (req, res) => {
     try {
         const query = buildSalesQuery(req);
         const limit = parseInt(req.query.limit) || 5;
@@ -206,7 +207,7 @@ router.get('/sales/top-genres', async (req, res) => {
  *           default: 10
  *         description: Number of top books to return
  */
-router.get('/sales/top-books', async (req, res) => {
+router.get('/sales/top-books', conditionalGet(salesVersion), async (req, res) => {
     try {
         const limit = parseInt(req.query.limit) || 10;
 
@@ -266,7 +267,7 @@ router.get('/sales/top-books', async (req, res) => {
  *           format: date
  *         description: End date for the summary (YYYY-MM-DD)
  */
-router.get('/sales/summary', async (req, res) => {
+router.get('/sales/summary', conditionalGet(salesVersion), async (req, res) => {
     try {
         const query = buildSalesQuery(req);
 
@@ -4,6 +4,15 @@ const mongoose = require('mongoose');
 const moment = require('moment');
 const Sale = require('../models/sale');
 const Book = require('../models/book');
+const SaleTombstone = require('../models/saleTombstone');
+const { conditionalGet, salesListVersion } = require('../middleware/conditional');
+const { changesCursor } = require('../utils/changes');
+const { parseFields, projectableFields } = require('../utils/fields');
+
+// Largest page GET /api/sales returns when paginating
+const MAX_SALES_PAGE_SIZE = 200;
+// Fields a list request may project with ?fields=
+const SALE_FIELDS = projectableFields(Sale);
 
 /**
  * Parse date string in various formats
@@ -25,6 +34,21 @@ function parseDate(dateStr) {
   return null;
 }
 
+/**
+ * Format the date fields present on a sale for list responses
+ * @param {Object} sale - Sale document
+ * @param {Object} saleObj - Plain object being returned
+ * @returns {Object} saleObj
+ */
+function formatSaleDates(sale, saleObj) {
+  for (const field of ['orderDate', 'createdAt', 'updatedAt']) {
+    if (field in saleObj) {
+      saleObj[field] = sale[field] ? moment(sale[field]).format('YYYY-MM-DD HH:mm:ss') : null;
+    }
+  }
+  return saleObj;
+}
+
 /**
  * @swagger
  * /api/sales:
@@ -67,6 +91,28 @@ function parseDate(dateStr) {
  *           type: string
  *           enum: [instore, online]
  *         description: Filter by sale type
+ *       - in: query
+ *         name: limit
+ *         schema:
+ *           type: integer
+ *           maximum: 200
+ *         description: Return at most this many sales (newest first). When more remain, the X-Next-Cursor header holds the cursor for the next page.
+ *       - in: query
+ *         name: before
+ *         schema:
+ *           type: string
+ *         description: X-Next-Cursor value from the previous page
+ *       - in: query
+ *         name: view
+ *         schema:
+ *           type: string
+ *           enum: [full, list]
+ *         description: "`list` returns only the book title, author, ISBN and genre and skips customer and employee details"
+ *       - in: query
+ *         name: fields
+ *         schema:
+ *           type: string
+ *         description: Comma-separated sale fields to return (e.g. `orderDate,totalPrice,orderItems`); `_id` is always included
  *     responses:
  *       200:
  *         description: A list of filtered sales
@@ -76,10 +122,14 @@ function parseDate(dateStr) {
  *               type: array
  *               items:
  *                 $ref: '#/components/schemas/Sale'
+ *       304:
+ *         description: Not modified since the ETag sent in If-None-Match (no body)
+ *       400:
+ *         description: Invalid before cursor or unknown field
  *       500:
  *         description: Error fetching sales
  */
-router.get('/', async (req, res) => {
+router.get('/', conditionalGet(salesListVersion), async (req, res) => {
   // Enhanced request logging
   console.log('Sales GET request received:');
   console.log('Query parameters:', JSON.stringify(req.query, null, 2));
@@ -93,7 +143,10 @@ router.get('/', async (req, res) => {
       genre,
       orderStatus,
       type,
-      customerId
+      customerId,
+      limit,
+      before,
+      view
     } = req.query;
 
     // Build the query object
@@ -131,47 +184,100 @@ router.get('/', async (req, res) => {
     if (type) query.type = type;
     if (customerId) query.customerId = customerId;
 
-    // Book title and genre filters
-    if (bookTitle) {
-      query['$or'] = [
-        { 'orderItems.bookDetails.title': new RegExp(bookTitle, 'i') }
-      ];
+    // Book title and genre filters. Sales only store book IDs, so resolve the
+    // matching books first; both filters must match the same book.
+    if (bookTitle || genre) {
+      const bookQuery = {};
+      if (bookTitle) {
+        bookQuery.title = new RegExp(bookTitle.replace(/[-\/\\^$*+?.()|[\]{}]/g, '\\$&'), 'i');
+      }
+      if (genre) {
+        bookQuery.genre = { $in: genre.split(',').map(g => g.trim()) };
+      }
+      const bookIds = await Book.find(bookQuery).distinct('_id');
+      query['orderItems.bookId'] = { $in: bookIds };
+    }
+
+    // Keyset pagination, newest first: the cursor is the orderDate and _id of
+    // the last sale on the previous page
+    const pageSize = limit ? Math.min(Math.max(parseInt(limit, 10) || 0, 1), MAX_SALES_PAGE_SIZE) : null;
+    if (before) {
+      const [beforeDate, beforeId] = before.split('_');
+      const cursorDate = new Date(beforeDate);
+      if (isNaN(cursorDate.getTime()) || !mongoose.Types.ObjectId.isValid(beforeId)) {
+        return res.status(400).json({ error: 'Invalid before cursor' });
+      }
+      const cursorId = new mongoose.Types.ObjectId(beforeId);
+      query.$and = [{
+        $or: [
+          { orderDate: { $lt: cursorDate } },
+          { orderDate: cursorDate, _id: { $lt: cursorId } }
+        ]
+      }];
     }
 
-    if (genre) {
-      if (!query['$or']) query['$or'] = [];
-      query['$or'].push({ 'orderItems.bookDetails.genre': new RegExp(genre, 'i') });
+    // Projection; paging needs orderDate for the next cursor
+    const projection = parseFields(req.query.fields, SALE_FIELDS, pageSize ? ['orderDate'] : []);
+    if (projection.unknown.length) {
+      return res.status(400).json({ error: `Unknown fields: ${projection.unknown.join(', ')}` });
     }
+    const selected = field => !projection.fields || projection.fields.has(field);
 
     console.log('Final MongoDB query:', JSON.stringify(query, null, 2));
 
     // Execute the query with all filters
-    const sales = await Sale.find(query)
-      .populate({
+    const listView = view === 'list';
+    let salesQuery = Sale.find(query);
+    if (selected('orderItems')) {
+      salesQuery = salesQuery.populate({
         path: 'orderItems.bookId',
         model: 'Book',
-        select: 'title author isbn price coverImageUrl summary publisher publicationDate language genre quantity'
-      })
-      .populate({
+        select: listView
+          ? 'title author isbn genre'
+          : 'title author isbn price coverImageUrl summary publisher publicationDate language genre quantity'
+      });
+    }
+    if (!listView && selected('customerId')) {
+      salesQuery = salesQuery.populate({
         path: 'customerId',
         model: 'Customer',
         select: 'firstName lastName email phone address'
-      })
-      .populate({
+      });
+    }
+    if (!listView && selected('employeeId')) {
+      salesQuery = salesQuery.populate({
         path: 'employeeId',
         model: 'User',
         select: 'firstName lastName email role'
-      })
-      .select('-__v')
-      .sort({ orderDate: -1 });
+      });
+    }
+    salesQuery = salesQuery.select(projection.select || '-__v').sort({ orderDate: -1, _id: -1 });
+    // Fetch one extra sale to learn whether another page follows
+    if (pageSize) salesQuery = salesQuery.limit(pageSize + 1);
+
+    let sales = await salesQuery;
+    if (pageSize && sales.length > pageSize) {
+      sales = sales.slice(0, pageSize);
+      const last = sales[sales.length - 1];
+      res.set('X-Next-Cursor', `${last.orderDate.toISOString()}_${last._id}`);
+    }
 
     // Transform the response
     const transformedSales = sales.map(sale => {
       const saleObj = sale.toObject();
       
       // Update bookDetails from the populated bookId
+      if (!saleObj.orderItems) return formatSaleDates(sale, saleObj);
       saleObj.orderItems = saleObj.orderItems.map(item => {
-        if (item.bookId) {
+        if (item.bookId && listView) {
+          item.bookDetails = {
+            title: item.bookId.title,
+            author: item.bookId.author,
+            isbn: item.bookId.isbn,
+            genre: item.bookId.genre
+          };
+          item.bookId = item.bookId._id;
+        } else if (item.bookId) {
           item.bookDetails = {
             title: item.bookId.title,
             author: item.bookId.author,
@@ -191,12 +297,7 @@ router.get('/', async (req, res) => {
       // Calculate total items
       saleObj.totalItems = sale.orderItems.reduce((sum, item) => sum + item.quantity, 0);
       
-      // Format dates
-      saleObj.orderDate = moment(sale.orderDate).format('YYYY-MM-DD HH:mm:ss');
-      saleObj.createdAt = sale.createdAt ? moment(sale.createdAt).format('YYYY-MM-DD HH:mm:ss') : null;
-      saleObj.updatedAt = sale.updatedAt ? moment(sale.updatedAt).format('YYYY-MM-DD HH:mm:ss') : null;
-      
-      return saleObj;
+      return formatSaleDates(sale, saleObj);
     });
 
     console.log('Found sales:', transformedSales.length);
@@ -207,6 +308,116 @@ router.get('/', async (req, res) => {
   }
 });
 
+/**
+ * Reduce a sale to the fields reporting rollups need
+ * @param {Object} sale - Lean sale with orderItems.bookId populated
+ * @returns {Object} Sale with flattened book details
+ */
+function toRollupSale(sale) {
+  return {
+    _id: sale._id,
+    type: sale.type,
+    orderStatus: sale.orderStatus,
+    orderDate: moment(sale.orderDate).format('YYYY-MM-DD HH:mm:ss'),
+    totalPrice: sale.totalPrice,
+    orderItems: sale.orderItems.map(item => {
+      const book = item.bookId && item.bookId._id ? item.bookId : null;
+      return {
+        bookId: book ? book._id : item.bookId,
+        quantity: item.quantity,
+        price: item.price,
+        bookDetails: book
+          ? { title: book.title, author: book.author, isbn: book.isbn, genre: book.genre }
+          : item.bookDetails
+      };
+    })
+  };
+}
+
+/**
+ * @swagger
+ * /api/sales/changes:
+ *   get:
+ *     summary: Returns sales created, updated or deleted since a sync cursor
+ *     description: >
+ *       Delta sync for clients that keep local reporting rollups. Pass the
+ *       cursor returned by the previous call as `since`; the response lists the
+ *       sales created or updated since then (reduced to the fields reports use)
+ *       and the IDs of sales deleted since then. Without `since`, or when
+ *       `since` is older than the tombstone retention window, every sale is
+ *       returned with `fullSync: true`. The cursor trails the server clock by
+ *       a few seconds so that writes still committing are not missed; changes
+ *       near it may be returned twice and must be applied idempotently.
+ *     tags:
+ *       - Sales
+ *     parameters:
+ *       - in: query
+ *         name: since
+ *         schema:
+ *           type: string
+ *           format: date-time
+ *         description: Cursor returned by the previous sync
+ *     responses:
+ *       200:
+ *         description: Sales changes
+ *         content:
+ *           application/json:
+ *             schema:
+ *               type: object
+ *               properties:
+ *                 fullSync:
+ *                   type: boolean
+ *                 sales:
+ *                   type: array
+ *                   items:
+ *                     type: object
+ *                 deleted:
+ *                   type: array
+ *                   items:
+ *                     type: string
+ *                 cursor:
+ *                   type: string
+ *                   format: date-time
+ *       400:
+ *         description: Invalid since cursor
+ */
+router.get('/changes', async (req, res) => {
+  try {
+    // Take the cursor before querying, less an overlap for writes still in
+    // flight, so they are picked up again next time rather than missed
+    const now = new Date();
+    const cursor = changesCursor(now);
+    const retentionStart = new Date(now.getTime() - SaleTombstone.RETENTION_DAYS * 24 * 60 * 60 * 1000);
+
+    let since = null;
+    if (req.query.since) {
+      since = new Date(req.query.since);
+      if (isNaN(since.getTime())) {
+        return res.status(400).json({ error: 'Invalid since cursor' });
+      }
+    }
+
+    const fullSync = !since || since < retentionStart;
+    const [sales, tombstones] = await Promise.all([
+      Sale.find(fullSync ? {} : { updatedAt: { $gte: since } })
+        .select('type orderStatus orderDate totalPrice orderItems')
+        .populate({ path: 'orderItems.bookId', model: 'Book', select: 'title author isbn genre' })
+        .lean(),
+      fullSync ? [] : SaleTombstone.find({ deletedAt: { $gte: since } }).select('saleId')
+    ]);
+
+    res.json({
+      fullSync,
+      sales: sales.map(toRollupSale),
+      deleted: tombstones.map(tombstone => tombstone.saleId.toString()),
+      cursor: cursor.toISOString()
+    });
+  } catch (error) {
+    console.error('Error in /api/sales/changes:', error);
+    res.status(500).json({ error: 'Error fetching sales changes' });
+  }
+});
+
 /**
  * @swagger
  * /api/sales:
@@ -401,6 +612,7 @@ router.delete('/:id', async (req, res) => {
     if (!deletedSale) {
       return res.status(404).json({ error: 'Sale not found' });
     }
+    await SaleTombstone.create({ saleId: deletedSale._id });
     res.json({ message: 'Sale deleted successfully' });
   } catch (error) {
     res.status(500).json({ error: 'Error deleting sale' });
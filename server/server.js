@@ -1,4 +1,5 @@
 const express = require('express');
+const compression = require('compression');
 const cors = require('cors');
 const mongoose = require('mongoose');
 const swaggerUi = require('swagger-ui-express');
@@ -43,8 +44,15 @@ mongoose.connect(MONGODB_URI, {
   .catch(err => console.error('MongoDB connection error:', err));
 
 // Middleware
-app.use(cors());
-app.use(express.json());
+// Strong ETags (a hash of the body) on every JSON response; routes that read
+// whole collections answer If-None-Match earlier via middleware/conditional.js
+app.set('etag', 'strong');
+// gzip/br-compress responses over 1kb (catalog, sales and report JSON shrinks
+// several times over); images such as the WebP covers are left as they are
+app.use(compression());
+app.use(cors({ exposedHeaders: ['X-Total-Count', 'X-Next-Cursor'] }));
+// Bulk book imports send batches of up to MAX_BULK_BOOKS rows
+app.use(express.json({ limit: '5mb' }));
 
 // Add custom logger before routes
 app.use(customLogger());
@@ -57,6 +65,7 @@ const userRoutes = require('./routes/users.js');
 const saleRoutes = require('./routes/sales.js');
 const reportRoutes = require('./routes/reports.js');
 const authRoutes = require('./routes/auth.js');
+const coverRoutes = require('./routes/covers.js');
 
 app.use('/', indexRoute);
 app.use('/api/books', bookRoutes);
@@ -65,6 +74,7 @@ app.use('/api/users', userRoutes);
 app.use('/api/sales', saleRoutes);
 app.use('/api/reports', reportRoutes);
 app.use('/api/auth', authRoutes);
+app.use('/api/covers', coverRoutes);
 
 // TODO
 // Customer order routes
@@ -0,0 +1,17 @@
+// Writes are stamped with updatedAt/deletedAt by the app before they reach
+// MongoDB, so a write stamped just before a sync may only commit after that
+// sync's query. Handing out a cursor a little in the past makes the next sync
+// pick such writes up; clients merge changes idempotently, so the overlap is
+// only re-delivered, never double-counted.
+const CURSOR_OVERLAP_MS = 5 * 1000;
+
+/**
+ * Cursor to return from a `/changes` endpoint whose query starts now
+ * @param {Date} now - Time taken before the changes are queried
+ * @returns {Date}
+ */
+function changesCursor(now) {
+  return new Date(now.getTime() - CURSOR_OVERLAP_MS);
+}
+
+module.exports = { CURSOR_OVERLAP_MS, changesCursor };
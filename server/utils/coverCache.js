@@ -0,0 +1,323 @@
+const crypto = require('crypto');
+const dns = require('dns');
+const fs = require('fs/promises');
+const http = require('http');
+const https = require('https');
+const net = require('net');
+const path = require('path');
+const sharp = require('sharp');
+
+// Resized cover images, cached on disk.
+//
+// Each cover URL is fetched from its origin once, resized to every size in
+// COVER_SIZES and stored as WebP under CACHE_DIR. Entries are evicted least
+// recently used first once the directory grows past COVER_CACHE_MAX_MB. After
+// COVER_REVALIDATE_HOURS a cached cover is still served, and the origin is
+// asked in the background (with the stored ETag) whether it has changed.
+//
+// Cover URLs come from book data anyone can edit, so the server only fetches
+// public addresses: every hostname is resolved and checked when the connection
+// is made (loopback, private, link-local/metadata and other internal ranges
+// are refused), and redirects are followed by hand, each hop checked again.
+
+// Bounding boxes covers are resized into (never enlarged)
+const COVER_SIZES = {
+  grid: { width: 300, height: 450 },
+  detail: { width: 600, height: 900 },
+};
+
+const CACHE_DIR = process.env.COVER_CACHE_DIR || path.join(__dirname, '..', '.cache', 'covers');
+const MAX_CACHE_BYTES = (Number(process.env.COVER_CACHE_MAX_MB) || 256) * 1024 * 1024;
+const REVALIDATE_MS = (Number(process.env.COVER_REVALIDATE_HOURS) || 24) * 60 * 60 * 1000;
+const FETCH_TIMEOUT_MS = 10000;
+const MAX_SOURCE_BYTES = 10 * 1024 * 1024;
+const TOUCH_INTERVAL_MS = 60 * 1000;
+const MAX_REDIRECTS = 3;
+const REDIRECT_STATUSES = [301, 302, 303, 307, 308];
+
+// Addresses a cover origin may not resolve to
+const BLOCKED_ADDRESSES = new net.BlockList();
+for (const [network, prefix] of [
+  ['0.0.0.0', 8], ['10.0.0.0', 8], ['100.64.0.0', 10], ['127.0.0.0', 8], ['169.254.0.0', 16],
+  ['172.16.0.0', 12], ['192.0.0.0', 24], ['192.168.0.0', 16], ['198.18.0.0', 15], ['224.0.0.0', 3],
+]) {
+  BLOCKED_ADDRESSES.addSubnet(network, prefix, 'ipv4');
+}
+for (const [network, prefix] of [
+  ['::', 127], ['64:ff9b::', 96], ['fc00::', 7], ['fe80::', 10], ['ff00::', 8],
+]) {
+  BLOCKED_ADDRESSES.addSubnet(network, prefix, 'ipv6');
+}
+
+// key -> { meta, bytes, touchedAt }, in least to most recently used order
+const entries = new Map();
+let totalBytes = 0;
+let indexLoaded = null;
+// key -> promise of the fetch in progress, so concurrent misses share one download
+const inFlight = new Map();
+
+const cacheKey = (url) => crypto.createHash('sha256').update(url).digest('hex').slice(0, 32);
+const metaPath = (key) => path.join(CACHE_DIR, `${key}.json`);
+const variantPath = (key, size) => path.join(CACHE_DIR, `${key}.${size}.webp`);
+
+// Rebuild the LRU order from the files left by a previous run
+async function loadIndex() {
+  await fs.mkdir(CACHE_DIR, { recursive: true });
+  const found = [];
+  for (const name of await fs.readdir(CACHE_DIR)) {
+    if (!name.endsWith('.json')) continue;
+    const key = name.slice(0, -'.json'.length);
+    try {
+      const [meta, stat] = await Promise.all([
+        fs.readFile(metaPath(key), 'utf8').then(JSON.parse),
+        fs.stat(metaPath(key)),
+      ]);
+      let bytes = 0;
+      for (const size of Object.keys(COVER_SIZES)) {
+        bytes += (await fs.stat(variantPath(key, size))).size;
+      }
+      found.push({ key, meta, bytes, touchedAt: stat.mtimeMs });
+    } catch (error) {
+      await removeFiles(key);
+    }
+  }
+  found.sort((a, b) => a.touchedAt - b.touchedAt);
+  for (const { key, ...entry } of found) {
+    entries.set(key, entry);
+    totalBytes += entry.bytes;
+  }
+  await evict();
+}
+
+function ensureIndex() {
+  if (!indexLoaded) {
+    indexLoaded = loadIndex().catch((error) => {
+      indexLoaded = null;
+      throw error;
+    });
+  }
+  return indexLoaded;
+}
+
+async function removeFiles(key) {
+  const files = [metaPath(key), ...Object.keys(COVER_SIZES).map((size) => variantPath(key, size))];
+  await Promise.all(files.map((file) => fs.rm(file, { force: true })));
+}
+
+async function evict() {
+  // Always keep the newest entry, even if it alone exceeds the limit
+  while (totalBytes > MAX_CACHE_BYTES && entries.size > 1) {
+    const [key, entry] = entries.entries().next().value;
+    entries.delete(key);
+    totalBytes -= entry.bytes;
+    await removeFiles(key);
+  }
+}
+
+// Mark an entry as most recently used; the file mtime keeps the order across restarts
+function touch(key, entry) {
+  entries.delete(key);
+  entries.set(key, entry);
+  const now = Date.now();
+  if (now - entry.touchedAt > TOUCH_INTERVAL_MS) {
+    entry.touchedAt = now;
+    fs.utimes(metaPath(key), new Date(now), new Date(now)).catch(() => {});
+  }
+}
+
+function isBlocked(address) {
+  // IPv4-mapped IPv6 (::ffff:127.0.0.1) is checked as the IPv4 address
+  const mapped = /^::ffff:(\d+\.\d+\.\d+\.\d+)$/i.exec(address);
+  if (mapped) address = mapped[1];
+  return BLOCKED_ADDRESSES.check(address, net.isIPv6(address) ? 'ipv6' : 'ipv4');
+}
+
+// dns.lookup that refuses blocked addresses. It runs when the socket connects,
+// so a hostname can't pass a check and then resolve somewhere internal.
+function publicLookup(hostname, options, callback) {
+  dns.lookup(hostname, { ...options, all: true }, (error, addresses) => {
+    if (error) return callback(error);
+    if (!addresses.length || addresses.some(({ address }) => isBlocked(address))) {
+      return callback(new Error(`Cover host ${hostname} is not a public address`));
+    }
+    if (options.all) return callback(null, addresses);
+    callback(null, addresses[0].address, addresses[0].family);
+  });
+}
+
+// Parse a cover URL, rejecting non-http(s) schemes and blocked IP literals
+// (sockets skip the lookup for those)
+function checkedUrl(url, base) {
+  const parsed = new URL(url, base);
+  if (parsed.protocol !== 'http:' && parsed.protocol !== 'https:') {
+    throw new Error('Cover URL must be http or https');
+  }
+  const host = parsed.hostname.replace(/^\[|\]$/g, '');
+  if (net.isIP(host) && isBlocked(host)) {
+    throw new Error(`Cover host ${host} is not a public address`);
+  }
+  return parsed;
+}
+
+// One GET; resolves to { status, headers, body } (body only for 200)
+function get(url, headers) {
+  return new Promise((resolve, reject) => {
+    const client = url.protocol === 'https:' ? https : http;
+    const request = client.get(url, { headers, lookup: publicLookup }, (response) => {
+      if (response.statusCode !== 200) {
+        response.resume();
+        return resolve({ status: response.statusCode, headers: response.headers, body: null });
+      }
+      if (Number(response.headers['content-length']) > MAX_SOURCE_BYTES) {
+        request.destroy(new Error('Cover image is too large'));
+        return;
+      }
+      const chunks = [];
+      let length = 0;
+      response.on('data', (chunk) => {
+        length += chunk.length;
+        if (length > MAX_SOURCE_BYTES) {
+          request.destroy(new Error('Cover image is too large'));
+          return;
+        }
+        chunks.push(chunk);
+      });
+      response.on('end', () => resolve({ status: 200, headers: response.headers, body: Buffer.concat(chunks) }));
+      response.on('error', reject);
+    });
+    const timer = setTimeout(() => request.destroy(new Error('Cover origin timed out')), FETCH_TIMEOUT_MS);
+    request.on('close', () => clearTimeout(timer));
+    request.on('error', reject);
+  });
+}
+
+// GET a cover from its origin, following redirects only to public addresses
+async function fetchOrigin(url, headers) {
+  let target = checkedUrl(url);
+  for (let hop = 0; ; hop++) {
+    const response = await get(target, headers);
+    if (!REDIRECT_STATUSES.includes(response.status)) {
+      return response;
+    }
+    if (hop === MAX_REDIRECTS || !response.headers.location) {
+      throw new Error('Cover origin redirected too often or without a location');
+    }
+    target = checkedUrl(response.headers.location, target);
+  }
+}
+
+async function writeAtomic(file, data) {
+  const temp = `${file}.${process.pid}.tmp`;
+  await fs.writeFile(temp, data);
+  await fs.rename(temp, file);
+}
+
+// Download a cover (conditionally when it is already cached) and store every size
+async function fetchCover(key, url, previous) {
+  const headers = {};
+  if (previous?.meta.etag) headers['If-None-Match'] = previous.meta.etag;
+  if (previous?.meta.lastModified) headers['If-Modified-Since'] = previous.meta.lastModified;
+
+  const response = await fetchOrigin(url, headers);
+  if (response.status === 304 && previous) {
+    previous.meta.checkedAt = Date.now();
+    await writeAtomic(metaPath(key), JSON.stringify(previous.meta));
+    return previous;
+  }
+  if (response.status !== 200) {
+    throw new Error(`Cover origin returned ${response.status}`);
+  }
+  const source = response.body;
+
+  const variants = await Promise.all(Object.entries(COVER_SIZES).map(([size, box]) =>
+    sharp(source)
+      .rotate()
+      .resize({ ...box, fit: 'inside', withoutEnlargement: true })
+      .webp({ quality: 80 })
+      .toBuffer()
+      .then((data) => [size, data])));
+
+  await fs.mkdir(CACHE_DIR, { recursive: true });
+  await Promise.all(variants.map(([size, data]) => writeAtomic(variantPath(key, size), data)));
+  const meta = {
+    url,
+    etag: response.headers.etag || null,
+    lastModified: response.headers['last-modified'] || null,
+    digest: crypto.createHash('sha1').update(source).digest('hex').slice(0, 16),
+    checkedAt: Date.now(),
+  };
+  await writeAtomic(metaPath(key), JSON.stringify(meta));
+
+  const replaced = entries.get(key);
+  if (replaced) totalBytes -= replaced.bytes;
+  const entry = { meta, bytes: variants.reduce((sum, [, data]) => sum + data.length, 0), touchedAt: Date.now() };
+  entries.delete(key);
+  entries.set(key, entry);
+  totalBytes += entry.bytes;
+  await evict();
+  return entry;
+}
+
+function fetchOnce(key, url, previous) {
+  if (!inFlight.has(key)) {
+    inFlight.set(key, fetchCover(key, url, previous).finally(() => inFlight.delete(key)));
+  }
+  return inFlight.get(key);
+}
+
+/**
+ * Get a cover resized to one of COVER_SIZES.
+ * @param {string} url - Origin URL of the cover image
+ * @param {string} size - Key of COVER_SIZES
+ * @returns {Promise<{body: Buffer, etag: string}>} WebP image and a strong ETag for it
+ */
+async function getCover(url, size) {
+  checkedUrl(url);
+  await ensureIndex();
+  const key = cacheKey(url);
+
+  let entry = entries.get(key);
+  if (entry) {
+    touch(key, entry);
+    if (Date.now() - entry.meta.checkedAt > REVALIDATE_MS) {
+      fetchOnce(key, url, entry).catch((error) => console.error('Cover revalidation failed:', url, error.message));
+    }
+  } else {
+    entry = await fetchOnce(key, url, null);
+  }
+
+  let body;
+  try {
+    body = await fs.readFile(variantPath(key, size));
+  } catch (error) {
+    // Removed from disk behind our back (or evicted meanwhile): fetch it again
+    if (entries.get(key) === entry) {
+      entries.delete(key);
+      totalBytes -= entry.bytes;
+    }
+    entry = await fetchOnce(key, url, null);
+    body = await fs.readFile(variantPath(key, size));
+  }
+  return { body, etag: `"${entry.meta.digest}-${size}"` };
+}
+
+const placeholders = new Map();
+
+/**
+ * Plain grey WebP the size of a cover, served when the real one can't be
+ * @param {string} size - Key of COVER_SIZES
+ * @returns {Promise<Buffer>}
+ */
+function getPlaceholder(size) {
+  if (!placeholders.has(size)) {
+    const { width, height } = COVER_SIZES[size];
+    const created = sharp({ create: { width, height, channels: 3, background: '#dddddd' } })
+      .webp({ quality: 50 })
+      .toBuffer();
+    created.catch(() => placeholders.delete(size));
+    placeholders.set(size, created);
+  }
+  return placeholders.get(size);
+}
+
+module.exports = { COVER_SIZES, getCover, getPlaceholder };
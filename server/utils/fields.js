@@ -0,0 +1,30 @@
+/**
+ * Parse a `fields=a,b,c` projection parameter for list endpoints.
+ * @param {string} [fields] - Comma-separated top-level field names
+ * @param {string[]} allowed - Fields clients may ask for
+ * @param {string[]} [required] - Fields the route needs and always selects
+ * @returns {{select: (string|null), fields: (Set|null), unknown: string[]}}
+ *   Mongoose select string and the set of selected fields (both null when no
+ *   projection was asked for), and any names not in `allowed`
+ */
+function parseFields(fields, allowed, required = []) {
+  if (!fields) {
+    return { select: null, fields: null, unknown: [] };
+  }
+  const names = fields.split(',').map(name => name.trim()).filter(name => name);
+  const unknown = names.filter(name => !allowed.includes(name));
+  const selected = new Set(['_id', ...required, ...names]);
+  return { select: [...selected].join(' '), fields: selected, unknown };
+}
+
+/**
+ * Top-level fields of a model that can be projected
+ * @param {mongoose.Model} Model
+ * @returns {string[]}
+ */
+function projectableFields(Model) {
+  return [...new Set(Object.keys(Model.schema.paths).map(path => path.split('.')[0]))]
+    .filter(name => name !== '__v');
+}
+
+module.exports = { parseFields, projectableFields };